@@ -0,0 +1,281 @@
+"""asyncio versions of the functions in client.py
+
+Every coroutine here takes the same arguments and returns the same result as
+the function of the same name in client.py. All calls on an event loop share
+one AsyncTransport whose connection limit bounds how many requests are in
+flight at once, so thousands of calls can be awaited concurrently on a single
+event loop. An aiohttp session only works on the loop it was created on, so
+each loop, e.g. of consecutive asyncio.run calls, gets its own transport.
+"""
+import asyncio
+import weakref
+
+import aiohttp
+
+import client
+
+CONCURRENCY = 100
+
+
+class AsyncTransport(object):
+    """Keep-alive aiohttp transport to a lbrynet daemon
+
+    At most 'limit' requests are sent concurrently, further calls wait for a
+    free connection. Must be created and used from within a running loop.
+
+    Args:
+        'url' (optional): (str) daemon api url, defaults to client.BASE_URL
+        'limit' (optional): (int) max number of concurrent requests
+    """
+
+    def __init__(self, url=None, limit=CONCURRENCY):
+        self.url = url or client.BASE_URL
+        self.limit = limit
+        connector = aiohttp.TCPConnector(limit=limit)
+        self.session = aiohttp.ClientSession(connector=connector)
+
+    async def post(self, data):
+        async with self.session.post(self.url, data=data) as res:
+            return client._loads(await res.read())
+
+    async def close(self):
+        await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+# event loop -> {url: transport} used by the coroutines running on it, the
+# module transport under None
+_transports = weakref.WeakKeyDictionary()
+
+
+def get_transport(url=None):
+    """Return the transport used by the coroutines in this module on the
+    running loop, or the loop's transport to the daemon at url
+
+    Transports are created on first use on each loop with CONCURRENCY, the
+    module one with client.BASE_URL.
+    """
+    transports = _transports.setdefault(asyncio.get_running_loop(), {})
+    transport = transports.get(url)
+    if transport is None or transport.session.closed:
+        transport = transports[url] = AsyncTransport(url)
+    return transport
+
+
+async def set_transport(transport):
+    """Use transport for all following calls on the running loop, closing
+    the previous one
+
+    Args:
+        'transport': (AsyncTransport) transport to use, None to reset to default
+    """
+    transports = _transports.setdefault(asyncio.get_running_loop(), {})
+    old = transports.pop(None, None)
+    if transport is not None:
+        transports[None] = transport
+    if old is not None and old is not transport:
+        await old.close()
+
+
+async def close():
+    """Close the pooled connections of the running loop's transports
+
+    Await it before the loop ends, e.g. at the end of the coroutine passed to
+    asyncio.run, so the connections are not left open.
+    """
+    transports = _transports.pop(asyncio.get_running_loop(), {})
+    for transport in transports.values():
+        await transport.close()
+
+
+async def call(method, params, url=None):
+    """Send one daemon call
+
+    Args:
+        'method': (str) daemon method
+        'params': (dict) its params
+        'url' (optional): (str) daemon api url, None for the module transport
+    """
+    data = client._encode(method, params)
+    response = await get_transport(url).post(data)
+    return client._result(response)
+
+
+async def _request(method, **kwargs):
+    return await call(method, kwargs)
+
+
+async def channel_list_mine():
+    """Async version of client.channel_list_mine"""
+    return await _request('channel_list_mine')
+
+
+async def channel_new(name, amount):
+    """Async version of client.channel_new"""
+    if name[0] != '@':
+        name = '@' + name
+    if not isinstance(amount, float):
+        amount = float(amount)
+
+    res = await _request('channel_new', channel_name=name, amount=amount)
+    return res['result']['claim_id']
+
+
+async def claim_abandon(claim_id):
+    """Async version of client.claim_abandon"""
+    return await _request('claim_abandon', claim_id=claim_id)
+
+
+async def claim_list(name):
+    """Async version of client.claim_list"""
+    return await _request('claim_list', name=name)
+
+
+async def claim_list_mine():
+    """Async version of client.claim_list_mine"""
+    return await _request('claim_list_mine')
+
+
+async def claim_new_support(name, claim_id, amount):
+    """Async version of client.claim_new_support"""
+    if not isinstance(amount, float):
+        amount = float(amount)
+    return await _request('claim_new_support', name=name, claim_id=claim_id, amount=amount)
+
+
+async def claim_show(name, txid=None, nout=None, claim_id=None):
+    """Async version of client.claim_show"""
+    return await _request('claim_show', name=name, txid=txid, nout=nout, claim_id=claim_id)
+
+
+async def descriptor_get(sd_hash, timeout=None, payment_rate_manager=None):
+    """Async version of client.descriptor_get"""
+    return await _request('descriptor_get', sd_hash=sd_hash, timeout=timeout,
+                          payment_rate_manager=payment_rate_manager)
+
+
+async def file_delete(name=None, sd_hash=None, file_hash=None, stream_hash=None, claim_id=None, outpoint=None, rowid=None, delete_target_file=None):
+    """Async version of client.file_delete"""
+    return await _request('file_delete', name=name, sd_hash=sd_hash, file_name=file_hash,
+                          stream_hash=stream_hash, claim_id=claim_id, outpoint=outpoint,
+                          rowid=rowid, delete_target_file=delete_target_file)
+
+
+async def file_list(**kwargs):
+    """Async version of client.file_list"""
+    return await _request('file_list', **kwargs)
+
+
+async def file_set_status(status, name=None, sd_hash=None, file_name=None):
+    """Async version of client.file_set_status"""
+    return await _request('file_set_status', status=status, name=name, sd_hash=sd_hash,
+                          file_name=file_name)
+
+
+async def get(uri, file_name=None, timeout=None, download_directory=None):
+    """Async version of client.get"""
+    return await _request('get', uri=uri, file_name=file_name, timeout=timeout)
+
+
+async def get_availability(uri, sd_timeout=None, peer_timeout=None):
+    """Async version of client.get_availability"""
+    return await _request('get_availability', uri=uri, sd_timeout=sd_timeout, peer_timeout=peer_timeout)
+
+
+async def peer_list(blob_hash, timeout=None):
+    """Async version of client.peer_list"""
+    return await _request('peer_list', blob_hash=blob_hash, timeout=timeout)
+
+
+async def publish(name, bid, file_path=None, metadata=None, **kwargs):
+    """Async version of client.publish"""
+    if metadata is None:
+        metadata = {}
+    client._check_publish_fields(metadata, kwargs)
+    return await _request('publish', name=name, bid=bid, file_path=file_path, metadata=metadata, **kwargs)
+
+
+async def reflect(sd_hash):
+    """Async version of client.reflect"""
+    return await _request('reflect', sd_hash=sd_hash)
+
+
+async def resolve(uri):
+    """Async version of client.resolve"""
+    return await _request('resolve', uri=uri)
+
+
+async def resolve_name(name):
+    """Async version of client.resolve_name"""
+    return await _request('resolve_name', name=name)
+
+
+async def send_amount_to_address(amount, address):
+    """Async version of client.send_amount_to_address"""
+    return await _request('send_amount_to_address', amount=amount, address=address)
+
+
+async def settings_get():
+    """Async version of client.settings_get"""
+    return await _request('settings_get')
+
+
+async def settings_set(**kwargs):
+    """Async version of client.settings_set"""
+    return await _request('settings_set', **kwargs)
+
+
+async def status(session_status=False):
+    """Async version of client.status"""
+    return await _request('status', session_status=session_status)
+
+
+async def stream_cost_estimate(name, size=None):
+    """Async version of client.stream_cost_estimate"""
+    return await _request('stream_cost_estimate', uri=name, size=size)
+
+
+async def transaction_list():
+    """Async version of client.transaction_list"""
+    return await _request('transaction_list')
+
+
+async def transaction_show(txid):
+    """Async version of client.transaction_show"""
+    return await _request('transaction_show', txid=txid)
+
+
+async def wallet_balance(address=None, include_uncomfirmed=None):
+    """Async version of client.wallet_balance"""
+    return await _request('wallet_balance', address=address,
+                          include_uncomfirmed=include_uncomfirmed)
+
+
+async def wallet_is_address_mine(address):
+    """Async version of client.wallet_is_address_mine"""
+    return await _request('wallet_is_address_mine', address=address)
+
+
+async def wallet_list():
+    """Async version of client.wallet_list"""
+    return await _request('wallet_list')
+
+
+async def wallet_new_address():
+    """Async version of client.wallet_new_address"""
+    return await _request('wallet_new_address')
+
+
+async def wallet_public_key(address):
+    """Async version of client.wallet_public_key"""
+    return await _request('wallet_public_key', address=address)
+
+
+async def wallet_unused_address():
+    """Async version of client.wallet_unused_address"""
+    return await _request('wallet_unused_address')
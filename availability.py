@@ -0,0 +1,123 @@
+"""Score content by availability, checking many uris concurrently
+
+    scanner = AvailabilityScanner(workers=32, deadline=10)
+    for row in scanner.scan(uris):
+        print(row['uri'], row['availability'], row['peers'])
+
+Each uri gets get_availability(uri) and, for its sd blob, resolve(uri) and
+peer_list(sd_hash). At most 'workers' uris are checked at once and all the
+calls of a uri share its deadline: each call's HTTP timeout is what is left
+of it, and the daemon side timeouts (get_availability's sd_timeout plus
+peer_timeout, peer_list's timeout) are split from it by
+client.daemon_timeouts, so the daemon gives up before the request does. A
+call with too little time left for that fails without being sent. Results,
+including each uri's sd hash, are cached for 'ttl' seconds keyed by uri and
+blob hash.
+"""
+import time
+
+import bulk
+import cache
+import client
+import models
+
+
+class AvailabilityScanner(object):
+    """Concurrent get_availability/peer_list sweeps with a TTL cache
+
+    Args:
+        'workers' (optional): (int) max uris checked at once
+        'deadline' (optional): (float) seconds all the calls of a uri may take
+        'ttl' (optional): (float) seconds results are cached
+        'peers' (optional): (bool) also count the peers of each sd blob
+        'lbry' (optional): (LbryClient) client to use; by default one for
+                           client.BASE_URL. Its HTTP timeout is set per call,
+                           except for calls sent through a DaemonPool
+    """
+
+    def __init__(self, workers=16, deadline=10.0, ttl=600, peers=True, lbry=None, maxsize=100000):
+        self.workers = workers
+        self.deadline = deadline
+        self.peers = peers
+        self.lbry = lbry or client.LbryClient(pool_size=workers, timeout=deadline)
+        self.cache = cache.TTLCache(maxsize, ttl)
+        self.stats = bulk.BulkStats()
+
+    def _budget(self, end, what, parts=0):
+        # a client timing out at end, and the daemon side timeouts of parts
+        # that fit before it
+        if end is None:
+            end = time.monotonic() + self.deadline
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise Exception('{} passed its deadline'.format(what))
+        timeout = client.daemon_timeouts(remaining, parts) if parts else None
+        if parts and timeout is None:
+            raise Exception('{} has too little time left for the daemon to time out '
+                            'first'.format(what))
+        return self.lbry.with_timeout(remaining), timeout
+
+    def availability(self, uri, end=None):
+        key = ('availability', cache.normalize_name(uri))
+        value = self.cache.get(key)
+        if value is cache.MISSING:
+            # the daemon waits up to sd_timeout and then up to peer_timeout
+            lbry, timeout = self._budget(end, uri, 2)
+            value = lbry.get_availability(uri, sd_timeout=timeout, peer_timeout=timeout)
+            self.cache.set(key, value)
+        return value
+
+    def sd_hash(self, uri, end=None):
+        key = ('sd_hash', cache.normalize_name(uri))
+        value = self.cache.get(key)
+        if value is cache.MISSING:
+            lbry, _ = self._budget(end, uri)
+            value = models.sd_hash(lbry.resolve(uri))
+            self.cache.set(key, value)
+        return value
+
+    def peer_count(self, blob_hash, end=None):
+        key = ('peers', blob_hash)
+        value = self.cache.get(key)
+        if value is cache.MISSING:
+            lbry, timeout = self._budget(end, blob_hash, 1)
+            value = len(lbry.peer_list(blob_hash, timeout=timeout) or [])
+            self.cache.set(key, value)
+        return value
+
+    def check(self, uri):
+        """Returns:
+            (dict) 'uri', 'availability', 'sd_hash' and 'peers' of one uri
+        """
+        end = time.monotonic() + self.deadline
+        row = {'uri': uri, 'availability': self.availability(uri, end), 'sd_hash': None,
+               'peers': None}
+        if self.peers:
+            row['sd_hash'] = self.sd_hash(uri, end)
+            if row['sd_hash']:
+                row['peers'] = self.peer_count(row['sd_hash'], end)
+        return row
+
+    def iter_scan(self, uris):
+        """Check uris concurrently, yielding rows in completion order
+
+        A uri whose calls fail yields a row with its 'error' set.
+        """
+        self.stats = bulk.BulkStats()
+        for uri, row in bulk.map_unordered(self.check, uris, self.workers, self.stats):
+            if isinstance(row, Exception):
+                row = {'uri': uri, 'availability': None, 'sd_hash': None, 'peers': None, 'error': row}
+            yield row
+
+    def scan(self, uris):
+        """Check uris and return them ranked
+
+        Returns:
+            (list) rows from iter_scan, most available first
+        """
+        rows = list(self.iter_scan(uris))
+        rows.sort(key=lambda r: (r['availability'] or 0.0, r['peers'] or 0), reverse=True)
+        return rows
+
+    def close(self):
+        self.lbry.close()
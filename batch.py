@@ -0,0 +1,117 @@
+"""Send several daemon calls in one JSON-RPC batch request
+
+    with Batch() as b:
+        status = b.status()
+        balance = b.wallet_balance()
+    print(status.result(), balance.result())
+
+Every call returns a concurrent.futures.Future that is resolved with the
+method's result, or its error, once the batch is sent. If the daemon rejects
+batch payloads, answering with a 400 or a JSON-RPC error instead of a list,
+the calls are sent as individual requests in parallel instead, and so are
+later batches to that daemon. If the request itself fails, every call's
+future gets the error and it is raised.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import client
+
+# daemon urls that rejected a batch payload
+_unsupported = set()
+
+
+class Batch(object):
+    """Collect daemon calls and send them in a single POST
+
+    Args:
+        'transport' (optional): (Transport) transport to send with, defaults
+                                to the client.py module transport
+    """
+
+    def __init__(self, transport=None):
+        self.transport = transport
+        self.calls = []
+
+    def call(self, method, **params):
+        """Queue a call to a daemon method
+
+        Returns:
+            (Future) resolved with the result once the batch is sent
+        """
+        future = Future()
+        self.calls.append((method, params, future))
+        return future
+
+    def __getattr__(self, method):
+        if method.startswith('_'):
+            raise AttributeError(method)
+        return lambda **params: self.call(method, **params)
+
+    def __len__(self):
+        return len(self.calls)
+
+    def send(self):
+        """Send all queued calls and resolve their futures in order"""
+        calls, self.calls = self.calls, []
+        if not calls:
+            return
+        transport = self.transport or client.get_transport()
+        try:
+            if transport.url in _unsupported or not _send_batch(transport, calls):
+                _unsupported.add(transport.url)
+                _send_parallel(transport, calls)
+        except BaseException as e:
+            # resolve the futures handed out, or their callers wait forever
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.send()
+
+
+def _send_batch(transport, calls):
+    data = client._dumps([{'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+                          for i, (method, params, _) in enumerate(calls)])
+    res = transport.post(data)
+    try:
+        responses = client._loads(res.content)
+    except ValueError:
+        responses = None
+    if not isinstance(responses, list):
+        if res.status_code == 400 or (isinstance(responses, dict) and 'error' in responses):
+            # the daemon does not take batches
+            return False
+        # e.g. a proxy's 502 page, which says nothing about batch support
+        res.raise_for_status()
+        raise Exception('unexpected response to a batch request: {!r}'.format(res.content[:200]))
+    by_id = {r.get('id'): r for r in responses if isinstance(r, dict)}
+    for i, (_, _, future) in enumerate(calls):
+        response = by_id.get(i)
+        if response is None:
+            future.set_exception(Exception('no response for call in batch'))
+        else:
+            _resolve(future, lambda: client._result(response))
+    return True
+
+
+def _send_parallel(transport, calls):
+    def send(call):
+        method, params, future = call
+        _resolve(future, lambda: client._call(transport, method, params))
+
+    workers = min(len(calls), getattr(transport, 'pool_size', client.POOL_SIZE))
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(send, calls))
+
+
+def _resolve(future, fn):
+    try:
+        future.set_result(fn())
+    except Exception as e:
+        future.set_exception(e)
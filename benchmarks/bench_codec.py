@@ -0,0 +1,45 @@
+"""Encode/decode time of the client codec vs stdlib json for typical payloads
+
+    python -m benchmarks.bench_codec [repeat]
+"""
+import json
+import sys
+import timeit
+
+import client
+from benchmarks.fake_daemon import claim, file_entry, transaction
+
+
+PAYLOADS = {
+    'request': {'method': 'resolve', 'params': {'uri': 'lbry://what'}},
+    'resolve': {'jsonrpc': '2.0', 'result': {'claim': claim(1)}},
+    'file_list_1k': {'jsonrpc': '2.0', 'result': [file_entry(i) for i in range(1000)]},
+    'transaction_list_10k': {'jsonrpc': '2.0', 'result': [transaction(i) for i in range(10000)]},
+}
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj).encode('utf-8')
+
+
+def stdlib_loads(data):
+    return json.loads(data.decode('utf-8'))
+
+
+def main(repeat=20):
+    results = {'codec': client._loads.__module__}
+    for name, payload in PAYLOADS.items():
+        data = stdlib_dumps(payload)
+        number = max(1, 20000 // len(data))
+        row = {}
+        for label, dumps, loads in (('stdlib', stdlib_dumps, stdlib_loads),
+                                    ('client', client._dumps, client._loads)):
+            enc = min(timeit.repeat(lambda: dumps(payload), number=number, repeat=repeat)) / number
+            dec = min(timeit.repeat(lambda: loads(data), number=number, repeat=repeat)) / number
+            row[label] = {'encode_us': round(enc * 1e6, 1), 'decode_us': round(dec * 1e6, 1)}
+        results[name] = row
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
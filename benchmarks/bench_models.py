@@ -0,0 +1,43 @@
+"""Memory held by claim_list_mine results as plain dicts vs models records,
+and the time it takes to parse the response and to build the records
+
+    python -m benchmarks.bench_models [claims]
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+import models
+from benchmarks.fake_daemon import claim
+
+
+def held(body, convert):
+    tracemalloc.start()
+    result = convert(json.loads(body))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(claims=20000):
+    body = json.dumps([claim(i) for i in range(claims)])
+    plain = held(body, lambda res: res)
+    typed = held(body, lambda res: models.convert('claim_list_mine', res))
+    start = time.perf_counter()
+    res = json.loads(body)
+    parse = time.perf_counter() - start
+    start = time.perf_counter()
+    models.convert('claim_list_mine', res)
+    convert = time.perf_counter() - start
+    print(json.dumps({'claims': claims,
+                      'dict_bytes_per_claim': plain // claims,
+                      'record_bytes_per_claim': typed // claims,
+                      'ratio': round(plain / float(typed), 2),
+                      'parse_seconds': round(parse, 3),
+                      'convert_seconds': round(convert, 3)}))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
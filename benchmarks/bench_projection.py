@@ -0,0 +1,56 @@
+"""Memory and time of a large file_list result, whole vs projected
+
+    python -m benchmarks.bench_projection [files]
+
+'full' parses the whole response, 'full_then_project' projects it after the
+whole response is parsed, and 'streamed' projects each file as it is parsed
+from the body, as file_list(fields=...) does. Peak is the most memory in use
+while parsing, held what the result keeps afterwards.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+import client
+import projection
+import streaming
+from benchmarks.fake_daemon import file_entry
+
+FIELDS = ['sd_hash', 'completed', 'written_bytes']
+
+
+def measure(body, parse):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = parse(body)
+    elapsed = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {'seconds': round(elapsed, 3), 'peak_mb': round(peak / 1e6, 1),
+            'held_mb': round(held / 1e6, 1)}
+
+
+def chunks(body):
+    for i in range(0, len(body), streaming.CHUNK_SIZE):
+        yield body[i:i + streaming.CHUNK_SIZE]
+
+
+def main(files=50000):
+    body = json.dumps({'jsonrpc': '2.0', 'id': 1,
+                       'result': [file_entry(i) for i in range(files)]}).encode('utf-8')
+    tree = projection.compile_fields(FIELDS)
+    results = {
+        'full': measure(body, lambda b: client._loads(b)['result']),
+        'full_then_project': measure(
+            body, lambda b: projection.shape('file_list', client._loads(b)['result'], FIELDS)),
+        'streamed': measure(
+            body, lambda b: [projection.project(f, tree) for f in streaming.iter_result(chunks(b))]),
+    }
+    print(json.dumps({'files': files, 'body_mb': round(len(body) / 1e6, 1), 'fields': FIELDS,
+                      'results': results}))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,50 @@
+"""Calls per second of _request with and without the pooled transport
+
+    python -m benchmarks.bench_transport [calls] [threads]
+"""
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import client
+from benchmarks.fake_daemon import FakeDaemon
+
+
+class UnpooledTransport(object):
+    """The old behaviour: a new connection for every call"""
+
+    def __init__(self, url):
+        self.url = url
+
+    def post(self, data):
+        return requests.post(self.url, data=data)
+
+    def close(self):
+        pass
+
+
+def run(calls, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda i: client.status(), range(calls)))
+    return calls / (time.perf_counter() - start)
+
+
+def main(calls=2000, threads=1):
+    with FakeDaemon() as daemon:
+        client.set_transport(UnpooledTransport(daemon.url))
+        before = run(calls, threads)
+        client.set_transport(client.Transport(daemon.url, pool_size=threads))
+        after = run(calls, threads)
+        client.close()
+    print(json.dumps({'calls': calls, 'threads': threads,
+                      'unpooled_calls_per_sec': round(before, 1),
+                      'pooled_calls_per_sec': round(after, 1),
+                      'speedup': round(after / before, 2)}))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,374 @@
+"""Local stand-in for the lbrynet JSON-RPC api, used by the benchmarks
+
+It implements the methods wrapped by client.py with generated data, and can
+add latency, inject errors and scale the size of list results.
+
+    python -m benchmarks.fake_daemon --port 5279 --latency 0.01 --claims 10000
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HEIGHT = 400000
+DATA_RATE = 0.0001
+
+
+def _hex(i, length, salt=''):
+    digest = hashlib.sha384('{}{}'.format(salt, i).encode()).hexdigest()
+    return (digest * (length // len(digest) + 1))[:length]
+
+
+def metadata(i):
+    return {'license': 'LBRY Inc', 'description': 'description ' * 10,
+            'language': 'en', 'title': 'Title {}'.format(i), 'author': 'author {}'.format(i % 50),
+            'nsfw': i % 10 == 0, 'version': '_0_1_0',
+            'thumbnail': 'https://example.com/{}.png'.format(i)}
+
+
+def claim(i, depth=None):
+    height = HEIGHT - (i % 5000) if depth is None else HEIGHT - depth + 1
+    return {
+        'address': 'bY1b4pnx2FUGSNUZyPEFNcLPnXoeZRmNhJ', 'amount': 1.0,
+        'effective_amount': 1.0 + (i % 100), 'blocks_to_expiration': height + 262974 - HEIGHT,
+        'category': 'claim', 'claim_id': _hex(i, 40, 'claim'), 'claim_sequence': 1,
+        'confirmations': HEIGHT - height + 1, 'depth': HEIGHT - height + 1,
+        'decoded_claim': True, 'has_signature': False,
+        'expiration_height': height + 262974, 'expired': False, 'height': height,
+        'is_spent': False, 'name': 'claim-{}'.format(i), 'txid': _hex(i, 64, 'tx'),
+        'nout': 0, 'supports': [],
+        'value': {'version': '_0_0_1', 'claimType': 'streamType', 'stream': {
+            'source': {'source': _hex(i, 96, 'sd'), 'sourceType': 'lbry_sd_hash',
+                       'contentType': 'video/mp4', 'version': '_0_0_1'},
+            'metadata': metadata(i)}},
+    }
+
+
+def channel(i):
+    """A channel claim; channel numbers wrap at 1000 so crawls end"""
+    i %= 1000
+    return dict(claim(i), name='@channel-{}'.format(i), claim_id=_hex(i, 40, 'channel'),
+                value={'version': '_0_0_1', 'claimType': 'certificateType',
+                       'certificate': {'version': '_0_0_1', 'keyType': 'SECP256k1',
+                                       'publicKey': _hex(i, 176, 'key')}})
+
+
+def file_entry(i, written_bytes=None, total_bytes=None):
+    total_bytes = 1000000 + i if total_bytes is None else total_bytes
+    written_bytes = total_bytes if written_bytes is None else written_bytes
+    return {
+        'completed': written_bytes >= total_bytes, 'file_name': 'file-{}.mp4'.format(i),
+        'download_directory': '/home/user/Downloads', 'points_paid': 0.0,
+        'stopped': False, 'stream_hash': _hex(i, 96, 'stream'),
+        'stream_name': 'file-{}.mp4'.format(i), 'suggested_file_name': 'file-{}.mp4'.format(i),
+        'sd_hash': _hex(i, 96, 'sd'), 'name': 'claim-{}'.format(i),
+        'outpoint': '{}:0'.format(_hex(i, 64, 'tx')), 'claim_id': _hex(i, 40, 'claim'),
+        'download_path': '/home/user/Downloads/file-{}.mp4'.format(i),
+        'mime_type': 'video/mp4', 'key': _hex(i, 32, 'key'),
+        'total_bytes': total_bytes, 'written_bytes': written_bytes, 'message': None,
+        'metadata': metadata(i),
+    }
+
+
+def transaction(i):
+    return {'txid': _hex(i, 64, 'tx'), 'timestamp': 1500000000 + i * 600,
+            'confirmations': HEIGHT - (200000 + i) + 1, 'height': 200000 + i,
+            'value': '1.0', 'fee': '-0.0001', 'date': '2017-07-14 02:40',
+            'claim_info': [], 'support_info': [], 'update_info': [], 'abandon_info': []}
+
+
+class DaemonError(Exception):
+    def __init__(self, code, message):
+        Exception.__init__(self, code, message)
+        self.code = code
+        self.message = message
+
+
+class Api(object):
+    """The fake daemon methods; each takes the request params as kwargs
+
+    Args:
+        'claims': (int) number of claims returned by claim_list_mine
+        'files': (int) number of files returned by file_list
+        'transactions': (int) number of transactions in transaction_list
+        'download_rate': (int) bytes per second at which files started with
+                         get() complete
+        'sd_latency': (float) extra seconds stream_cost_estimate takes without
+                      a size, standing in for the sd blob download
+    """
+
+    def __init__(self, claims=100, files=100, transactions=100, download_rate=1000000,
+                 sd_latency=0.0):
+        self.claims = claims
+        self.files = files
+        self.transactions = transactions
+        self.download_rate = download_rate
+        self.sd_latency = sd_latency
+        self.downloads = {}
+        self.published = {}
+        self.lock = threading.Lock()
+
+    def _index(self, name):
+        name = name.split('#')[0]
+        digits = ''.join(c for c in name if c.isdigit())
+        return int(digits) if digits else len(name)
+
+    def _download(self, i):
+        started = self.downloads.get(i)
+        if started is None:
+            return file_entry(i)
+        total = 1000000 + i
+        written = min(total, int((time.time() - started) * self.download_rate))
+        return file_entry(i, written, total)
+
+    def resolve(self, uri):
+        if 'missing' in uri:
+            return None
+        i = self._index(uri)
+        result = {'claim': claim(i)}
+        if '@' in uri:
+            result['certificate'] = channel(i)
+            # point each claim at a further channel so crawls have a graph to walk
+            result['claims_in_channel'] = [
+                dict(claim(i * 10 + n), channel_name=channel(i * 10 + n)['name'])
+                for n in range(5)]
+        return result
+
+    def resolve_name(self, name):
+        if 'missing' in name:
+            return None
+        return metadata(self._index(name))
+
+    def claim_show(self, name, txid=None, nout=None, claim_id=None):
+        if 'missing' in name:
+            return False
+        return claim(self._index(name))
+
+    def claim_list(self, name):
+        i = self._index(name)
+        return {'claims': [claim(i), claim(i + 1)], 'supports_without_claims': [],
+                'last_takeover_height': HEIGHT - 100}
+
+    def claim_list_mine(self):
+        return [claim(i) for i in range(self.claims)]
+
+    def channel_list_mine(self):
+        return [dict(claim(i), name='@channel-{}'.format(i)) for i in range(3)]
+
+    def file_list(self, full_status=False, **filters):
+        with self.lock:
+            started = list(self.downloads)
+        indexes = sorted(set(range(self.files)) | set(started))
+        files = (self._download(i) for i in indexes)
+        return [f for f in files if all(f.get(k) == v for k, v in filters.items() if v is not None)]
+
+    def get(self, uri, file_name=None, timeout=None, download_directory=None):
+        i = self._index(uri) + self.files
+        with self.lock:
+            self.downloads.setdefault(i, time.time())
+        return self._download(i)
+
+    def file_delete(self, **kwargs):
+        return True
+
+    def file_set_status(self, status, **kwargs):
+        return 'Started' if status == 'start' else 'Stopped'
+
+    def descriptor_get(self, sd_hash, timeout=None, payment_rate_manager=None):
+        return {'stream_name': sd_hash[:16], 'stream_hash': _hex(sd_hash, 96, 'stream'),
+                'key': _hex(sd_hash, 32, 'key'), 'stream_type': 'lbryfile',
+                'suggested_file_name': sd_hash[:16],
+                'blobs': [{'blob_num': n, 'length': 2097152, 'iv': _hex(n, 32, 'iv'),
+                           'blob_hash': _hex(n, 96, sd_hash)} for n in range(4)]
+                + [{'blob_num': 4, 'length': 0, 'iv': _hex(4, 32, 'iv')}]}
+
+    def reflect(self, sd_hash):
+        return True
+
+    def get_availability(self, uri, sd_timeout=None, peer_timeout=None):
+        return (self._index(uri) % 100) / 100.0
+
+    def peer_list(self, blob_hash, timeout=None):
+        return [['10.0.0.{}'.format(n), 3333, True] for n in range(len(blob_hash) % 5)]
+
+    def stream_cost_estimate(self, uri, size=None):
+        if size is None:
+            time.sleep(self.sd_latency)
+            size = 1000000 + self._index(uri)
+        return DATA_RATE * size / 1000000.0
+
+    def publish(self, name, bid, file_path=None, metadata=None, **kwargs):
+        with self.lock:
+            n = self.published[name] = len(self.published)
+        return {'tx': _hex(n, 128, 'rawtx'), 'txid': _hex(n, 64, 'pubtx'), 'nout': 0,
+                'fee': 0.0001, 'claim_id': _hex(n, 40, name)}
+
+    def channel_new(self, channel_name, amount):
+        return self.publish(channel_name, amount)
+
+    def claim_abandon(self, claim_id):
+        return {'txid': _hex(claim_id, 64, 'abandon'), 'fee': 0.0001}
+
+    def claim_new_support(self, name, claim_id, amount):
+        return {'txid': _hex(claim_id + str(amount), 64, 'support'), 'nout': 0, 'fee': 0.0001}
+
+    def send_amount_to_address(self, amount, address):
+        return True
+
+    def settings_get(self):
+        return {'data_rate': DATA_RATE, 'download_directory': '/home/user/Downloads',
+                'max_key_fee': 50.0, 'cache_time': 150}
+
+    def settings_set(self, **kwargs):
+        return dict(self.settings_get(), **kwargs)
+
+    def status(self, session_status=False):
+        return {'is_running': True, 'is_first_run': False,
+                'startup_status': {'code': 'started', 'message': 'Started lbrynet'},
+                'blockchain_status': {'blocks': HEIGHT, 'blocks_behind': 0}}
+
+    def transaction_list(self):
+        return [transaction(i) for i in range(self.transactions)]
+
+    def transaction_show(self, txid):
+        return transaction(self._index(txid))
+
+    def wallet_balance(self, address=None, include_uncomfirmed=None):
+        return 100.0
+
+    def wallet_is_address_mine(self, address):
+        return address.startswith('b')
+
+    def wallet_list(self):
+        return ['bY1b4pnx2FUGSNUZyPEFNcLPnXoeZRmNh{}'.format(n) for n in range(5)]
+
+    def wallet_new_address(self):
+        return 'bNewAddress{}'.format(random.randrange(10 ** 9))
+
+    def wallet_public_key(self, address):
+        return [_hex(address, 66, 'pubkey')]
+
+    def wallet_unused_address(self):
+        return 'bUnusedAddress'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length))
+        if isinstance(request, list):
+            if not self.server.batch:
+                self.send_error(400)
+                return
+            response = [self.call(r) for r in request]
+        else:
+            response = self.call(request)
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def call(self, request):
+        server = self.server
+        method = request.get('method', '')
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        latency = server.latency
+        if isinstance(latency, dict):
+            latency = latency.get(method, latency.get('default', 0.0))
+        if latency:
+            time.sleep(latency)
+        try:
+            if server.error_rate and random.random() < server.error_rate:
+                raise DaemonError(-32500, 'Injected error')
+            fn = getattr(server.api, method, None)
+            if method.startswith('_') or fn is None:
+                raise DaemonError(-32601, 'Method Not Found')
+            try:
+                response['result'] = fn(**(request.get('params') or {}))
+            except TypeError as e:
+                raise DaemonError(-32602, str(e))
+        except DaemonError as e:
+            response['error'] = {'code': e.code, 'message': e.message}
+        return response
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeDaemon(object):
+    """Serve the fake api on localhost from a background thread
+
+    Use as a context manager; 'url' is the api url to point the client at.
+
+    Args:
+        'port' (optional): (int) port to listen on, 0 picks a free one
+        'batch' (optional): (bool) false to reject JSON-RPC batch payloads
+        'latency' (optional): (float) seconds added to every call, or a dict
+                              of method name -> seconds with a 'default' key
+        'error_rate' (optional): (float) fraction of calls answered with an
+                                 injected daemon error
+        Other keyword args are passed to Api
+    """
+
+    def __init__(self, port=0, batch=True, latency=0.0, error_rate=0.0, **api_options):
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.batch = batch
+        self.server.latency = latency
+        self.server.error_rate = error_rate
+        self.server.api = self.api = Api(**api_options)
+        self.server.daemon_threads = True
+        self.url = 'http://127.0.0.1:{}/lbryapi'.format(self.server.server_port)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=5279)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--no-batch', dest='batch', action='store_false')
+    parser.add_argument('--claims', type=int, default=100)
+    parser.add_argument('--files', type=int, default=100)
+    parser.add_argument('--transactions', type=int, default=100)
+    parser.add_argument('--download-rate', type=int, default=1000000)
+    parser.add_argument('--sd-latency', type=float, default=0.0)
+    args = parser.parse_args(argv)
+    daemon = FakeDaemon(args.port, args.batch, args.latency, args.error_rate,
+                        claims=args.claims, files=args.files, transactions=args.transactions,
+                        download_rate=args.download_rate, sd_latency=args.sd_latency)
+    print(daemon.url)
+    sys.stdout.flush()
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
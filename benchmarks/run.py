@@ -0,0 +1,172 @@
+"""Benchmark suite for the client against the fake daemon
+
+Starts benchmarks.fake_daemon in a subprocess (or uses --url) and reports
+calls/sec, p50/p99 latency and peak traced memory per scenario, one JSON
+object per line.
+
+    python -m benchmarks.run [--calls 2000] [--concurrency 16] [--only resolve]
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import async_client
+import batch
+import bulk
+import client
+import streaming
+
+
+def _percentile(ordered, p):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+
+def timed_calls(fn, calls, concurrency=1):
+    """Run fn(i) for i in range(calls) and return per-call latencies"""
+    def one(i):
+        start = time.perf_counter()
+        fn(i)
+        return time.perf_counter() - start
+
+    if concurrency == 1:
+        return [one(i) for i in range(calls)]
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(one, range(calls)))
+
+
+def sync_scenario(fn):
+    def run(args, calls):
+        return timed_calls(fn, calls)
+    return run
+
+
+def threaded_scenario(fn):
+    def run(args, calls):
+        return timed_calls(fn, calls, args.concurrency)
+    return run
+
+
+def bulk_resolve(args, calls):
+    stats = bulk.BulkStats()
+    for _ in bulk.resolve_many(('lbry://claim-{}'.format(i) for i in range(calls)),
+                               workers=args.concurrency, stats=stats):
+        pass
+    return stats.latencies
+
+
+def batched_status(args, calls):
+    size = 20
+
+    def one(i):
+        with batch.Batch() as b:
+            futures = [b.status() for _ in range(size)]
+        for future in futures:
+            future.result()
+
+    return [t / size for t in timed_calls(one, max(1, calls // size)) for _ in range(size)]
+
+
+def async_resolve(args, calls):
+    async def one(i, latencies):
+        start = time.perf_counter()
+        await async_client.resolve('lbry://claim-{}'.format(i))
+        latencies.append(time.perf_counter() - start)
+
+    async def run():
+        await async_client.set_transport(async_client.AsyncTransport(client.BASE_URL, args.concurrency))
+        latencies = []
+        await asyncio.gather(*[one(i, latencies) for i in range(calls)])
+        await async_client.close()
+        return latencies
+
+    return asyncio.run(run())
+
+
+def streamed_transaction_list(args, calls):
+    return timed_calls(lambda i: sum(1 for _ in streaming.iter_transaction_list()), max(1, calls // 100))
+
+
+SCENARIOS = [
+    ('status', sync_scenario(lambda i: client.status())),
+    ('resolve', sync_scenario(lambda i: client.resolve('lbry://claim-{}'.format(i)))),
+    ('file_list', sync_scenario(lambda i: client.file_list())),
+    ('transaction_list', sync_scenario(lambda i: client.transaction_list())),
+    ('transaction_list_streamed', streamed_transaction_list),
+    ('resolve_threads', threaded_scenario(lambda i: client.resolve('lbry://claim-{}'.format(i)))),
+    ('resolve_many', bulk_resolve),
+    ('resolve_async', async_resolve),
+    ('status_batched', batched_status),
+]
+
+# list calls return large bodies, run fewer of them
+SCALE = {'file_list': 100, 'transaction_list': 100}
+
+
+def measure(name, scenario, args):
+    calls = max(1, args.calls // SCALE.get(name, 1))
+    start = time.perf_counter()
+    latencies = scenario(args, calls)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    scenario(args, max(1, calls // 10))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    ordered = sorted(latencies)
+    return {
+        'scenario': name,
+        'calls': len(ordered),
+        'calls_per_sec': round(len(ordered) / elapsed, 1),
+        'p50_ms': round(_percentile(ordered, 50) * 1000, 3),
+        'p99_ms': round(_percentile(ordered, 99) * 1000, 3),
+        'peak_mem_kb': peak // 1024,
+    }
+
+
+def start_daemon(args):
+    cmd = [sys.executable, '-m', 'benchmarks.fake_daemon', '--port', '0',
+           '--latency', str(args.latency), '--files', str(args.files),
+           '--transactions', str(args.transactions), '--claims', str(args.claims)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, universal_newlines=True)
+    return proc, proc.stdout.readline().strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='benchmark an already running daemon')
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--files', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=10000)
+    parser.add_argument('--claims', type=int, default=1000)
+    parser.add_argument('--only', action='append', help='scenario name, may be repeated')
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_daemon(args)
+    client.BASE_URL = url
+    client.set_transport(client.Transport(url, pool_size=args.concurrency))
+    try:
+        for name, scenario in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            print(json.dumps(measure(name, scenario, args)))
+            sys.stdout.flush()
+    finally:
+        client.close()
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == '__main__':
+    main()
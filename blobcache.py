@@ -0,0 +1,176 @@
+"""Disk cache of decoded sd blobs shared between processes
+
+    blobs = BlobCache('/var/cache/lbry-sd', max_bytes=512 * 1024 * 1024)
+    descriptor = blobs.descriptor_get(sd_hash)
+
+sd blobs are immutable and named by their hash, so a descriptor_get result
+can be kept forever under its sd_hash. Each result is stored as one JSON file
+in 'directory', written to a temporary file and renamed into place, so any
+number of processes can share the directory and never see a partial file.
+Files are read through mmap, and recently decoded results are also kept in
+memory. A hit never calls the daemon.
+
+The file's mtime records its last use. When the files outgrow 'max_bytes' the
+least recently used ones are deleted until they take up 'low_water' of it.
+Hits served from memory do not update the mtime.
+"""
+import mmap
+import os
+import re
+import threading
+
+import cache
+import client
+import storage
+
+_SD_HASH = re.compile(r'^[0-9a-fA-F]{16,128}$')
+
+
+def _decode(data):
+    if client.orjson is not None:
+        # orjson reads straight from the mapped pages
+        with memoryview(data) as view:
+            return client._loads(view)
+    return client._loads(data[:])
+
+
+class BlobCache(object):
+    """Content addressed cache in front of descriptor_get
+
+    Args:
+        'directory': (str) cache directory, created if missing
+        'max_bytes' (optional): (int) size cap of the files on disk
+        'low_water' (optional): (float) fraction of max_bytes eviction
+                                shrinks the cache to
+        'memory_items' (optional): (int) decoded results kept in memory
+        'memory_ttl' (optional): (float) seconds a decoded result is kept
+        'lbry' (optional): (LbryClient) client to fetch misses with, defaults
+                           to client.default_client()
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, low_water=0.9,
+                 memory_items=1024, memory_ttl=600, lbry=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.memory = cache.TTLCache(memory_items, memory_ttl)
+        self.lbry = lbry
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = self._scan_size()
+
+    def path(self, sd_hash):
+        if not _SD_HASH.match(sd_hash):
+            raise Exception('{!r} is not an sd hash'.format(sd_hash))
+        sd_hash = sd_hash.lower()
+        return os.path.join(self.directory, sd_hash[:2], sd_hash)
+
+    def _files(self):
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.is_file() and not entry.name.startswith('.'):
+                    yield entry
+
+    def _scan_size(self):
+        total = 0
+        for entry in self._files():
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def read(self, sd_hash):
+        """Return the cached decoded sd blob, None if it is not cached"""
+        sd_hash = sd_hash.lower()
+        value = self.memory.get(sd_hash)
+        if value is not cache.MISSING:
+            self.memory_hits += 1
+            return value
+        path = self.path(sd_hash)
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                value = _decode(data)
+        except (FileNotFoundError, ValueError):
+            # not cached, or evicted or emptied under us by another process
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.disk_hits += 1
+        self.memory.set(sd_hash, value)
+        return value
+
+    def write(self, sd_hash, descriptor):
+        """Store a decoded sd blob"""
+        sd_hash = sd_hash.lower()
+        path = self.path(sd_hash)
+        data = client._dumps(descriptor)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        storage.atomic_write(path, data)
+        self.memory.set(sd_hash, descriptor)
+        with self._lock:
+            self._bytes += len(data)
+            full = self._bytes > self.max_bytes
+        if full:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used files until under the low water mark
+
+        Other processes write to the same directory, so the size is taken
+        from a fresh scan.
+        """
+        entries = []
+        for entry in self._files():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.low_water
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evicted += 1
+        with self._lock:
+            self._bytes = total
+
+    def descriptor_get(self, sd_hash, timeout=None, payment_rate_manager=None):
+        """Cached version of client.descriptor_get
+
+        Only decoded descriptors are cached, failure messages are returned
+        without being stored.
+        """
+        value = self.read(sd_hash)
+        if value is not None:
+            return value
+        self.misses += 1
+        lbry = self.lbry or client.default_client()
+        value = lbry.descriptor_get(sd_hash, timeout=timeout,
+                                    payment_rate_manager=payment_rate_manager)
+        if isinstance(value, dict):
+            self.write(sd_hash, value)
+        return value
+
+    def stats(self):
+        """Returns:
+            (dict) memory_hits, disk_hits, misses, evicted and bytes on disk
+            as this process last counted them
+        """
+        return {'memory_hits': self.memory_hits, 'disk_hits': self.disk_hits,
+                'misses': self.misses, 'evicted': self.evicted, 'bytes': self._bytes}
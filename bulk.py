@@ -0,0 +1,162 @@
+"""Resolve large numbers of uris concurrently"""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cache
+import client
+
+
+class BulkStats(object):
+    """Throughput and latency counters for a bulk run
+
+    Latencies are kept in a fixed size random sample so memory stays flat.
+    """
+
+    def __init__(self, sample_size=10000):
+        self.sample_size = sample_size
+        self.started = time.perf_counter()
+        self.finished = None
+        self.calls = 0
+        self.errors = 0
+        self.duplicates = 0
+        self.latencies = []
+
+    def record(self, latency, failed):
+        self.calls += 1
+        if failed:
+            self.errors += 1
+        if len(self.latencies) < self.sample_size:
+            self.latencies.append(latency)
+        else:
+            i = random.randrange(self.calls)
+            if i < self.sample_size:
+                self.latencies[i] = latency
+
+    def percentile(self, p):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+    def summary(self):
+        """Returns:
+            (dict) call, error and duplicate counts, elapsed seconds, calls per
+            second and p50/p99 latency in seconds
+        """
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'duplicates': self.duplicates,
+            'elapsed': elapsed,
+            'calls_per_sec': self.calls / elapsed if elapsed else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+        }
+
+
+class RateLimiter(object):
+    """Token bucket allowing 'rate' acquisitions per second"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n or self.tokens >= self.capacity:
+                    self.tokens -= n
+                    return
+                delay = (n - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+def _timed(fn, arg):
+    start = time.perf_counter()
+    try:
+        result = fn(arg)
+    except Exception as e:
+        return e, time.perf_counter() - start, True
+    return result, time.perf_counter() - start, False
+
+
+def map_unordered(fn, items, workers=None, stats=None):
+    """Call fn on every item on a thread pool, yielding results as they complete
+
+    items is consumed lazily and at most 'workers' calls are in flight. A
+    failing call does not stop the run, its exception is yielded in place of
+    a result.
+
+    Args:
+        'fn': (callable) called with each item
+        'items': (iterable) arguments for fn
+        'workers' (optional): (int) max concurrent calls, defaults to
+                              client.POOL_SIZE
+        'stats' (optional): (BulkStats) filled in while the run progresses
+    Returns:
+        (generator) (item, result or exception) tuples in completion order
+    """
+    workers = workers or client.POOL_SIZE
+    stats = stats if stats is not None else BulkStats()
+    items = iter(items)
+    pending = {}
+    with ThreadPoolExecutor(workers) as pool:
+        try:
+            while True:
+                for item in items:
+                    pending[pool.submit(_timed, fn, item)] = item
+                    if len(pending) >= workers:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    result, latency, failed = future.result()
+                    stats.record(latency, failed)
+                    yield item, result
+        finally:
+            for future in pending:
+                future.cancel()
+            stats.finished = time.perf_counter()
+
+
+def resolve_many(uris, workers=None, stats=None, resolve=None):
+    """Resolve an iterable of uris, yielding results as they complete
+
+    uris is consumed lazily and at most 'workers' resolves are in flight, so
+    only the set of normalized uris already seen grows with the input; each
+    distinct uri is resolved once. A failing uri does not stop the run, its
+    exception is yielded in place of a result.
+
+    Args:
+        'uris': (iterable) lbry uris
+        'workers' (optional): (int) max concurrent resolves, defaults to
+                              client.POOL_SIZE
+        'stats' (optional): (BulkStats) filled in while the run progresses
+        'resolve' (optional): (callable) uri -> result, defaults to client.resolve
+    Returns:
+        (generator) (uri, result or exception) tuples in completion order
+    """
+    stats = stats if stats is not None else BulkStats()
+
+    def distinct(uris):
+        seen = set()
+        for uri in uris:
+            key = cache.normalize_name(uri)
+            if key in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(key)
+            yield uri
+
+    return map_unordered(resolve or client.resolve, distinct(uris), workers, stats)
@@ -0,0 +1,151 @@
+"""In-process caches for daemon results"""
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class TTLCache(object):
+    """Thread safe mapping with LRU eviction and a time to live per entry
+
+    Args:
+        'maxsize' (optional): (int) max number of entries before the least
+                              recently used one is evicted
+        'ttl' (optional): (float) default seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        """Return the value for key, or default if it is missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            self._data[key] = (self.clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=MISSING):
+        """Drop key, or every entry if no key is given"""
+        with self._lock:
+            if key is MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def stats(self):
+        """Returns:
+            (dict) hits, misses, evictions and current size
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'size': len(self._data)}
+
+    def __len__(self):
+        return len(self._data)
+
+
+def normalize_name(uri):
+    """Strip whitespace and the lbry:// prefix from a uri or name"""
+    uri = uri.strip()
+    if uri[:7].lower() == 'lbry://':
+        uri = uri[7:]
+    return uri
+
+
+def claim_depth(result):
+    """Return the smallest claim depth found in a resolve result, or None"""
+    if not isinstance(result, dict):
+        return None
+    depths = [result.get('depth')]
+    for field in ('claim', 'certificate'):
+        if isinstance(result.get(field), dict):
+            depths.append(result[field].get('depth'))
+    depths = [d for d in depths if isinstance(d, int)]
+    return min(depths) if depths else None
+
+
+def is_unresolved(result):
+    """True if the daemon result means the name does not resolve"""
+    if not result:
+        return True
+    return isinstance(result, dict) and set(result) == {'error'}
+
+
+class ResolveCache(TTLCache):
+    """Cache for resolve, resolve_name and claim_show results
+
+    Entries are keyed on the method, the normalized uri or name and any other
+    args. Claims with more confirmations live longer: the ttl of an entry is
+    ttl * depth, capped at max_ttl. Results for names that do not resolve are
+    kept for negative_ttl seconds.
+
+    Args:
+        'maxsize' (optional): (int) max number of cached results
+        'ttl' (optional): (float) seconds to keep a result with depth <= 1 or
+                          without depth information
+        'max_ttl' (optional): (float) upper bound for depth based ttls
+        'negative_ttl' (optional): (float) seconds to keep unresolved results
+        'depth_ttl' (optional): (callable) depth -> ttl, replaces the default
+                                depth policy
+    """
+
+    def __init__(self, maxsize=10000, ttl=60, max_ttl=3600, negative_ttl=5,
+                 depth_ttl=None, clock=time.monotonic):
+        TTLCache.__init__(self, maxsize, ttl, clock)
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.depth_ttl = depth_ttl
+
+    @staticmethod
+    def key(method, name, **kwargs):
+        return (method, normalize_name(name), tuple(sorted(kwargs.items())))
+
+    def ttl_for(self, result):
+        if is_unresolved(result):
+            return self.negative_ttl
+        depth = claim_depth(result)
+        if depth is None:
+            return self.ttl
+        if self.depth_ttl is not None:
+            return self.depth_ttl(depth)
+        return min(self.max_ttl, self.ttl * max(depth, 1))
+
+    def put(self, key, result, value=MISSING):
+        """Store value, result itself by default, for as long as result's ttl"""
+        self.set(key, result if value is MISSING else value, self.ttl_for(result))
+
+    def invalidate_name(self, name):
+        """Drop every cached result for a uri or name"""
+        name = normalize_name(name)
+        self.invalidate_where(lambda key: key[1] == name)
@@ -1,238 +1,684 @@
 import requests
+import copy
 import json
+import threading
+import time
+from concurrent.futures import Future
 from pprint import pprint
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import cache
+import metrics
+import models
+import projection
 
 BASE_URL = 'http://localhost:5279/lbryapi'
+POOL_SIZE = 10
+# seconds a call's daemon side timeouts are kept below its HTTP timeout
+DAEMON_TIMEOUT_MARGIN = 1.0
+# return models records instead of plain dicts where supported
+TYPED_RESULTS = False
+# read-only methods whose identical concurrent calls can share one request
+COALESCED_METHODS = frozenset([
+    'channel_list_mine', 'claim_list', 'claim_list_mine', 'claim_show', 'file_list',
+    'get_availability', 'peer_list', 'resolve', 'resolve_name', 'settings_get', 'status',
+    'stream_cost_estimate', 'transaction_list', 'transaction_show', 'wallet_balance',
+    'wallet_is_address_mine', 'wallet_list', 'wallet_public_key',
+])
+
+
+class Transport(object):
+    """Keep-alive, connection pooled HTTP transport to a lbrynet daemon
+
+    A single requests.Session is shared by every caller. Its connection pool
+    is thread safe, so one Transport can be used from many threads at once;
+    pool_size bounds the number of sockets kept open to the daemon.
 
+    Args:
+        'url' (optional): (str) daemon api url, defaults to BASE_URL
+        'pool_size' (optional): (int) max number of pooled connections
+        'timeout' (optional): (float) seconds to wait for the daemon, None
+                              waits forever
+    """
 
-def _request(method, **kwargs):
-    params = {}
-    for k, v in kwargs.items():
-        params[k] = v
-    data = json.dumps({'method': method, 'params': params})
-    res = requests.post(BASE_URL, data=data)
-    res.raise_for_status
-    result = res.json()
-    if 'error' in result:
-        code = result['error']['code']
-        msg = result['error']['message']
-        raise Exception(code, msg)
-    return result['result']
+    def __init__(self, url=None, pool_size=POOL_SIZE, timeout=None):
+        self.url = url or BASE_URL
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._owner = True
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
+    def post(self, data, stream=False):
+        return self.session.post(self.url, data=data, stream=stream, timeout=self.timeout)
 
-def channel_list_mine():
-    """Get my channels
+    def with_timeout(self, timeout):
+        """Return a transport sharing this one's connection pool with another
+        timeout. Closing it leaves the pool open.
+        """
+        other = copy.copy(self)
+        other.timeout = timeout
+        other._owner = False
+        return other
 
-    Returns:
-        (list) ClaimDict
-    """
-    res = _request('channel_list_mine')
-    return res
+    def close(self):
+        if self._owner:
+            self.session.close()
 
+    def __enter__(self):
+        return self
 
-def channel_new(name, amount):
-    """Generate a publisher key and create a new certificate claim
+    def __exit__(self, *exc_info):
+        self.close()
 
-    Args:
-        'channel_name': (str) '@' prefixed name
-        'amount': (float) amount to claim name
 
-    Returns:
-        (dict) Dictionary containing result of the claim
-        {
-            'tx' : (str) hex encoded transaction
-            'txid' : (str) txid of resulting claim
-            'nout' : (int) nout of the resulting claim
-            'fee' : (float) fee paid for the claim transaction
-            'claim_id' : (str) claim ID of the resulting claim
-        }
-    """
-    if name[0] != '@':
-        name = '@' + name
-    if not isinstance(amount, float):
-        amount = float(amount)
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
-    res = _request('channel_new', channel_name=name, amount=amount)
-    return res['result']['claim_id']
+    _loads = json.loads
 
 
-def claim_abandon(claim_id):
-    """Abandon a name and reclaim credits from the claim
+def daemon_timeouts(remaining, parts=1):
+    """Split the seconds left for a call into its daemon side timeouts
+
+    The daemon's timeouts are whole seconds adding up to at most remaining
+    less DAEMON_TIMEOUT_MARGIN, so the daemon gives up and answers before an
+    HTTP timeout of remaining expires.
 
     Args:
-        'claim_id': (str) claim_id of claim
-    Return:
-        (dict) Dictionary containing result of the claim
-        {
-            txid : (str) txid of resulting transaction
-            fee : (float) fee paid for the transaction
-        }
+        'remaining': (float) seconds left for the call
+        'parts' (optional): (int) number of timeouts the daemon waits out
+                            one after the other
+    Returns:
+        (int) seconds for each timeout, None if that would be under a second
     """
-    res = _request('claim_abandon', claim_id=claim_id)
-    print(res)
-    return res
+    each = int((remaining - DAEMON_TIMEOUT_MARGIN) / parts)
+    return each if each >= 1 else None
 
 
-def claim_list(name):
-    """Get Claims for a name
+def _encode(method, params):
+    return _dumps({'method': method, 'params': params})
 
-    Arguments:
-        name {str} -- search for claims on this name
 
-    Returns:
-        (dict) State of claims assigned for the name
-    {
-        'claims': (list) list of claims for the name
-        [
-            {
-            'amount': (float) amount assigned to the claim
-            'effective_amount': (float) total amount assigned to the claim,
-                                including supports
-            'claim_id': (str) claim ID of the claim
-            'height': (int) height of block containing the claim
-            'txid': (str) txid of the claim
-            'nout': (int) nout of the claim
-            'supports': (list) a list of supports attached to the claim
-            'value': (str) the value of the claim
-            },
-        ]
-        'supports_without_claims': (list) supports without any claims attached to them
-        'last_takeover_height': (int) the height of last takeover for the name
-    }
-    """
-    res = _request('claim_list', name=name)
-    return res
+class DaemonError(Exception):
+    """An error answered by the daemon for a call, with args (code, message)
 
+    Anything else raised by a call, a transport error or a response that is
+    not JSON-RPC, means the outcome of the call is unknown.
+    """
 
-def claim_list_mine():
-    """List my name claims
-    Returns
-    (list) List of name claims owned by user
-    [
-        {
-            'address': (str) address that owns the claim
-            'amount': (float) amount assigned to the claim
-            'blocks_to_expiration': (int) number of blocks until it expires
-            'category': (str) "claim", "update" , or "support"
-            'claim_id': (str) claim ID of the claim
-            'confirmations': (int) number of blocks of confirmations for the claim
-            'expiration_height': (int) the block height which the claim will expire
-            'expired': (bool) true if expired, false otherwise
-            'height': (int) height of the block containing the claim
-            'is_spent': (bool) true if claim is abandoned, false otherwise
-            'name': (str) name of the claim
-            'txid': (str) txid of the cliam
-            'nout': (int) nout of the claim
-            'value': (str) value of the claim
-        },
-   ]
-   """
-    res = _request('claim_list_mine')
-    return res
+    def __init__(self, code, message):
+        Exception.__init__(self, code, message)
+        self.code = code
+        self.message = message
 
 
-def claim_new_support(name, claim_id, amount):
-    """Support a claim name
+def _result(response):
+    if 'error' in response:
+        code = response['error']['code']
+        msg = response['error']['message']
+        raise DaemonError(code, msg)
+    return response['result']
 
-    Args:
-        'name': (str) Name of claim
-        'claim_id': (str) claim ID of claim to support
-        'amount': (float) amount to support by
 
-    Return:
-        (dict) Dictionary containing result of the claim
-        {
-            txid : (str) txid of resulting support claim
-            nout : (int) nout of the resulting support claim
-            fee : (float) fee paid for the transaction
-        }
-    """
-    if not isinstance(amount, float):
-        amount = float(amount)
-    res = _request('claim_new_support', name, claim_id, amount)
-    return res
+def _response(res):
+    # the daemon may send its errors with an error status, so only fail on
+    # the status when the body is not a JSON-RPC error
+    try:
+        body = _loads(res.content)
+    except ValueError:
+        res.raise_for_status()
+        raise
+    if res.status_code >= 400 and not (isinstance(body, dict) and 'error' in body):
+        res.raise_for_status()
+    return _result(body)
 
 
-def claim_show(name, txid=None, nout=None, claim_id=None):
-    """ Resolve claim info from a LBRY name
+def _check_publish_fields(metadata, kwargs):
+    fields = ['title', 'description', 'author', 'language', 'license', 'nsfw']
+    for f in fields:
+        if kwargs.get(f) is None and metadata.get(f) is None:
+            msg = '{} is a required field for publishing. Please include it as a keyword arg or within metadata'.format(f)
+            raise Exception(msg)
 
-    Args:
-        'name': (str) name to look up, do not include lbry:// prefix
-        'txid'(optional): (str) if specified, look for claim with this txid
-        'nout'(optional): (int) if specified, look for claim with this nout
-        'claim_id'(optional): (str) if specified, look for claim with this claim_id
-    Returns:
-        (dict) Dictionary containing claim info, (bool) false if claim is not
-            resolvable
 
-        {
-            'txid': (str) txid of claim
-            'nout': (int) nout of claim
-            'amount': (float) amount of claim
-            'value': (str) value of claim
-            'height' : (int) height of claim takeover
-            'claim_id': (str) claim ID of claim
-            'supports': (list) list of supports associated with claim
-        }
-    """
+_before_hooks = []
+_after_hooks = []
+_hooked = False
 
 
-def descriptor_get(sd_hash, timeout=None, payment_rate_manager=None):
-    """Download and return a sd blob
+def add_hooks(before=None, after=None):
+    """Register functions called around every daemon call
 
     Args:
-    'sd_hash': (str) hash of sd blob
-    'timeout'(optional): (int) timeout in number of seconds
-    'payment_rate_manager'(optional): (str) if not given the default payment rate manager
-                                     will be used. supported alternative rate managers:
-                                     only-free
-
-    Returns
-        (str) Success/Fail message or (dict) decoded data
+        'before' (optional): (callable) before(method, params), called before
+                             the request is sent
+        'after' (optional): (callable) after(method, params, info), called
+                            once the call finished. info is a dict with
+                            'latency' (seconds), 'request_bytes',
+                            'response_bytes' and 'error' (the exception raised
+                            or None)
     """
-    res = _request('descriptor_get', sd_hash, timeout, payment_rate_manager)
-    return res
-
-
-def file_delete(name=None, sd_hash=None, file_hash=None, stream_hash=None, claim_id=None, outpoint=None, rowid=None, delete_target_file=None):
-    """Delete a lbry file
+    global _hooked
+    if before is not None:
+        _before_hooks.append(before)
+    if after is not None:
+        _after_hooks.append(after)
+    _hooked = bool(_before_hooks or _after_hooks)
+
+
+def remove_hooks(before=None, after=None):
+    """Unregister hooks, or all of them if none are given"""
+    global _hooked
+    if before is None and after is None:
+        del _before_hooks[:]
+        del _after_hooks[:]
+    if before in _before_hooks:
+        _before_hooks.remove(before)
+    if after in _after_hooks:
+        _after_hooks.remove(after)
+    _hooked = bool(_before_hooks or _after_hooks)
+
+
+def enable_metrics(collector=None):
+    """Record latency, sizes and errors of every daemon call
 
     Args:
-        'name' (optional): (str) delete file by lbry name,
-        'sd_hash' (optional): (str) delete file by sd hash,
-        'file_name' (optional): (str) delete file by the name in the downloads folder,
-        'stream_hash' (optional): (str) delete file by stream hash,
-        'claim_id' (optional): (str) delete file by claim ID,
-        'outpoint' (optional): (str) delete file by claim outpoint,
-        'rowid': (optional): (int) delete file by rowid in the file manager
-        'delete_target_file' (optional): (bool) delete file from downloads folder,
-                                        defaults to true if false only the blobs and
-                                        db entries will be deleted
+        'collector' (optional): (Metrics) collector to record into
     Returns:
-        (bool) true if deletion was successful
+        (Metrics) the collector, for snapshot() and prometheus()
     """
-    res = _request('file_delete', name, sd_hash, file_hash,
-                   stream_hash, claim_id, outpoint, rowid, delete_target_file)
-    return res
+    collector = collector or metrics.Metrics()
+
+    def observe(method, params, info):
+        error = info['error']
+        code = None
+        if error is not None:
+            code = error.code if isinstance(error, DaemonError) else type(error).__name__
+        collector.observe(method, info['latency'], info['request_bytes'],
+                          info['response_bytes'], code)
+
+    observe.collector = collector
+    add_hooks(after=observe)
+    return collector
+
+
+def disable_metrics(collector):
+    """Stop recording into a collector returned by enable_metrics"""
+    for hook in list(_after_hooks):
+        if getattr(hook, 'collector', None) is collector:
+            remove_hooks(after=hook)
+
+
+def _call(transport, method, params):
+    if _hooked:
+        return _call_hooked(transport, method, params)
+    res = transport.post(_encode(method, params))
+    return _response(res)
+
+
+def _call_hooked(transport, method, params):
+    for hook in _before_hooks:
+        hook(method, params)
+    info = {'request_bytes': 0, 'response_bytes': 0, 'error': None}
+    start = time.perf_counter()
+    try:
+        data = _encode(method, params)
+        info['request_bytes'] = len(data)
+        res = transport.post(data)
+        info['response_bytes'] = len(res.content)
+        return _response(res)
+    except Exception as e:
+        info['error'] = e
+        raise
+    finally:
+        info['latency'] = time.perf_counter() - start
+        for hook in _after_hooks:
+            hook(method, params, info)
+
+
+class LbryClient(object):
+    """Client for one lbrynet daemon
+
+    Every daemon function of this module is available as a method. Each
+    instance has its own endpoint, connection pool, timeout, resolve cache and
+    result mode, and is safe to share between threads. The module level
+    functions delegate to default_client().
 
+    Args:
+        'url' (optional): (str) daemon api url, defaults to BASE_URL
+        'pool_size' (optional): (int) max number of pooled connections
+        'timeout' (optional): (float) seconds to wait for the daemon
+        'typed' (optional): (bool) return models records instead of plain
+                            dicts, defaults to TYPED_RESULTS
+        'pool' (optional): (DaemonPool) send calls through a pool.DaemonPool
+                           instead of a single daemon
+        'coalesce' (optional): (bool) let concurrent identical calls of
+                               COALESCED_METHODS share one daemon request,
+                               each getting its own copy of the result
+    """
 
-def file_list(**kwargs):
-    """List files limited by optional filters
+    def __init__(self, url=None, pool_size=POOL_SIZE, timeout=None, typed=None, pool=None,
+                 coalesce=True):
+        self.url = url or BASE_URL
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.typed = typed
+        self.pool = pool
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self.resolve_cache = None
+        self._transport = None
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    @property
+    def transport(self):
+        """The Transport calls are sent with, created on first use"""
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = Transport(self.url, self.pool_size, self.timeout)
+        return self._transport
+
+    def set_transport(self, transport):
+        """Use transport for all following calls, closing the previous one
+
+        Args:
+            'transport': (Transport) transport to use, None to reset to default
+        """
+        with self._lock:
+            old, self._transport = self._transport, transport
+        if old is not None and old is not transport:
+            old.close()
+
+    def with_timeout(self, timeout):
+        """Return a client for the same daemon whose calls wait at most
+        timeout seconds for it
+
+        The new client shares this one's connection pool, resolve cache and
+        options. Calls sent through a DaemonPool keep the pool's timeouts.
+        """
+        other = copy.copy(self)
+        other.timeout = timeout
+        other._transport = self.transport.with_timeout(timeout)
+        other._lock = threading.Lock()
+        other._in_flight = {}
+        return other
+
+    def close(self):
+        """Close the pooled connections"""
+        self.set_transport(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def enable_resolve_cache(self, **kwargs):
+        """Cache results of resolve, resolve_name and claim_show
+
+        Args:
+            Keyword args are passed to cache.ResolveCache
+        Returns:
+            (ResolveCache) the cache, for stats() and invalidate_name()
+        """
+        self.resolve_cache = cache.ResolveCache(**kwargs)
+        return self.resolve_cache
+
+    def disable_resolve_cache(self):
+        """Stop caching resolve results and drop the cache"""
+        self.resolve_cache = None
+
+    def _request(self, method, **kwargs):
+        if self.coalesce and method in COALESCED_METHODS:
+            return self._single_flight((method, _dumps(kwargs)),
+                                       lambda: self._send(method, kwargs))
+        return self._send(method, kwargs)
+
+    def _send(self, method, params):
+        if self.pool is not None:
+            return self.pool.call(method, params)
+        return _call(self.transport, method, params)
+
+    def _single_flight(self, key, send):
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            # each caller gets its own copy to modify
+            return _loads(_dumps(future.result()))
+        try:
+            res = send()
+        except BaseException as e:
+            # also on KeyboardInterrupt, or the followers would wait forever
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _cached_request(self, method, name_arg, **kwargs):
+        resolve_cache = self.resolve_cache
+        if resolve_cache is None:
+            return self._request(method, **kwargs)
+        args = dict(kwargs)
+        key = resolve_cache.key(method, args.pop(name_arg), **args)
+        data = resolve_cache.get(key)
+        if data is not cache.MISSING:
+            # results are kept encoded so every hit gets its own copy, which
+            # the caller may change without affecting later hits
+            return _loads(data)
+        res = self._request(method, **kwargs)
+        resolve_cache.put(key, res, _dumps(res))
+        return res
+
+    def _projected(self, method, fields, **kwargs):
+        if self.pool is not None:
+            # a pool answers with whole responses, so project after parsing
+            return projection.shape(method, self._request(method, **kwargs), fields)
+        # parse the list incrementally so only the kept fields of each
+        # record are held
+        import streaming
+        send = lambda: list(streaming.iter_request(method, self, fields, **kwargs))
+        if self.coalesce and method in COALESCED_METHODS:
+            return self._single_flight((method, _dumps(kwargs), tuple(sorted(fields))), send)
+        return send()
+
+    def _typed(self, method, res):
+        typed = TYPED_RESULTS if self.typed is None else self.typed
+        if typed:
+            return models.convert(method, res)
+        return res
+
+    def channel_list_mine(self):
+        """Get my channels
+
+        Returns:
+            (list) ClaimDict
+        """
+        res = self._request('channel_list_mine')
+        return res
+
+    def channel_new(self, name, amount):
+        """Generate a publisher key and create a new certificate claim
+
+        Args:
+            'channel_name': (str) '@' prefixed name
+            'amount': (float) amount to claim name
+
+        Returns:
+            (dict) Dictionary containing result of the claim
+            {
+                'tx' : (str) hex encoded transaction
+                'txid' : (str) txid of resulting claim
+                'nout' : (int) nout of the resulting claim
+                'fee' : (float) fee paid for the claim transaction
+                'claim_id' : (str) claim ID of the resulting claim
+            }
+        """
+        if name[0] != '@':
+            name = '@' + name
+        if not isinstance(amount, float):
+            amount = float(amount)
+
+        res = self._request('channel_new', channel_name=name, amount=amount)
+        return res['result']['claim_id']
+
+    def claim_abandon(self, claim_id):
+        """Abandon a name and reclaim credits from the claim
+
+        Args:
+            'claim_id': (str) claim_id of claim
+        Return:
+            (dict) Dictionary containing result of the claim
+            {
+                txid : (str) txid of resulting transaction
+                fee : (float) fee paid for the transaction
+            }
+        """
+        res = self._request('claim_abandon', claim_id=claim_id)
+        print(res)
+        return res
 
-    Args:
-        'name' (optional): (str) filter files by lbry name,
-        'sd_hash' (optional): (str) filter files by sd hash,
-        'file_name' (optional): (str) filter files by the name in the downloads folder,
-        'stream_hash' (optional): (str) filter files by stream hash,
-        'claim_id' (optional): (str) filter files by claim id,
-        'outpoint' (optional): (str) filter files by claim outpoint,
-        'rowid' (optional): (int) filter files by internal row id,
-        'full_status': (optional): (bool) if true populate the 'message' and 'size' fields
+    def claim_list(self, name, fields=None):
+        """Get Claims for a name
 
-    Returns:
-        (list) List of files
+        Arguments:
+            name {str} -- search for claims on this name
+            fields {list} -- optional dotted paths to keep of each claim, see
+                             projection.py
 
+        Returns:
+            (dict) State of claims assigned for the name
+        {
+            'claims': (list) list of claims for the name
+            [
+                {
+                'amount': (float) amount assigned to the claim
+                'effective_amount': (float) total amount assigned to the claim,
+                                    including supports
+                'claim_id': (str) claim ID of the claim
+                'height': (int) height of block containing the claim
+                'txid': (str) txid of the claim
+                'nout': (int) nout of the claim
+                'supports': (list) a list of supports attached to the claim
+                'value': (str) the value of the claim
+                },
+            ]
+            'supports_without_claims': (list) supports without any claims attached to them
+            'last_takeover_height': (int) the height of last takeover for the name
+        }
+        """
+        res = self._request('claim_list', name=name)
+        if fields is not None:
+            return projection.shape('claim_list', res, fields)
+        return self._typed('claim_list', res)
+
+    def claim_list_mine(self, fields=None):
+        """List my name claims
+
+        Args:
+            'fields' (optional): (list) dotted paths to keep of each claim, see
+                                 projection.py
+        Returns
+        (list) List of name claims owned by user
         [
+            {
+                'address': (str) address that owns the claim
+                'amount': (float) amount assigned to the claim
+                'blocks_to_expiration': (int) number of blocks until it expires
+                'category': (str) "claim", "update" , or "support"
+                'claim_id': (str) claim ID of the claim
+                'confirmations': (int) number of blocks of confirmations for the claim
+                'expiration_height': (int) the block height which the claim will expire
+                'expired': (bool) true if expired, false otherwise
+                'height': (int) height of the block containing the claim
+                'is_spent': (bool) true if claim is abandoned, false otherwise
+                'name': (str) name of the claim
+                'txid': (str) txid of the cliam
+                'nout': (int) nout of the claim
+                'value': (str) value of the claim
+            },
+       ]
+       """
+        if fields is not None:
+            return self._projected('claim_list_mine', fields)
+        res = self._request('claim_list_mine')
+        return self._typed('claim_list_mine', res)
+
+    def claim_new_support(self, name, claim_id, amount):
+        """Support a claim name
+
+        Args:
+            'name': (str) Name of claim
+            'claim_id': (str) claim ID of claim to support
+            'amount': (float) amount to support by
+
+        Return:
+            (dict) Dictionary containing result of the claim
+            {
+                txid : (str) txid of resulting support claim
+                nout : (int) nout of the resulting support claim
+                fee : (float) fee paid for the transaction
+            }
+        """
+        if not isinstance(amount, float):
+            amount = float(amount)
+        res = self._request('claim_new_support', name=name, claim_id=claim_id, amount=amount)
+        return res
+
+    def claim_show(self, name, txid=None, nout=None, claim_id=None):
+        """ Resolve claim info from a LBRY name
+
+        Args:
+            'name': (str) name to look up, do not include lbry:// prefix
+            'txid'(optional): (str) if specified, look for claim with this txid
+            'nout'(optional): (int) if specified, look for claim with this nout
+            'claim_id'(optional): (str) if specified, look for claim with this claim_id
+        Returns:
+            (dict) Dictionary containing claim info, (bool) false if claim is not
+                resolvable
+
+            {
+                'txid': (str) txid of claim
+                'nout': (int) nout of claim
+                'amount': (float) amount of claim
+                'value': (str) value of claim
+                'height' : (int) height of claim takeover
+                'claim_id': (str) claim ID of claim
+                'supports': (list) list of supports associated with claim
+            }
+        """
+        res = self._cached_request('claim_show', 'name', name=name, txid=txid, nout=nout, claim_id=claim_id)
+        return res
+
+    def descriptor_get(self, sd_hash, timeout=None, payment_rate_manager=None):
+        """Download and return a sd blob
+
+        Args:
+        'sd_hash': (str) hash of sd blob
+        'timeout'(optional): (int) timeout in number of seconds
+        'payment_rate_manager'(optional): (str) if not given the default payment rate manager
+                                         will be used. supported alternative rate managers:
+                                         only-free
+
+        Returns
+            (str) Success/Fail message or (dict) decoded data
+        """
+        res = self._request('descriptor_get', sd_hash=sd_hash, timeout=timeout,
+                            payment_rate_manager=payment_rate_manager)
+        return res
+
+    def file_delete(self, name=None, sd_hash=None, file_hash=None, stream_hash=None, claim_id=None, outpoint=None, rowid=None, delete_target_file=None):
+        """Delete a lbry file
+
+        Args:
+            'name' (optional): (str) delete file by lbry name,
+            'sd_hash' (optional): (str) delete file by sd hash,
+            'file_name' (optional): (str) delete file by the name in the downloads folder,
+            'stream_hash' (optional): (str) delete file by stream hash,
+            'claim_id' (optional): (str) delete file by claim ID,
+            'outpoint' (optional): (str) delete file by claim outpoint,
+            'rowid': (optional): (int) delete file by rowid in the file manager
+            'delete_target_file' (optional): (bool) delete file from downloads folder,
+                                            defaults to true if false only the blobs and
+                                            db entries will be deleted
+        Returns:
+            (bool) true if deletion was successful
+        """
+        res = self._request('file_delete', name, sd_hash, file_hash,
+                       stream_hash, claim_id, outpoint, rowid, delete_target_file)
+        return res
+
+    def file_list(self, fields=None, **kwargs):
+        """List files limited by optional filters
+
+        Args:
+            'name' (optional): (str) filter files by lbry name,
+            'sd_hash' (optional): (str) filter files by sd hash,
+            'file_name' (optional): (str) filter files by the name in the downloads folder,
+            'stream_hash' (optional): (str) filter files by stream hash,
+            'claim_id' (optional): (str) filter files by claim id,
+            'outpoint' (optional): (str) filter files by claim outpoint,
+            'rowid' (optional): (int) filter files by internal row id,
+            'full_status': (optional): (bool) if true populate the 'message' and 'size' fields
+            'fields' (optional): (list) dotted paths to keep of each file, see
+                                 projection.py
+
+        Returns:
+            (list) List of files
+
+            [
+                {
+                    'completed': (bool) true if download is completed,
+                    'file_name': (str) name of file,
+                    'download_directory': (str) download directory,
+                    'points_paid': (float) credit paid to download file,
+                    'stopped': (bool) true if download is stopped,
+                    'stream_hash': (str) stream hash of file,
+                    'stream_name': (str) stream name ,
+                    'suggested_file_name': (str) suggested file name,
+                    'sd_hash': (str) sd hash of file,
+                    'name': (str) name claim attached to file
+                    'outpoint': (str) claim outpoint attached to file
+                    'claim_id': (str) claim ID attached to file,
+                    'download_path': (str) download path of file,
+                    'mime_type': (str) mime type of file,
+                    'key': (str) key attached to file,
+                    'total_bytes': (int) file size in bytes, None if full_status is false
+                    'written_bytes': (int) written size in bytes
+                    'message': (str), None if full_status is false
+                    'metadata': (dict) Metadata dictionary
+                },
+            ]
+        """
+        if fields is not None:
+            return self._projected('file_list', fields, **kwargs)
+        res = self._request('file_list', **kwargs)
+        return self._typed('file_list', res)
+
+    def file_set_status(self, status, name=None, sd_hash=None, file_name=None):
+        """Start or stop downloading a file
+
+        Args:
+            'status': (str) "start" or "stop"
+            'name' (optional): (str) start file by lbry name,
+            'sd_hash' (optional): (str) start file by the hash in the name claim,
+            'file_name' (optional): (str) start file by its name in the downloads folder,
+        Returns:
+            (str) Confirmation message
+        """
+
+    def get(self, uri, file_name=None, timeout=None, download_directory=None):
+        """Download stream from a LBRY name.
+
+        Args:
+            'uri': (str) lbry uri to download
+            'file_name'(optional): (str) a user specified name for the downloaded file
+            'timeout'(optional): (int) download timeout in number of seconds
+            'download_directory'(optional): (str) path to directory where file will be saved
+        Returns:
+            (dict) Dictionary containing information about the stream
             {
                 'completed': (bool) true if download is completed,
                 'file_name': (str) name of file,
@@ -240,7 +686,7 @@ def file_list(**kwargs):
                 'points_paid': (float) credit paid to download file,
                 'stopped': (bool) true if download is stopped,
                 'stream_hash': (str) stream hash of file,
-                'stream_name': (str) stream name ,
+                'stream_name': (str) stream name,
                 'suggested_file_name': (str) suggested file name,
                 'sd_hash': (str) sd hash of file,
                 'name': (str) name claim attached to file
@@ -253,419 +699,572 @@ def file_list(**kwargs):
                 'written_bytes': (int) written size in bytes
                 'message': (str), None if full_status is false
                 'metadata': (dict) Metadata dictionary
-            },
-        ]
+            }
+        """
+        res = self._request('get', uri=uri, file_name=file_name, timeout=timeout)
+        return self._typed('get', res)
+
+    def get_availability(self, uri, sd_timeout=None, peer_timeout=None):
+        """Get stream availability for lbry uri
+
+        Args:
+            'uri' : (str) lbry uri
+            'sd_timeout' (optional): (int) sd blob download timeout
+            'peer_timeout' (optional): (int) how long to look for peers
+
+        Returns:
+            (float) Peers per blob / total blobs
+        """
+        return self._request('get_availability', uri=uri, sd_timeout=sd_timeout, peer_timeout=peer_timeout)
+
+    def peer_list(self, blob_hash, timeout=None):
+        """Get peers for blob hash
+
+        Args:
+            'blob_hash': (str) blob hash
+            'timeout'(optional): (int) peer search timeout in seconds
+        Returns:
+            (list) List of contacts
+        """
+        res = self._request('peer_list', blob_hash=blob_hash, timeout=timeout)
+        return res
+
+    def publish(self, name, bid, file_path=None, metadata=None, **kwargs):
+        """Make a new name claim and publish associated data to lbrynet.
+
+        Updates over existing claim if user already has a claim for name.
+
+        Fields required in the final Metadata are:
+            'title'
+            'description'
+            'author'
+            'language'
+            'license',
+            'nsfw'
+
+        Metadata can be set by either using the metadata argument or by setting individual arguments
+        fee, title, description, author, language, license, license_url, thumbnail, preview, nsfw,
+        or sources. Individual arguments will overwrite the fields specified in metadata argument.
+
+        Args:
+            'name': (str) name to be claimed
+            'bid': (float) amount of credits to commit in this claim,
+            'metadata'(optional): (dict) Metadata to associate with the claim.
+            'file_path'(optional): (str) path to file to be associated with name. If provided,
+                                    a lbry stream of this file will be used in 'sources'.
+                                    If no path is given but a metadata dict is provided, the source
+                                    from the given metadata will be used.
+            'fee'(optional): (dict) Dictionary representing key fee to download content:
+                              {currency_symbol: {'amount': float, 'address': str, optional}}
+                              supported currencies: LBC, USD, BTC
+                              If an address is not provided a new one will be automatically
+                              generated. Default fee is zero.
+            'title'(optional): (str) title of the file
+            'description'(optional): (str) description of the file
+            'author'(optional): (str) author of the file
+            'language'(optional): (str), language code
+            'license'(optional): (str) license for the file
+            'license_url'(optional): (str) URL to license
+            'thumbnail'(optional): (str) thumbnail URL for the file
+            'preview'(optional): (str) preview URL for the file
+            'nsfw'(optional): (bool) True if not safe for work
+            'sources'(optional): (dict){'lbry_sd_hash':sd_hash} specifies sd hash of file
+            'channel_name' (optional): (str) name of the publisher channel
+
+        Returns:
+            (dict) Dictionary containing result of the claim
+            {
+                'tx' : (str) hex encoded transaction
+                'txid' : (str) txid of resulting claim
+                'nout' : (int) nout of the resulting claim
+                'fee' : (float) fee paid for the claim transaction
+                'claim_id' : (str) claim ID of the resulting claim
+            }
+        """
+        if metadata is None:
+            metadata = {}
+        _check_publish_fields(metadata, kwargs)
+
+        res = self._request('publish', name=name, bid=bid, file_path=file_path, metadata=metadata, **kwargs)
+        return res
+
+    def reflect(self, sd_hash):
+        """Reflect a stream
+
+        Args:
+            'sd_hash': (str) sd_hash of lbry file
+        Returns:
+            (bool) true if successful
+        """
+        res = self._request('reflect', sd_hash=sd_hash)
+
+    def resolve(self, uri, fields=None):
+        """Resolve a LBRY URI
+
+        Args:
+            'uri': (str) uri to download
+            'fields' (optional): (list) dotted paths to keep of each claim, see
+                                 projection.py
+        Returns:
+            None if nothing can be resolved, otherwise:
+            If uri resolves to a channel or a claim in a channel:
+                'certificate': {
+                    'address': (str) claim address,
+                    'amount': (float) claim amount,
+                    'effective_amount': (float) claim amount including supports,
+                    'claim_id': (str) claim id,
+                    'claim_sequence': (int) claim sequence number,
+                    'decoded_claim': (bool) whether or not the claim value was decoded,
+                    'height': (int) claim height,
+                    'depth': (int) claim depth,
+                    'has_signature': (bool) included if decoded_claim
+                    'name': (str) claim name,
+                    'supports: (list) list of supports [{'txid': txid,
+                                                         'nout': nout,
+                                                         'amount': amount}],
+                    'txid': (str) claim txid,
+                    'nout': (str) claim nout,
+                    'signature_is_valid': (bool), included if has_signature,
+                    'value': ClaimDict if decoded, otherwise hex string
+                }
+            If uri resolves to a channel:
+                'claims_in_channel': [
+                    {
+                        'address': (str) claim address,
+                        'amount': (float) claim amount,
+                        'effective_amount': (float) claim amount including supports,
+                        'claim_id': (str) claim id,
+                        'claim_sequence': (int) claim sequence number,
+                        'decoded_claim': (bool) whether or not the claim value was decoded,
+                        'height': (int) claim height,
+                        'depth': (int) claim depth,
+                        'has_signature': (bool) included if decoded_claim
+                        'name': (str) claim name,
+                        'supports: (list) list of supports [{'txid': txid,
+                                                             'nout': nout,
+                                                             'amount': amount}],
+                        'txid': (str) claim txid,
+                        'nout': (str) claim nout,
+                        'signature_is_valid': (bool), included if has_signature,
+                        'value': ClaimDict if decoded, otherwise hex string
+                    }
+                ]
+            If uri resolves to a claim:
+                'claim': {
+                    'address': (str) claim address,
+                    'amount': (float) claim amount,
+                    'effective_amount': (float) claim amount including supports,
+                    'claim_id': (str) claim id,
+                    'claim_sequence': (int) claim sequence number,
+                    'decoded_claim': (bool) whether or not the claim value was decoded,
+                    'height': (int) claim height,
+                    'depth': (int) claim depth,
+                    'has_signature': (bool) included if decoded_claim
+                    'name': (str) claim name,
+                    'channel_name': (str) channel name if claim is in a channel
+                    'supports: (list) list of supports [{'txid': txid,
+                                                         'nout': nout,
+                                                         'amount': amount}]
+                    'txid': (str) claim txid,
+                    'nout': (str) claim nout,
+                    'signature_is_valid': (bool), included if has_signature,
+                    'value': ClaimDict if decoded, otherwise hex string
+                }
+            }
+        """
+        res = self._cached_request('resolve', 'uri', uri=uri)
+        if fields is not None:
+            return projection.shape('resolve', res, fields)
+        return self._typed('resolve', res)
+
+    def resolve_name(self, name):
+        """Resolve stream info from a LBRY name
+
+        Args:
+            'name': (str) name to look up, do not include lbry:// prefix
+        Returns:
+            (dict) Metadata dictionary from name claim, None if the name is not
+                    resolvable
+        """
+        res = self._cached_request('resolve_name', 'name', name=name)
+        return res
+
+    def send_amount_to_address(self, amount, address):
+        """Send credits to an address
+
+        Args:
+            'amount': (float) the amount to send
+            'address': (str) the address of the recipient in base58
+        Returns:
+            (bool) true if payment successfully scheduled
+        """
+        res = self._request('send_amount_to_address', amount=amount, address=address)
+        return res
+
+    def settings_get(self):
+        """Get daemon settings
+
+        Returns:
+            (dict) Dictionary of daemon settings
+            See ADJUSTABLE_SETTINGS in lbrynet/conf.py for full list of settings
+        """
+        res = self._request('settings_get')
+        return res
+
+    def settings_set(self, **kwargs):
+        """Set daemon settings
+
+        Args:
+            'run_on_startup': (bool) currently not supported
+            'data_rate': (float) data rate,
+            'max_key_fee': (float) maximum key fee,
+            'disable_max_key_fee': (bool) true to disable max_key_fee check,
+            'download_directory': (str) path of where files are downloaded,
+            'peer_port': (int) port through which daemon should connect,
+            'max_upload': (float), currently not supported
+            'max_download': (float), currently not supported
+            'download_timeout': (int) download timeout in seconds
+            'search_timeout': (float) search timeout in seconds
+            'cache_time': (int) cache timeout in seconds
+        Returns:
+            (dict) Updated dictionary of daemon settings
+        """
+        res = self._request('settings_set', **kwargs)
+        return res
+
+    def status(self, session_status=False):
+        """Return daemon status
+
+        Args:
+            'session_status' (optional): (bool) true to return session status,
+                default is false
+        Returns:
+            (dict) Daemon status dictionary
+        """
+        res = self._request('status', session_status=session_status)
+        return res
+
+    def stream_cost_estimate(self, name, size=None):
+        """Get estimated cost for a lbry stream
+
+        Args:
+            'name': (str) lbry name
+            'size' (optional): (int) stream size, in bytes. if provided an sd blob
+                                won't be downloaded.
+        Returns:
+            (float) Estimated cost in lbry credits, returns None if uri is not
+                resolveable
+        """
+        res = self._request('stream_cost_estimate', uri=name, size=size)
+        return res
+
+    def transaction_list(self, fields=None):
+        """List transactions belonging to wallet
+
+        Args:
+            'fields' (optional): (list) dotted paths to keep of each
+                                 transaction, see projection.py
+        Returns:
+            (list) List of transactions
+        """
+        if fields is not None:
+            return self._projected('transaction_list', fields)
+        res = self._request('transaction_list')
+        return self._typed('transaction_list', res)
+
+    def transaction_show(self, txid):
+        """Get a decoded transaction from a txid
+
+        Args:
+            'txid': (str) txid of transaction
+        Returns:
+            (dict) JSON formatted transaction
+        """
+        res = self._request('transaction_show', txid=txid)
+        return self._typed('transaction_show', res)
+
+    def wallet_balance(self, address=None, include_uncomfirmed=None):
+        """Return the balance of the wallet
+
+        Args:
+            'address' (optional): If address is provided only that balance will be given
+            'include_unconfirmed' (optional): If set unconfirmed balance will be included in
+             the only takes effect when address is also provided.
+
+        Returns:
+            (float) amount of lbry credits in wallet
+        """
+        res = self._request('wallet_balance', address=address,
+                       include_uncomfirmed=include_uncomfirmed)
+        return res
+
+    def wallet_is_address_mine(self, address):
+        """Checks if an address is associated with the current wallet.
+
+        Args:
+            'address': (str) address to check in base58
+        Returns:
+            (bool) true, if address is associated with current wallet
+        """
+        res = self._request('wallet_is_address_mine', address=address)
+        return res
+
+    def wallet_list(self):
+        """List wallet addresses
+
+        Returns:
+            List of wallet addresses
+        """
+        res = self._request('wallet_list')
+        return res
+
+    def wallet_new_address(self):
+        """Generate a new wallet address
+
+        Returns:
+            (str) New wallet address in base58
+        """
+        res = self._request('wallet_new_address')
+        return res
+
+    def wallet_public_key(self, address):
+        """Get public key from wallet address
+
+        Args:
+            'address': (str) wallet address in base58
+        Returns:
+            (list) list of public keys associated with address.
+                Could contain more than one public key if multisig.
+        """
+        res = self._request('wallet_public_key', address=address)
+        return res
+
+    # TODO
+    # def wallet_prefill_addresses
+
+    def wallet_unused_address(self):
+        """Return an address containing no balance, will create a new address if there is none.
+
+        Returns:
+            (str) Unused wallet address in base58
+        """
+        res = self._request('wallet_unused_address')
+        return res
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_client():
+    """Return the LbryClient used by the module level functions
+
+    It is created on first use with BASE_URL and POOL_SIZE.
     """
-    res = _request('file_list', **kwargs)
-    return res
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = LbryClient()
+    return _default
 
 
-def file_set_status(status, name=None, sd_hash=None, file_name=None):
-    """Start or stop downloading a file
+def set_default_client(lbry):
+    """Use lbry for the module level functions, closing the previous client
 
     Args:
-        'status': (str) "start" or "stop"
-        'name' (optional): (str) start file by lbry name,
-        'sd_hash' (optional): (str) start file by the hash in the name claim,
-        'file_name' (optional): (str) start file by its name in the downloads folder,
-    Returns:
-        (str) Confirmation message
+        'lbry': (LbryClient) client to use, None to reset to default
     """
+    global _default
+    with _default_lock:
+        old, _default = _default, lbry
+    if old is not None and old is not lbry:
+        old.close()
 
 
-def get(uri, file_name=None, timeout=None, download_directory=None):
-    """Download stream from a LBRY name.
+def get_transport():
+    """Return the transport used by the module level functions"""
+    return default_client().transport
 
-    Args:
-        'uri': (str) lbry uri to download
-        'file_name'(optional): (str) a user specified name for the downloaded file
-        'timeout'(optional): (int) download timeout in number of seconds
-        'download_directory'(optional): (str) path to directory where file will be saved
-    Returns:
-        (dict) Dictionary containing information about the stream
-        {
-            'completed': (bool) true if download is completed,
-            'file_name': (str) name of file,
-            'download_directory': (str) download directory,
-            'points_paid': (float) credit paid to download file,
-            'stopped': (bool) true if download is stopped,
-            'stream_hash': (str) stream hash of file,
-            'stream_name': (str) stream name,
-            'suggested_file_name': (str) suggested file name,
-            'sd_hash': (str) sd hash of file,
-            'name': (str) name claim attached to file
-            'outpoint': (str) claim outpoint attached to file
-            'claim_id': (str) claim ID attached to file,
-            'download_path': (str) download path of file,
-            'mime_type': (str) mime type of file,
-            'key': (str) key attached to file,
-            'total_bytes': (int) file size in bytes, None if full_status is false
-            'written_bytes': (int) written size in bytes
-            'message': (str), None if full_status is false
-            'metadata': (dict) Metadata dictionary
-        }
-    """
-    res = _request('get', uri=uri, file_name=file_name, timeout=timeout)
-    return res
 
+def set_transport(transport):
+    """Use transport for the module level functions, see LbryClient.set_transport"""
+    default_client().set_transport(transport)
 
-def get_availability(uri, sd_timeout=None, peer_timeout=None):
-    """Get stream availability for lbry uri
 
-    Args:
-        'uri' : (str) lbry uri
-        'sd_timeout' (optional): (int) sd blob download timeout
-        'peer_timeout' (optional): (int) how long to look for peers
+def close():
+    """Close the pooled connections of the module level functions"""
+    default_client().close()
 
-    Returns:
-        (float) Peers per blob / total blobs
-    """
-    return _request('get_availability', uri=uri, sd_timeout=sd_timeout, peer_timeout=peer_timeout)
 
+def enable_resolve_cache(**kwargs):
+    """Cache resolve results of the module level functions, see LbryClient.enable_resolve_cache"""
+    return default_client().enable_resolve_cache(**kwargs)
 
-def peer_list(blob_hash, timeout=None):
-    """Get peers for blob hash
 
-    Args:
-        'blob_hash': (str) blob hash
-        'timeout'(optional): (int) peer search timeout in seconds
-    Returns:
-        (list) List of contacts
-    """
-    res = _request('peer_list', blob_hash=blob_hash, timeout=timeout)
-    return res
+def disable_resolve_cache():
+    """Stop caching resolve results of the module level functions"""
+    default_client().disable_resolve_cache()
 
 
-def publish(name, bid, file_path=None, metadata=None, **kwargs):
-    """Make a new name claim and publish associated data to lbrynet.
+def _typed(method, res):
+    return default_client()._typed(method, res)
 
-    Updates over existing claim if user already has a claim for name.
 
-    Fields required in the final Metadata are:
-        'title'
-        'description'
-        'author'
-        'language'
-        'license',
-        'nsfw'
+def _request(method, **kwargs):
+    return default_client()._request(method, **kwargs)
 
-    Metadata can be set by either using the metadata argument or by setting individual arguments
-    fee, title, description, author, language, license, license_url, thumbnail, preview, nsfw,
-    or sources. Individual arguments will overwrite the fields specified in metadata argument.
 
-    Args:
-        'name': (str) name to be claimed
-        'bid': (float) amount of credits to commit in this claim,
-        'metadata'(optional): (dict) Metadata to associate with the claim.
-        'file_path'(optional): (str) path to file to be associated with name. If provided,
-                                a lbry stream of this file will be used in 'sources'.
-                                If no path is given but a metadata dict is provided, the source
-                                from the given metadata will be used.
-        'fee'(optional): (dict) Dictionary representing key fee to download content:
-                          {currency_symbol: {'amount': float, 'address': str, optional}}
-                          supported currencies: LBC, USD, BTC
-                          If an address is not provided a new one will be automatically
-                          generated. Default fee is zero.
-        'title'(optional): (str) title of the file
-        'description'(optional): (str) description of the file
-        'author'(optional): (str) author of the file
-        'language'(optional): (str), language code
-        'license'(optional): (str) license for the file
-        'license_url'(optional): (str) URL to license
-        'thumbnail'(optional): (str) thumbnail URL for the file
-        'preview'(optional): (str) preview URL for the file
-        'nsfw'(optional): (bool) True if not safe for work
-        'sources'(optional): (dict){'lbry_sd_hash':sd_hash} specifies sd hash of file
-        'channel_name' (optional): (str) name of the publisher channel
+def channel_list_mine():
+    """Get my channels"""
+    return default_client().channel_list_mine()
 
-    Returns:
-        (dict) Dictionary containing result of the claim
-        {
-            'tx' : (str) hex encoded transaction
-            'txid' : (str) txid of resulting claim
-            'nout' : (int) nout of the resulting claim
-            'fee' : (float) fee paid for the claim transaction
-            'claim_id' : (str) claim ID of the resulting claim
-        }
-    """
-    if metadata is None:
-        metadata = {}
-    fields = ['title', 'description', 'author', 'language', 'license', 'nsfw']
-    for f in fields:
-        if kwargs.get(f) is None and metadata.get(f) is None:
-            msg = '{} is a required field for publishing. Please include it as a keyword arg or within metadata'.format(f)
-            raise Exception(msg)
 
-    res = _request('publish', name=name, bid=bid, file_path=file_path, metadata=metadata, **kwargs)
-    return res
+def channel_new(name, amount):
+    """Generate a publisher key and create a new certificate claim"""
+    return default_client().channel_new(name, amount)
 
 
-def reflect(sd_hash):
-    """Reflect a stream
+def claim_abandon(claim_id):
+    """Abandon a name and reclaim credits from the claim"""
+    return default_client().claim_abandon(claim_id)
 
-    Args:
-        'sd_hash': (str) sd_hash of lbry file
-    Returns:
-        (bool) true if successful
-    """
-    res = _request('reflect', sd_hash=sd_hash)
 
+def claim_list(name, fields=None):
+    """Get Claims for a name"""
+    return default_client().claim_list(name, fields=fields)
 
-def resolve(uri):
-    """Resolve a LBRY URI
 
-    Args:
-        'uri': (str) uri to download
-    Returns:
-        None if nothing can be resolved, otherwise:
-        If uri resolves to a channel or a claim in a channel:
-            'certificate': {
-                'address': (str) claim address,
-                'amount': (float) claim amount,
-                'effective_amount': (float) claim amount including supports,
-                'claim_id': (str) claim id,
-                'claim_sequence': (int) claim sequence number,
-                'decoded_claim': (bool) whether or not the claim value was decoded,
-                'height': (int) claim height,
-                'depth': (int) claim depth,
-                'has_signature': (bool) included if decoded_claim
-                'name': (str) claim name,
-                'supports: (list) list of supports [{'txid': txid,
-                                                     'nout': nout,
-                                                     'amount': amount}],
-                'txid': (str) claim txid,
-                'nout': (str) claim nout,
-                'signature_is_valid': (bool), included if has_signature,
-                'value': ClaimDict if decoded, otherwise hex string
-            }
-        If uri resolves to a channel:
-            'claims_in_channel': [
-                {
-                    'address': (str) claim address,
-                    'amount': (float) claim amount,
-                    'effective_amount': (float) claim amount including supports,
-                    'claim_id': (str) claim id,
-                    'claim_sequence': (int) claim sequence number,
-                    'decoded_claim': (bool) whether or not the claim value was decoded,
-                    'height': (int) claim height,
-                    'depth': (int) claim depth,
-                    'has_signature': (bool) included if decoded_claim
-                    'name': (str) claim name,
-                    'supports: (list) list of supports [{'txid': txid,
-                                                         'nout': nout,
-                                                         'amount': amount}],
-                    'txid': (str) claim txid,
-                    'nout': (str) claim nout,
-                    'signature_is_valid': (bool), included if has_signature,
-                    'value': ClaimDict if decoded, otherwise hex string
-                }
-            ]
-        If uri resolves to a claim:
-            'claim': {
-                'address': (str) claim address,
-                'amount': (float) claim amount,
-                'effective_amount': (float) claim amount including supports,
-                'claim_id': (str) claim id,
-                'claim_sequence': (int) claim sequence number,
-                'decoded_claim': (bool) whether or not the claim value was decoded,
-                'height': (int) claim height,
-                'depth': (int) claim depth,
-                'has_signature': (bool) included if decoded_claim
-                'name': (str) claim name,
-                'channel_name': (str) channel name if claim is in a channel
-                'supports: (list) list of supports [{'txid': txid,
-                                                     'nout': nout,
-                                                     'amount': amount}]
-                'txid': (str) claim txid,
-                'nout': (str) claim nout,
-                'signature_is_valid': (bool), included if has_signature,
-                'value': ClaimDict if decoded, otherwise hex string
-            }
-        }
-    """
-    res = _request('resolve', uri=uri)
-    return res
+def claim_list_mine(fields=None):
+    """List my name claims"""
+    return default_client().claim_list_mine(fields=fields)
 
 
-def resolve_name(name):
-    """Resolve stream info from a LBRY name
+def claim_new_support(name, claim_id, amount):
+    """Support a claim name"""
+    return default_client().claim_new_support(name, claim_id, amount)
 
-    Args:
-        'name': (str) name to look up, do not include lbry:// prefix
-    Returns:
-        (dict) Metadata dictionary from name claim, None if the name is not
-                resolvable
-    """
-    res = _request('resolve_name', name=name)
-    return res
 
+def claim_show(name, txid=None, nout=None, claim_id=None):
+    """Resolve claim info from a LBRY name"""
+    return default_client().claim_show(name, txid=txid, nout=nout, claim_id=claim_id)
 
-def send_amount_to_address(amount, address):
-    """Send credits to an address
 
-    Args:
-        'amount': (float) the amount to send
-        'address': (str) the address of the recipient in base58
-    Returns:
-        (bool) true if payment successfully scheduled
-    """
-    res = _request('send_amount_to_address', amount=amount, address=address)
-    return res
+def descriptor_get(sd_hash, timeout=None, payment_rate_manager=None):
+    """Download and return a sd blob"""
+    return default_client().descriptor_get(sd_hash, timeout=timeout, payment_rate_manager=payment_rate_manager)
 
 
-def settings_get():
-    """Get daemon settings
+def file_delete(name=None, sd_hash=None, file_hash=None, stream_hash=None, claim_id=None, outpoint=None, rowid=None, delete_target_file=None):
+    """Delete a lbry file"""
+    return default_client().file_delete(name=name, sd_hash=sd_hash, file_hash=file_hash, stream_hash=stream_hash, claim_id=claim_id, outpoint=outpoint, rowid=rowid, delete_target_file=delete_target_file)
 
-    Returns:
-        (dict) Dictionary of daemon settings
-        See ADJUSTABLE_SETTINGS in lbrynet/conf.py for full list of settings
-    """
-    res = _request('settings_get')
-    return res
 
+def file_list(fields=None, **kwargs):
+    """List files limited by optional filters"""
+    return default_client().file_list(fields=fields, **kwargs)
 
-def settings_set(**kwargs):
-    """Set daemon settings
 
-    Args:
-        'run_on_startup': (bool) currently not supported
-        'data_rate': (float) data rate,
-        'max_key_fee': (float) maximum key fee,
-        'disable_max_key_fee': (bool) true to disable max_key_fee check,
-        'download_directory': (str) path of where files are downloaded,
-        'peer_port': (int) port through which daemon should connect,
-        'max_upload': (float), currently not supported
-        'max_download': (float), currently not supported
-        'download_timeout': (int) download timeout in seconds
-        'search_timeout': (float) search timeout in seconds
-        'cache_time': (int) cache timeout in seconds
-    Returns:
-        (dict) Updated dictionary of daemon settings
-    """
-    res = _request('settings_set', **kwargs)
-    return res
+def file_set_status(status, name=None, sd_hash=None, file_name=None):
+    """Start or stop downloading a file"""
+    return default_client().file_set_status(status, name=name, sd_hash=sd_hash, file_name=file_name)
 
 
-def status(session_status=False):
-    """Return daemon status
+def get(uri, file_name=None, timeout=None, download_directory=None):
+    """Download stream from a LBRY name."""
+    return default_client().get(uri, file_name=file_name, timeout=timeout, download_directory=download_directory)
 
-    Args:
-        'session_status' (optional): (bool) true to return session status,
-            default is false
-    Returns:
-        (dict) Daemon status dictionary
-    """
-    res = _request('status', session_status=session_status)
-    return res
 
+def get_availability(uri, sd_timeout=None, peer_timeout=None):
+    """Get stream availability for lbry uri"""
+    return default_client().get_availability(uri, sd_timeout=sd_timeout, peer_timeout=peer_timeout)
 
-def stream_cost_estimate(name, size=None):
-    """Get estimated cost for a lbry stream
 
-    Args:
-        'name': (str) lbry name
-        'size' (optional): (int) stream size, in bytes. if provided an sd blob
-                            won't be downloaded.
-    Returns:
-        (float) Estimated cost in lbry credits, returns None if uri is not
-            resolveable
-    """
-    res = _request('stream_cost_estimate', uri=name, size=size)
-    return res
+def peer_list(blob_hash, timeout=None):
+    """Get peers for blob hash"""
+    return default_client().peer_list(blob_hash, timeout=timeout)
 
 
-def transaction_list():
-    """List transactions belonging to wallet
+def publish(name, bid, file_path=None, metadata=None, **kwargs):
+    """Make a new name claim and publish associated data to lbrynet."""
+    return default_client().publish(name, bid, file_path=file_path, metadata=metadata, **kwargs)
 
-    Args:
-        None
-    Returns:
-        (list) List of transactions
-    """
-    res = _request('transaction_list')
-    return res
 
+def reflect(sd_hash):
+    """Reflect a stream"""
+    return default_client().reflect(sd_hash)
 
-def transaction_show(txid):
-    """Get a decoded transaction from a txid
 
-    Args:
-        'txid': (str) txid of transaction
-    Returns:
-        (dict) JSON formatted transaction
-    """
-    res = _request('transaction_show', txid=txid)
-    return res
+def resolve(uri, fields=None):
+    """Resolve a LBRY URI"""
+    return default_client().resolve(uri, fields=fields)
 
 
-def wallet_balance(address=None, include_uncomfirmed=None):
-    """Return the balance of the wallet
+def resolve_name(name):
+    """Resolve stream info from a LBRY name"""
+    return default_client().resolve_name(name)
 
-    Args:
-        'address' (optional): If address is provided only that balance will be given
-        'include_unconfirmed' (optional): If set unconfirmed balance will be included in
-         the only takes effect when address is also provided.
 
-    Returns:
-        (float) amount of lbry credits in wallet
-    """
-    res = _request('wallet_balance', address=address,
-                   include_uncomfirmed=include_uncomfirmed)
-    return res
+def send_amount_to_address(amount, address):
+    """Send credits to an address"""
+    return default_client().send_amount_to_address(amount, address)
 
 
-def wallet_is_address_mine(address):
-    """Checks if an address is associated with the current wallet.
+def settings_get():
+    """Get daemon settings"""
+    return default_client().settings_get()
 
-    Args:
-        'address': (str) address to check in base58
-    Returns:
-        (bool) true, if address is associated with current wallet
-    """
-    res = _request('wallet_is_address_mine', address=address)
-    return res
 
+def settings_set(**kwargs):
+    """Set daemon settings"""
+    return default_client().settings_set(**kwargs)
 
-def wallet_list():
-    """List wallet addresses
 
-    Returns:
-        List of wallet addresses
-    """
-    res = _request('wallet_list')
-    return res
+def status(session_status=False):
+    """Return daemon status"""
+    return default_client().status(session_status=session_status)
 
 
-def wallet_new_address():
-    """Generate a new wallet address
+def stream_cost_estimate(name, size=None):
+    """Get estimated cost for a lbry stream"""
+    return default_client().stream_cost_estimate(name, size=size)
 
-    Returns:
-        (str) New wallet address in base58
-    """
-    res = _request('wallet_new_address')
-    return res
 
+def transaction_list(fields=None):
+    """List transactions belonging to wallet"""
+    return default_client().transaction_list(fields=fields)
 
-def wallet_public_key(address):
-    """Get public key from wallet address
 
-    Args:
-        'address': (str) wallet address in base58
-    Returns:
-        (list) list of public keys associated with address.
-            Could contain more than one public key if multisig.
-    """
-    res = _request('wallet_public_key', address=address)
-    return res
+def transaction_show(txid):
+    """Get a decoded transaction from a txid"""
+    return default_client().transaction_show(txid)
 
-# TODO
-# def wallet_prefill_addresses
 
-def wallet_unused_address():
-    """Return an address containing no balance, will create a new address if there is none.
+def wallet_balance(address=None, include_uncomfirmed=None):
+    """Return the balance of the wallet"""
+    return default_client().wallet_balance(address=address, include_uncomfirmed=include_uncomfirmed)
 
-    Returns:
-        (str) Unused wallet address in base58
-    """
-    res = _request('wallet_unused_address')
-    return res
+
+def wallet_is_address_mine(address):
+    """Checks if an address is associated with the current wallet."""
+    return default_client().wallet_is_address_mine(address)
+
+
+def wallet_list():
+    """List wallet addresses"""
+    return default_client().wallet_list()
+
+
+def wallet_new_address():
+    """Generate a new wallet address"""
+    return default_client().wallet_new_address()
+
+
+def wallet_public_key(address):
+    """Get public key from wallet address"""
+    return default_client().wallet_public_key(address)
+
+
+def wallet_unused_address():
+    """Return an address containing no balance, will create a new address if there is none."""
+    return default_client().wallet_unused_address()
@@ -0,0 +1,217 @@
+"""Walk channels breadth-first through resolve
+
+    crawler = ChannelCrawler(['@lbry'], checkpoint='crawl.json', workers=16)
+    for claim in crawler.crawl():
+        index(claim)
+
+Resolving a channel uri gives its claims_in_channel; the channels referenced
+by those claims (their channel_name, or the certificate of a resolve) are
+queued and crawled in turn. Claim ids already yielded are remembered in a
+Bloom filter, so memory stays fixed however many claims are crawled, at the
+cost of rarely skipping a claim that was never seen (see 'error_rate').
+
+With a checkpoint path, the frontier and the filter are written to disk every
+'checkpoint_every' channels and when the crawl ends, and a new crawler with the
+same path resumes where the last one stopped.
+"""
+import base64
+import hashlib
+import json
+import math
+import os
+import zlib
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cache
+import client
+import models
+import storage
+
+
+class BloomFilter(object):
+    """Fixed size set membership with false positives but no false negatives
+
+    Args:
+        'capacity': (int) number of keys the filter is sized for
+        'error_rate' (optional): (float) false positive rate at capacity
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / float(capacity) * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, key):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key):
+        """Add key, returning False if it (probably) was already there"""
+        new = False
+        for p in self._positions(key):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'error_rate': self.error_rate, 'count': self.count,
+                'bits': base64.b64encode(zlib.compress(bytes(self.bits))).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, d):
+        bloom = cls(d['capacity'], d['error_rate'])
+        bloom.bits = bytearray(zlib.decompress(base64.b64decode(d['bits'])))
+        bloom.count = d['count']
+        return bloom
+
+
+def channel_uri(claim):
+    """Return the uri of the channel a claim is, or None if it is not one"""
+    name = models.field(claim, 'name')
+    if not name or not name.startswith('@'):
+        return None
+    claim_id = models.field(claim, 'claim_id')
+    return '{}#{}'.format(name, claim_id) if claim_id else name
+
+
+def referenced_channels(resolved):
+    """Return the channel uris a resolve result refers to"""
+    if not isinstance(resolved, dict):
+        return []
+    uris = []
+    certificate = resolved.get('certificate')
+    if certificate is not None:
+        uris.append(channel_uri(certificate))
+    for claim in [resolved.get('claim')] + list(resolved.get('claims_in_channel') or []):
+        if claim is None:
+            continue
+        uris.append(channel_uri(claim))
+        name = models.field(claim, 'channel_name')
+        if name:
+            uris.append(name if name.startswith('@') else '@' + name)
+    return [uri for uri in uris if uri]
+
+
+class ChannelCrawler(object):
+    """Breadth-first crawl of channels with bounded concurrency
+
+    Args:
+        'seeds': (list) channel uris to start from, ignored when resuming
+        'checkpoint' (optional): (str) file the crawl state is saved to and
+                                 resumed from
+        'workers' (optional): (int) max channels resolved at once
+        'capacity' (optional): (int) number of claims and channels the
+                               visited filter is sized for
+        'error_rate' (optional): (float) chance of wrongly skipping an unseen
+                                 claim or channel once at capacity
+        'max_channels' (optional): (int) stop after resolving this many
+                                   channels, counting earlier runs
+        'checkpoint_every' (optional): (int) channels between checkpoints
+        'lbry' (optional): (LbryClient) client to use, defaults to
+                           client.default_client()
+    """
+
+    def __init__(self, seeds, checkpoint=None, workers=8, capacity=1000000, error_rate=0.001,
+                 max_channels=None, checkpoint_every=100, lbry=None):
+        self.checkpoint = checkpoint
+        self.workers = workers
+        self.max_channels = max_channels
+        self.checkpoint_every = checkpoint_every
+        self.lbry = lbry or client.default_client()
+        self.errors = {}
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                state = json.load(f)
+            self.visited = BloomFilter.from_dict(state['visited'])
+            self.frontier = deque(state['frontier'])
+            self.channels = state['channels']
+            self.claims = state['claims']
+        else:
+            self.visited = BloomFilter(capacity, error_rate)
+            self.frontier = deque()
+            self.channels = 0
+            self.claims = 0
+            for uri in seeds:
+                self._enqueue(uri)
+
+    def _enqueue(self, uri):
+        if self.visited.add('channel:' + cache.normalize_name(uri)):
+            self.frontier.append(uri)
+
+    def save(self, in_flight=()):
+        """Atomically write the crawl state to the checkpoint file
+
+        Channels still being resolved are saved at the head of the frontier
+        so a resumed crawl resolves them again.
+        """
+        if not self.checkpoint:
+            return
+        state = {'frontier': list(in_flight) + list(self.frontier), 'channels': self.channels,
+                 'claims': self.claims, 'visited': self.visited.to_dict()}
+        storage.atomic_write(self.checkpoint, json.dumps(state), prefix='.crawl-')
+
+    def crawl(self):
+        """Resolve queued channels, yielding each claim found once
+
+        A channel that fails to resolve is recorded in 'errors' and skipped.
+
+        Returns:
+            (generator) claims, as returned by resolve, in no particular order
+        """
+        pending = {}
+        current = None
+        since_checkpoint = 0
+        with ThreadPoolExecutor(self.workers) as pool:
+            try:
+                while True:
+                    while self.frontier and len(pending) < self.workers and \
+                            (self.max_channels is None or
+                             self.channels + len(pending) < self.max_channels):
+                        uri = self.frontier.popleft()
+                        pending[pool.submit(self.lbry.resolve, uri)] = uri
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        uri = pending.pop(future)
+                        self.channels += 1
+                        since_checkpoint += 1
+                        try:
+                            resolved = future.result()
+                        except Exception as e:
+                            self.errors[uri] = e
+                            continue
+                        certificate = (resolved or {}).get('certificate')
+                        if certificate is not None and channel_uri(certificate):
+                            # the same channel reached later by claim id
+                            self.visited.add('channel:' + cache.normalize_name(channel_uri(certificate)))
+                        for channel in referenced_channels(resolved):
+                            self._enqueue(channel)
+                        # a crawl stopped while yielding this channel's claims
+                        # resumes with the channel
+                        current = uri
+                        for claim in (resolved or {}).get('claims_in_channel') or []:
+                            if self.visited.add('claim:' + models.field(claim, 'claim_id')):
+                                self.claims += 1
+                                yield claim
+                        current = None
+                    if since_checkpoint >= self.checkpoint_every:
+                        self.save(pending.values())
+                        since_checkpoint = 0
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.save(([current] if current else []) + list(pending.values()))
@@ -0,0 +1,248 @@
+"""Track progress of many downloads started with get()
+
+Instead of polling the full file_list, the tracker asks only for the streams
+that are due, filtering file_list by sd_hash and sending all of one tick's
+queries in a single batch request. Each stream has its own poll interval: it
+backs off while the download makes no progress and shortens as the download
+gets close to completion. A tick whose request fails, or a stream whose
+query the daemon answers with an error, counts as a missed poll: the stream
+keeps being tracked and its interval backs off.
+
+    tracker = DownloadTracker(on_complete=lambda d: print(d.sd_hash))
+    for uri in uris:
+        tracker.start(uri)
+    for event in tracker.events():
+        print(event.kind, event.download.written_bytes)
+"""
+import asyncio
+import time
+from collections import namedtuple
+
+import batch
+import client
+import models
+
+Event = namedtuple('Event', ['kind', 'download'])
+
+PROGRESS = 'progress'
+COMPLETE = 'complete'
+ERROR = 'error'
+
+
+class Download(object):
+    """State of one tracked stream"""
+
+    def __init__(self, sd_hash, uri=None, interval=1.0, now=0.0):
+        self.sd_hash = sd_hash
+        self.uri = uri
+        self.written_bytes = 0
+        self.total_bytes = None
+        self.completed = False
+        self.error = None
+        self.entry = None
+        self.interval = interval
+        self.next_poll = now
+        self.last_poll = now
+        self.last_progress = now
+
+    def __repr__(self):
+        return 'Download({!r}, {}/{})'.format(self.sd_hash, self.written_bytes, self.total_bytes)
+
+
+class DownloadTracker(object):
+    """Polls the daemon for the progress of the streams being tracked
+
+    Args:
+        'on_progress' (optional): (callable) called with a Download when its
+                                  written_bytes changed
+        'on_complete' (optional): (callable) called with a finished Download
+        'on_error' (optional): (callable) called with a failed Download, its
+                               'error' says why
+        'min_interval' (optional): (float) shortest seconds between two polls
+                                   of a stream
+        'max_interval' (optional): (float) longest seconds between two polls
+                                   of a stream
+        'stall_timeout' (optional): (float) fail a download that made no
+                                    progress for this many seconds
+        'batch_size' (optional): (int) max streams queried per request
+        'lbry' (optional): (LbryClient) client to start and poll downloads
+                           with, defaults to client.default_client().
+                           apoll reaches its daemon through async_client
+    """
+
+    def __init__(self, on_progress=None, on_complete=None, on_error=None, min_interval=0.5,
+                 max_interval=30.0, stall_timeout=None, batch_size=100, clock=time.monotonic,
+                 lbry=None):
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stall_timeout = stall_timeout
+        self.batch_size = batch_size
+        self.clock = clock
+        self.lbry = lbry or client.default_client()
+        self.active = {}
+
+    def start(self, uri, **kwargs):
+        """Start downloading uri with get and track it
+
+        Args:
+            'uri': (str) lbry uri to download
+            Other keyword args are passed to get
+        Returns:
+            (Download) the tracked download
+        """
+        entry = models.as_dict(self.lbry.get(uri, **kwargs))
+        download = self.track(entry['sd_hash'], uri)
+        self._apply(download, entry, self.clock())
+        return download
+
+    def track(self, sd_hash, uri=None):
+        """Track a download that was already started"""
+        download = self.active.get(sd_hash)
+        if download is None:
+            download = Download(sd_hash, uri, self.min_interval, self.clock())
+            self.active[sd_hash] = download
+        return download
+
+    def untrack(self, sd_hash):
+        self.active.pop(sd_hash, None)
+
+    def due(self, now=None):
+        """Return the downloads whose next poll is due"""
+        now = self.clock() if now is None else now
+        due = [d for d in self.active.values() if d.next_poll <= now]
+        due.sort(key=lambda d: d.next_poll)
+        return due[:self.batch_size]
+
+    def next_due(self):
+        """Seconds until the next poll is due, None if nothing is tracked"""
+        if not self.active:
+            return None
+        return max(0.0, min(d.next_poll for d in self.active.values()) - self.clock())
+
+    def poll(self):
+        """Query the daemon once for every due download
+
+        Returns:
+            (list) Events for the downloads that changed
+        """
+        due = self.due()
+        if not due:
+            return []
+        try:
+            with batch.Batch(self.lbry.transport) as b:
+                futures = [b.file_list(sd_hash=d.sd_hash, full_status=True) for d in due]
+        except Exception as e:
+            # the daemon did not answer this tick, try again later
+            now = self.clock()
+            events = []
+            for download in due:
+                events.extend(self._missed(download, e, now))
+            return events
+        now = self.clock()
+        events = []
+        for download, future in zip(due, futures):
+            try:
+                entries = future.result()
+            except Exception as e:
+                events.extend(self._missed(download, e, now))
+                continue
+            events.extend(self._update(download, entries, now))
+        return events
+
+    async def apoll(self):
+        """Same as poll, using async_client to reach the daemon of 'lbry'"""
+        import async_client
+
+        due = self.due()
+        if not due:
+            return []
+        # the module level async transport unless polling another daemon
+        url = None if self.lbry is client.default_client() else self.lbry.url
+        results = await asyncio.gather(
+            *[async_client.call('file_list', {'sd_hash': d.sd_hash, 'full_status': True}, url)
+              for d in due],
+            return_exceptions=True)
+        now = self.clock()
+        events = []
+        for download, entries in zip(due, results):
+            if isinstance(entries, Exception):
+                events.extend(self._missed(download, entries, now))
+            else:
+                events.extend(self._update(download, entries, now))
+        return events
+
+    def events(self):
+        """Poll until every tracked download finished, yielding Events"""
+        while self.active:
+            time.sleep(self.next_due())
+            for event in self.poll():
+                yield event
+
+    async def aevents(self):
+        """Async iterator version of events"""
+        while self.active:
+            await asyncio.sleep(self.next_due())
+            for event in await self.apoll():
+                yield event
+
+    def _update(self, download, entries, now):
+        if not entries:
+            return self._fail(download, Exception('file is no longer in file_list'))
+        return self._apply(download, models.as_dict(entries[0]), now)
+
+    def _missed(self, download, error, now):
+        download.error = error
+        if self.stall_timeout is not None and now - download.last_progress > self.stall_timeout:
+            return self._fail(download, Exception('download stalled'))
+        download.interval = min(self.max_interval, max(self.min_interval, download.interval * 2))
+        download.next_poll = now + download.interval
+        return []
+
+    def _apply(self, download, entry, now):
+        download.entry = entry
+        download.error = None
+        written = entry.get('written_bytes') or 0
+        download.total_bytes = entry.get('total_bytes') or download.total_bytes
+        elapsed = max(now - download.last_poll, 1e-6)
+        progressed = written - download.written_bytes
+        download.written_bytes = written
+        download.last_poll = now
+
+        if entry.get('completed'):
+            download.completed = True
+            self.untrack(download.sd_hash)
+            self._notify(self.on_complete, download)
+            return [Event(COMPLETE, download)]
+        if entry.get('stopped'):
+            return self._fail(download, Exception('download stopped'))
+
+        if progressed > 0:
+            download.last_progress = now
+            interval = self.max_interval
+            if download.total_bytes:
+                eta = (download.total_bytes - written) / (progressed / elapsed)
+                interval = eta / 2
+        elif self.stall_timeout is not None and now - download.last_progress > self.stall_timeout:
+            return self._fail(download, Exception('download stalled'))
+        else:
+            interval = download.interval * 2
+        download.interval = min(self.max_interval, max(self.min_interval, interval))
+        download.next_poll = now + download.interval
+
+        if progressed > 0:
+            self._notify(self.on_progress, download)
+            return [Event(PROGRESS, download)]
+        return []
+
+    def _fail(self, download, error):
+        download.error = error
+        self.untrack(download.sd_hash)
+        self._notify(self.on_error, download)
+        return [Event(ERROR, download)]
+
+    def _notify(self, callback, download):
+        if callback is not None:
+            callback(download)
@@ -0,0 +1,247 @@
+"""Run slow daemon calls in the background and wait on handles
+
+    with JobManager(workers=8, deadline=120) as manager:
+        job = manager.get('lbry://what')
+        ...
+        for job in manager.as_completed([job]):
+            print(job.method, job.result())
+
+get, descriptor_get, reflect and publish can keep a caller waiting for
+minutes. A JobManager runs them on its own thread pool and returns a Job
+right away. Every job has a deadline, counted from when it is submitted: it
+is the HTTP timeout of the job's request. For get and descriptor_get the
+daemon's own 'timeout' argument, when the caller gives none, is set
+client.DAEMON_TIMEOUT_MARGIN seconds below it, so the daemon gives up and
+answers before the request times out. A job still queued when its deadline
+passes, or with too little time left for the daemon to time out first,
+fails without being sent.
+"""
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import as_completed as _as_completed
+
+import client
+
+# methods that take a daemon side 'timeout' argument
+TIMEOUT_METHODS = frozenset(['get', 'descriptor_get'])
+
+
+class Job(object):
+    """Handle of a submitted daemon call
+
+    Attributes:
+        'method': (str) daemon method
+        'params': (dict) its params
+        'deadline': (float) time.monotonic() by which the job gives up, None
+                    for no deadline
+    """
+
+    def __init__(self, method, params, deadline):
+        self.method = method
+        self.params = params
+        self.deadline = deadline
+        self.started = None
+        self.finished = None
+        self.future = None
+        self._abandoned = False
+
+    def __repr__(self):
+        return 'Job({!r}, {})'.format(self.method, self.status)
+
+    def remaining(self):
+        """Seconds left until the deadline, None if there is none"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def status(self):
+        """'queued', 'running', 'cancelled', 'failed' or 'done'"""
+        if self.cancelled():
+            return 'cancelled'
+        if not self.future.done():
+            return 'running' if self.started is not None else 'queued'
+        return 'failed' if self.future.exception() is not None else 'done'
+
+    def done(self):
+        return self._abandoned or self.future.done()
+
+    def cancelled(self):
+        return self._abandoned or self.future.cancelled()
+
+    def cancel(self):
+        """Stop waiting for the job
+
+        A queued job is never sent. A running request cannot be recalled from
+        the daemon, but its result is dropped and waiting on the job raises
+        CancelledError right away.
+
+        Returns:
+            (bool) False if the job had already finished
+        """
+        if self.future.cancel():
+            return True
+        if self.future.done():
+            return False
+        self._abandoned = True
+        return True
+
+    def result(self, timeout=None):
+        """Wait for the job and return its result
+
+        Args:
+            'timeout' (optional): (float) seconds to wait, None to wait for as
+                                  long as the job runs
+        Returns:
+            the daemon method's result
+        Raises:
+            the call's exception, CancelledError if the job was cancelled, or
+            concurrent.futures.TimeoutError if timeout passed first
+        """
+        if self._abandoned:
+            raise CancelledError()
+        return self.future.result(timeout)
+
+    wait = result
+
+    def exception(self, timeout=None):
+        """Wait for the job and return its exception, None if it succeeded"""
+        if self._abandoned:
+            raise CancelledError()
+        return self.future.exception(timeout)
+
+
+def as_completed(jobs, timeout=None):
+    """Yield jobs as they finish, whether they succeeded, failed or were
+    cancelled
+
+    Args:
+        'jobs': (iterable) Job handles
+        'timeout' (optional): (float) seconds after which the remaining jobs
+                              raise concurrent.futures.TimeoutError
+    """
+    jobs = list(jobs)
+    by_future = {}
+    for job in jobs:
+        if job.cancelled():
+            yield job
+        else:
+            by_future[job.future] = job
+    for future in _as_completed(by_future, timeout):
+        yield by_future[future]
+
+
+class JobManager(object):
+    """Executor for long running daemon calls
+
+    Args:
+        'lbry' (optional): (LbryClient) client to send with, defaults to
+                           client.default_client()
+        'workers' (optional): (int) max jobs running at once
+        'deadline' (optional): (float) default seconds a job may take, None
+                               for no limit
+    """
+
+    def __init__(self, lbry=None, workers=4, deadline=None):
+        self.lbry = lbry or client.default_client()
+        self.deadline = deadline
+        self.jobs = set()
+        self._executor = ThreadPoolExecutor(workers)
+        self._lock = threading.Lock()
+
+    def _run(self, job):
+        job.started = time.monotonic()
+        try:
+            params = dict(job.params)
+            lbry = self.lbry
+            remaining = job.remaining()
+            if remaining is not None:
+                if remaining <= 0:
+                    raise FutureTimeout('{} passed its deadline before it started'.format(job.method))
+                if job.method in TIMEOUT_METHODS and params.get('timeout') is None:
+                    params['timeout'] = client.daemon_timeouts(remaining)
+                    if params['timeout'] is None:
+                        raise FutureTimeout('{} has too little time left for the daemon to '
+                                            'time out first'.format(job.method))
+                lbry = lbry.with_timeout(remaining)
+            if job._abandoned:
+                raise CancelledError()
+            res = lbry._request(job.method, **params)
+            return lbry._typed(job.method, res)
+        finally:
+            job.finished = time.monotonic()
+
+    def _forget(self, job):
+        with self._lock:
+            self.jobs.discard(job)
+
+    def submit(self, method, deadline=None, **params):
+        """Start a daemon call in the background
+
+        Args:
+            'method': (str) daemon method
+            'deadline' (optional): (float) seconds the job may take, defaults
+                                   to the manager's deadline
+            Other keyword args are the method's params
+        Returns:
+            (Job) handle of the call
+        """
+        deadline = self.deadline if deadline is None else deadline
+        job = Job(method, params, time.monotonic() + deadline if deadline is not None else None)
+        with self._lock:
+            self.jobs.add(job)
+        job.future = self._executor.submit(self._run, job)
+        job.future.add_done_callback(lambda _: self._forget(job))
+        return job
+
+    def get(self, uri, file_name=None, timeout=None, download_directory=None, deadline=None):
+        """Start client.get in the background, returning its Job"""
+        return self.submit('get', deadline, uri=uri, file_name=file_name, timeout=timeout,
+                           download_directory=download_directory)
+
+    def descriptor_get(self, sd_hash, timeout=None, payment_rate_manager=None, deadline=None):
+        """Start client.descriptor_get in the background, returning its Job"""
+        return self.submit('descriptor_get', deadline, sd_hash=sd_hash, timeout=timeout,
+                           payment_rate_manager=payment_rate_manager)
+
+    def reflect(self, sd_hash, deadline=None):
+        """Start client.reflect in the background, returning its Job"""
+        return self.submit('reflect', deadline, sd_hash=sd_hash)
+
+    def publish(self, name, bid, file_path=None, metadata=None, deadline=None, **kwargs):
+        """Start client.publish in the background, returning its Job
+
+        The publish fields are checked before the job is submitted.
+        """
+        client._check_publish_fields(metadata or {}, kwargs)
+        return self.submit('publish', deadline, name=name, bid=bid, file_path=file_path,
+                           metadata=metadata, **kwargs)
+
+    def as_completed(self, jobs=None, timeout=None):
+        """Yield jobs as they finish, by default every job not finished yet"""
+        if jobs is None:
+            with self._lock:
+                jobs = list(self.jobs)
+        return as_completed(jobs, timeout)
+
+    def shutdown(self, wait=True, cancel=False):
+        """Stop the executor
+
+        Args:
+            'wait' (optional): (bool) wait for running jobs to finish
+            'cancel' (optional): (bool) cancel jobs that are still queued
+        """
+        if cancel:
+            with self._lock:
+                jobs = list(self.jobs)
+            for job in jobs:
+                job.future.cancel()
+        self._executor.shutdown(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
@@ -0,0 +1,118 @@
+"""Per-method latency, size and error metrics for daemon calls"""
+import bisect
+import threading
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MethodStats(object):
+    __slots__ = ('counts', 'sum', 'count', 'request_bytes', 'response_bytes', 'errors')
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.errors = {}
+
+
+class Metrics(object):
+    """Collects one latency histogram and byte/error counters per method
+
+    Use enable_metrics() in client.py to record every daemon call.
+
+    Args:
+        'buckets' (optional): (tuple) upper bounds in seconds of the
+                              latency histogram buckets
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.methods = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method, latency, request_bytes=0, response_bytes=0, error_code=None):
+        """Record one call
+
+        Args:
+            'method': (str) daemon method name
+            'latency': (float) seconds the call took
+            'request_bytes': (int) size of the request body
+            'response_bytes': (int) size of the response body
+            'error_code' (optional): daemon error code, or exception name for
+                                     transport errors, None on success
+        """
+        i = bisect.bisect_left(self.buckets, latency)
+        with self._lock:
+            stats = self.methods.get(method)
+            if stats is None:
+                stats = self.methods[method] = MethodStats(self.buckets)
+            stats.counts[i] += 1
+            stats.sum += latency
+            stats.count += 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            if error_code is not None:
+                stats.errors[error_code] = stats.errors.get(error_code, 0) + 1
+
+    def snapshot(self):
+        """Returns:
+            (dict) method name -> {
+                'count': (int) number of calls,
+                'latency_sum': (float) total seconds,
+                'buckets': (list) [upper bound, cumulative count] pairs,
+                'request_bytes': (int) total request body bytes,
+                'response_bytes': (int) total response body bytes,
+                'errors': (dict) error code -> count
+            }
+        """
+        with self._lock:
+            snapshot = {}
+            for method, stats in self.methods.items():
+                cumulative, total = [], 0
+                for bound, count in zip(self.buckets + (float('inf'),), stats.counts):
+                    total += count
+                    cumulative.append([bound, total])
+                snapshot[method] = {
+                    'count': stats.count,
+                    'latency_sum': stats.sum,
+                    'buckets': cumulative,
+                    'request_bytes': stats.request_bytes,
+                    'response_bytes': stats.response_bytes,
+                    'errors': dict(stats.errors),
+                }
+            return snapshot
+
+    def reset(self):
+        with self._lock:
+            self.methods = {}
+
+    def prometheus(self, prefix='lbry_client'):
+        """Render the metrics in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP {}_request_duration_seconds Daemon call latency.'.format(prefix),
+            '# TYPE {}_request_duration_seconds histogram'.format(prefix),
+        ]
+        for method, stats in sorted(snapshot.items()):
+            for bound, count in stats['buckets']:
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('{}_request_duration_seconds_bucket{{method="{}",le="{}"}} {}'.format(
+                    prefix, method, le, count))
+            lines.append('{}_request_duration_seconds_sum{{method="{}"}} {!r}'.format(
+                prefix, method, stats['latency_sum']))
+            lines.append('{}_request_duration_seconds_count{{method="{}"}} {}'.format(
+                prefix, method, stats['count']))
+        for name, field, help in (('request_bytes', 'request_bytes', 'Request body bytes sent.'),
+                                  ('response_bytes', 'response_bytes', 'Response body bytes received.')):
+            lines.append('# HELP {}_{}_total {}'.format(prefix, name, help))
+            lines.append('# TYPE {}_{}_total counter'.format(prefix, name))
+            for method, stats in sorted(snapshot.items()):
+                lines.append('{}_{}_total{{method="{}"}} {}'.format(prefix, name, method, stats[field]))
+        lines.append('# HELP {}_errors_total Daemon call errors by error code.'.format(prefix))
+        lines.append('# TYPE {}_errors_total counter'.format(prefix))
+        for method, stats in sorted(snapshot.items()):
+            for code, count in sorted(stats['errors'].items(), key=lambda item: str(item[0])):
+                lines.append('{}_errors_total{{method="{}",code="{}"}} {}'.format(prefix, method, code, count))
+        return '\n'.join(lines) + '\n'
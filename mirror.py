@@ -0,0 +1,206 @@
+"""Local SQLite copy of the wallet's claims and transactions
+
+    mirror = WalletMirror('wallet.db')
+    mirror.sync()
+    mirror.expiring_within(1000)
+
+sync() streams claim_list_mine and transaction_list from the daemon and only
+writes what changed since the last sync: transactions at or above the last
+synced height, and claims that are new or changed in any mirrored column.
+The daemon has no height filter, so every sync still transfers both full
+lists; only the writes are incremental. Reports then run against the
+indexed local tables.
+"""
+import sqlite3
+import threading
+
+import client
+import models
+import streaming
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS claims (
+    txid TEXT NOT NULL,
+    nout INTEGER NOT NULL,
+    claim_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT,
+    address TEXT,
+    amount REAL,
+    height INTEGER,
+    expiration_height INTEGER,
+    is_spent INTEGER NOT NULL DEFAULT 0,
+    value TEXT,
+    PRIMARY KEY (txid, nout)
+);
+CREATE INDEX IF NOT EXISTS claims_claim_id ON claims (claim_id);
+CREATE INDEX IF NOT EXISTS claims_name ON claims (name);
+CREATE INDEX IF NOT EXISTS claims_height ON claims (height);
+CREATE INDEX IF NOT EXISTS claims_expiration ON claims (expiration_height);
+CREATE TABLE IF NOT EXISTS transactions (
+    txid TEXT PRIMARY KEY,
+    height INTEGER,
+    timestamp INTEGER,
+    value REAL,
+    fee REAL,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_height ON transactions (height);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value
+);
+'''
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def _json(value):
+    if value is None or isinstance(value, str):
+        return value
+    return client._dumps(value).decode('utf-8')
+
+
+class WalletMirror(object):
+    """SQLite mirror of claim_list_mine and transaction_list
+
+    Args:
+        'path': (str) database file, ':memory:' for a throwaway mirror
+        'lbry' (optional): (LbryClient) client to sync from, defaults to
+                           client.default_client()
+    """
+
+    def __init__(self, path, lbry=None):
+        self.lbry = lbry
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _get_state(self, key, default=None):
+        row = self.db.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_state(self, key, value):
+        self.db.execute('INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)', (key, value))
+
+    @property
+    def height(self):
+        """Block height of the last sync"""
+        return self._get_state('height', 0)
+
+    @property
+    def last_transaction_height(self):
+        """Highest transaction height mirrored"""
+        return self._get_state('transaction_height', 0)
+
+    def sync(self):
+        """Pull new claims and transactions from the daemon
+
+        Returns:
+            (dict) number of 'claims' and 'transactions' written
+        """
+        lbry = self.lbry or client.default_client()
+        status = lbry.status()
+        height = (status.get('blockchain_status') or {}).get('blocks')
+        with self._lock, self.db:
+            claims = self._sync_claims(streaming.iter_claim_list_mine(lbry))
+            transactions = self._sync_transactions(streaming.iter_transaction_list(lbry), height)
+            if height is not None:
+                self._set_state('height', height)
+        return {'claims': claims, 'transactions': transactions}
+
+    def _sync_claims(self, claims):
+        # a claim changes after it is first mirrored, e.g. it gets a height
+        # and expiration_height once confirmed, so compare every column
+        known = {(row[0], row[1]): hash(row) for row in self.db.execute('SELECT * FROM claims')}
+        rows = []
+        for c in claims:
+            c = models.as_dict(c)
+            row = (c['txid'], c['nout'], c['claim_id'], c['name'], c.get('category'),
+                   c.get('address'), _float(c.get('amount')), c.get('height'),
+                   c.get('expiration_height'), 1 if c.get('is_spent') else 0,
+                   _json(c.get('value')))
+            if known.get((row[0], row[1])) == hash(row):
+                continue
+            rows.append(row)
+        self.db.executemany('INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def _sync_transactions(self, transactions, current_height):
+        last = self.last_transaction_height
+        rows = []
+        top = last
+        for t in transactions:
+            t = models.as_dict(t)
+            height = t.get('height')
+            if height is None and t.get('confirmations') and current_height is not None:
+                height = current_height - t['confirmations'] + 1
+            # transaction_list may not be ordered, and unconfirmed ones get a
+            # height later, so only skip what is below the last synced height
+            if height is not None and height < last:
+                continue
+            rows.append((t['txid'], height, t.get('timestamp'), _float(t.get('value')),
+                         _float(t.get('fee')), _json(t)))
+            if height is not None and height > top:
+                top = height
+        self.db.executemany('INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?)', rows)
+        self._set_state('transaction_height', top)
+        return len(rows)
+
+    def expiring_within(self, blocks, height=None):
+        """Unspent claims that expire within blocks of height
+
+        Args:
+            'blocks': (int) number of blocks
+            'height' (optional): (int) current height, defaults to the height
+                                 of the last sync
+        Returns:
+            (list) (claim_id, name, expiration_height, blocks_to_expiration)
+        """
+        height = self.height if height is None else height
+        return self.db.execute(
+            'SELECT claim_id, name, expiration_height, expiration_height - ? FROM claims '
+            'WHERE is_spent = 0 AND expiration_height BETWEEN ? AND ? '
+            'ORDER BY expiration_height', (height, height, height + blocks)).fetchall()
+
+    def totals_by_category(self):
+        """Returns:
+            (dict) category -> (count, total amount) of unspent claims
+        """
+        rows = self.db.execute('SELECT category, COUNT(*), SUM(amount) FROM claims '
+                               'WHERE is_spent = 0 GROUP BY category')
+        return {category: (count, total) for category, count, total in rows}
+
+    def claim_by_outpoint(self, txid, nout):
+        """Returns:
+            (dict) the mirrored claim at txid:nout, None if unknown
+        """
+        cursor = self.db.execute('SELECT * FROM claims WHERE txid = ? AND nout = ?', (txid, nout))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([d[0] for d in cursor.description], row))
+
+    def claims_by_name(self, name):
+        """Returns:
+            (list) claim_ids of mirrored claims for name
+        """
+        return [r[0] for r in self.db.execute('SELECT claim_id FROM claims WHERE name = ?', (name,))]
+
+    def transaction(self, txid):
+        """Returns:
+            (dict) the mirrored transaction, None if unknown
+        """
+        row = self.db.execute('SELECT body FROM transactions WHERE txid = ?', (txid,)).fetchone()
+        return client._loads(row[0]) if row else None
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
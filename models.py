@@ -0,0 +1,176 @@
+"""Compact record classes for claims, supports, files and transactions
+
+The records use __slots__ instead of a per-object dict. Bulky nested fields
+(a claim's 'value', a file's 'metadata') arrive already decoded with the rest
+of the response; by default a record encodes them back to compact JSON text,
+which takes far less memory than the nested dicts, and decodes that text again
+the first time the field is accessed. This is a trade of CPU for memory, not
+a saving of decoding work: the encoding roughly doubles the time it takes to
+build the records from a parsed response. Set PACK_FIELDS to False to keep
+the nested fields as they were decoded.
+"""
+import json
+
+import projection
+
+# store nested fields as compact JSON text, see the module docstring
+PACK_FIELDS = True
+
+
+class _Packed(str):
+    """Compact JSON text of a nested field, decoded again on access"""
+    __slots__ = ()
+
+
+def _pack(value):
+    if PACK_FIELDS and isinstance(value, (dict, list)):
+        return _Packed(json.dumps(value, separators=(',', ':')))
+    return value
+
+
+class Record(object):
+    """Base for the result records
+
+    'fields' lists the plain attributes, 'lazy' the nested ones stored as JSON
+    text until first accessed when PACK_FIELDS is set. Keys not in either end
+    up in the 'extra' dict, which is None when there are none.
+    """
+    __slots__ = ('extra',)
+    fields = ()
+    lazy = ()
+
+    def __init__(self, **kwargs):
+        for name in self.fields:
+            setattr(self, name, kwargs.pop(name, None))
+        for name in self.lazy:
+            setattr(self, '_' + name, _pack(kwargs.pop(name, None)))
+        self.extra = kwargs or None
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+    def to_dict(self):
+        d = {name: getattr(self, name) for name in self.fields}
+        for name in self.lazy:
+            d[name] = getattr(self, name)
+        if self.extra:
+            d.update(self.extra)
+        return d
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, ', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self.fields
+            if getattr(self, name) is not None))
+
+
+def _lazy(name):
+    slot = '_' + name
+
+    def fget(self):
+        value = getattr(self, slot)
+        if isinstance(value, _Packed):
+            value = json.loads(value)
+            setattr(self, slot, value)
+        return value
+
+    return property(fget)
+
+
+def _record(name, fields, lazy=(), doc=None):
+    namespace = {
+        '__slots__': tuple(fields) + tuple('_' + f for f in lazy),
+        '__doc__': doc,
+        'fields': tuple(fields),
+        'lazy': tuple(lazy),
+    }
+    for f in lazy:
+        namespace[f] = _lazy(f)
+    return type(name, (Record,), namespace)
+
+
+Support = _record('Support', ['txid', 'nout', 'amount'], doc="A support for a claim")
+
+_claim = _record('Claim', [
+    'address', 'amount', 'effective_amount', 'claim_id', 'claim_sequence',
+    'decoded_claim', 'height', 'depth', 'has_signature', 'name', 'channel_name',
+    'category', 'confirmations', 'blocks_to_expiration', 'expiration_height',
+    'expired', 'is_spent', 'txid', 'nout', 'signature_is_valid', 'supports',
+], lazy=['value'], doc="""A name claim
+
+    'value' is the ClaimDict, or a hex string if it could not be decoded.
+    """)
+
+
+class Claim(_claim):
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        supports = kwargs.get('supports')
+        if supports:
+            kwargs['supports'] = [Support.from_dict(s) for s in supports]
+        _claim.__init__(self, **kwargs)
+
+    def to_dict(self):
+        d = _claim.to_dict(self)
+        if d['supports']:
+            d['supports'] = [s.to_dict() for s in d['supports']]
+        return d
+
+
+FileEntry = _record('FileEntry', [
+    'completed', 'file_name', 'download_directory', 'points_paid', 'stopped',
+    'stream_hash', 'stream_name', 'suggested_file_name', 'sd_hash', 'name',
+    'outpoint', 'claim_id', 'download_path', 'mime_type', 'key', 'total_bytes',
+    'written_bytes', 'message',
+], lazy=['metadata'], doc="A lbry file from file_list or get")
+
+Transaction = _record('Transaction', [
+    'txid', 'timestamp', 'date', 'confirmations', 'value', 'fee',
+    'claim_info', 'support_info', 'update_info', 'abandon_info',
+], doc="A wallet transaction")
+
+
+def as_dict(obj):
+    """Return a result that may be a record as a plain dict"""
+    return obj if isinstance(obj, dict) else obj.to_dict()
+
+
+def field(obj, name):
+    """Return a field of a plain dict or a record, None if it is missing"""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def sd_hash(resolved):
+    """Return the sd blob hash of a resolve result, None if it has none"""
+    if not isinstance(resolved, dict):
+        return None
+    value = field(resolved.get('claim'), 'value')
+    try:
+        return value['stream']['source']['source']
+    except (KeyError, TypeError):
+        return None
+
+
+# method name -> record class of the records in its result, which
+# projection.walkers finds
+record_classes = {
+    'claim_list': Claim,
+    'claim_list_mine': Claim,
+    'file_list': FileEntry,
+    'get': FileEntry,
+    'resolve': Claim,
+    'transaction_list': Transaction,
+    'transaction_show': Transaction,
+}
+
+
+def convert(method, res):
+    """Convert the result of a daemon method to records where supported"""
+    cls = record_classes.get(method)
+    return projection.map_records(method, res, cls.from_dict) if cls else res
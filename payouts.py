@@ -0,0 +1,294 @@
+"""Queue, merge and send payments and tips with a crash safe journal
+
+    with PayoutBatcher('payouts.journal', workers=4, rate=20) as payouts:
+        payouts.pay('bY1b4p...', 1.5, ref='invoice-1')
+        payouts.pay('bY1b4p...', 0.5, ref='invoice-2')   # merged with invoice-1
+        payouts.tip('what', 'd5169241...', 1.0, ref='tip-1')
+        for report in payouts.flush():
+            print(report)
+
+Payments to the same address, and tips to the same claim, are merged into
+one send_amount_to_address or claim_new_support call. Every queued payment
+carries a caller chosen 'ref'. Before a call is sent its refs are written to
+the journal as an intent and fsynced, and afterwards marked done or failed.
+Only an error answered by the daemon marks a payment failed. A ref that is
+done, or whose intent has no outcome because the process died or the request
+failed any other way, is never sent again: the latter are listed by
+unknown() for someone to check and settle with resolve().
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import bulk
+import client
+import storage
+
+Payment = namedtuple('Payment', ['id', 'kind', 'target', 'name', 'amount', 'refs'])
+
+
+def _amount(value):
+    return round(float(value), 8)
+
+
+def _payment_id(kind, target, refs):
+    key = '{}:{}:{}'.format(kind, target, ','.join(sorted(refs)))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+class PayoutJournal(object):
+    """Append only JSON lines log of payment intents and outcomes
+
+    Args:
+        'path': (str) journal file, created if missing
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.refs = {}
+        self.intents = {}
+        self._lock = threading.Lock()
+        for record in storage.read_journal(path):
+            self._apply(record)
+        self._writer = storage.JournalWriter(path)
+
+    def _apply(self, record):
+        state = record['state']
+        if state == 'intent':
+            self.intents[record['id']] = record
+        else:
+            self.intents.pop(record['id'], None)
+        for ref in record['refs']:
+            self.refs[ref] = state
+
+    def state(self, ref):
+        """'intent', 'done', 'failed' or None if ref was never sent"""
+        return self.refs.get(ref)
+
+    def _write(self, record):
+        with self._lock:
+            self._writer.append(record)
+            self._apply(record)
+
+    def intent(self, payment):
+        self._write({'state': 'intent', 'id': payment.id, 'kind': payment.kind,
+                     'target': payment.target, 'name': payment.name, 'amount': payment.amount,
+                     'refs': list(payment.refs), 'time': time.time()})
+
+    def done(self, payment, result):
+        self._write({'state': 'done', 'id': payment.id, 'refs': list(payment.refs),
+                     'result': result, 'time': time.time()})
+
+    def failed(self, payment, error):
+        self._write({'state': 'failed', 'id': payment.id, 'refs': list(payment.refs),
+                     'error': str(error), 'time': time.time()})
+
+    def close(self):
+        self._writer.close()
+
+
+class PayoutBatcher(object):
+    """Sends queued payments in merged batches
+
+    Args:
+        'journal': (str) path of the idempotency journal
+        'lbry' (optional): (LbryClient) client to pay with, defaults to
+                           client.default_client()
+        'workers' (optional): (int) max calls in flight
+        'rate' (optional): (float) max calls started per second
+        'batch_size' (optional): (int) merged payments per batch
+        'track_balance' (optional): (bool) read wallet_balance before and
+                                    after each batch to work out the fees of
+                                    sends, which the daemon does not report.
+                                    Other wallet activity during a batch skews
+                                    the figure.
+    """
+
+    def __init__(self, journal, lbry=None, workers=4, rate=None, batch_size=100,
+                 track_balance=True):
+        self.journal = PayoutJournal(journal)
+        self.lbry = lbry or client.default_client()
+        self.workers = workers
+        self.limiter = bulk.RateLimiter(rate) if rate else None
+        self.batch_size = batch_size
+        self.track_balance = track_balance
+        self.reports = []
+        self._queue = OrderedDict()
+        self._queued_refs = set()
+        self._lock = threading.Lock()
+
+    def _enqueue(self, kind, target, name, amount, ref):
+        if ref in self._queued_refs or self.journal.state(ref) in ('intent', 'done'):
+            return False
+        amount = _amount(amount)
+        if amount <= 0:
+            raise Exception('payment {} has a non positive amount'.format(ref))
+        key = (kind, target)
+        entry = self._queue.get(key)
+        if entry is None:
+            entry = self._queue[key] = [name, 0.0, []]
+        entry[1] = _amount(entry[1] + amount)
+        entry[2].append(ref)
+        self._queued_refs.add(ref)
+        return True
+
+    def pay(self, address, amount, ref):
+        """Queue a send_amount_to_address
+
+        Args:
+            'address': (str) recipient address
+            'amount': (float) credits to send
+            'ref': (str) unique id of this payment, e.g. an invoice id
+        Returns:
+            (bool) False if ref was already queued, paid or possibly paid
+        """
+        with self._lock:
+            return self._enqueue('send', address, None, amount, ref)
+
+    def tip(self, name, claim_id, amount, ref):
+        """Queue a claim_new_support
+
+        Args:
+            'name': (str) name of the claim
+            'claim_id': (str) claim id to support
+            'amount': (float) credits to support it with
+            'ref': (str) unique id of this tip
+        Returns:
+            (bool) False if ref was already queued, paid or possibly paid
+        """
+        with self._lock:
+            return self._enqueue('support', claim_id, name, amount, ref)
+
+    def pending(self):
+        """Number of merged payments waiting to be sent"""
+        return len(self._queue)
+
+    def _take(self, count):
+        payments = []
+        with self._lock:
+            while self._queue and len(payments) < count:
+                (kind, target), (name, amount, refs) = self._queue.popitem(last=False)
+                payments.append(Payment(_payment_id(kind, target, refs), kind, target, name,
+                                        amount, tuple(refs)))
+        return payments
+
+    def _release(self, payments):
+        # from here on the journal knows these refs
+        with self._lock:
+            for payment in payments:
+                self._queued_refs.difference_update(payment.refs)
+
+    def _send(self, payment):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        self.journal.intent(payment)
+        try:
+            if payment.kind == 'send':
+                result = self.lbry.send_amount_to_address(payment.amount, payment.target)
+            else:
+                result = self.lbry.claim_new_support(payment.name, payment.target, payment.amount)
+        except client.DaemonError as e:
+            # the daemon answered with an error, so it did not pay
+            self.journal.failed(payment, e)
+            raise
+        # on any other error, e.g. a lost connection or a proxy's error page,
+        # the daemon may have paid; the intent stays open
+        self.journal.done(payment, result)
+        return result
+
+    def _balance(self):
+        try:
+            return float(self.lbry.wallet_balance())
+        except Exception:
+            return None
+
+    def _run_batch(self, number, payments):
+        before = self._balance() if self.track_balance else None
+        stats = bulk.BulkStats()
+        report = {'batch': number, 'payments': len(payments), 'sent': 0, 'failed': 0,
+                  'unknown': 0, 'amount': 0.0, 'fees': 0.0, 'errors': []}
+        for payment, result in bulk.map_unordered(self._send, payments, self.workers, stats):
+            if isinstance(result, client.DaemonError):
+                report['failed'] += 1
+                report['errors'].append((payment.refs, result))
+            elif isinstance(result, Exception):
+                report['unknown'] += 1
+                report['errors'].append((payment.refs, result))
+            else:
+                report['sent'] += 1
+                report['amount'] = _amount(report['amount'] + payment.amount)
+                if isinstance(result, dict) and result.get('fee') is not None:
+                    report['fees'] = _amount(report['fees'] + abs(float(result['fee'])))
+        summary = stats.summary()
+        report['elapsed'] = summary['elapsed']
+        report['payments_per_sec'] = summary['calls_per_sec']
+        report['p50'] = summary['p50']
+        report['p99'] = summary['p99']
+        after = self._balance() if before is not None else None
+        # sends don't report their fee, the balance drop beyond the amounts paid does
+        report['balance_fees'] = _amount(before - after - report['amount']) \
+            if after is not None else None
+        return report
+
+    def flush(self, on_batch=None):
+        """Send everything queued, one batch at a time
+
+        Payments queued while flushing go out in later batches, and stopping
+        the generator leaves the remaining batches queued.
+
+        Args:
+            'on_batch' (optional): (callable) called with each batch report
+        Returns:
+            (generator) per batch report dicts: 'payments', 'sent', 'failed',
+            'unknown', 'amount', 'fees' reported by the daemon, 'balance_fees'
+            from the wallet balance, 'elapsed', 'payments_per_sec', 'p50',
+            'p99' and 'errors' as (refs, exception) tuples
+        """
+        while True:
+            payments = self._take(self.batch_size)
+            if not payments:
+                return
+            try:
+                report = self._run_batch(len(self.reports), payments)
+            finally:
+                self._release(payments)
+            self.reports.append(report)
+            if on_batch is not None:
+                on_batch(report)
+            yield report
+
+    def unknown(self):
+        """Returns:
+            (list) journal intents with no recorded outcome; they may or may
+            not have been paid
+        """
+        return list(self.journal.intents.values())
+
+    def resolve(self, payment_id, paid, result=None):
+        """Settle an unknown intent after checking the wallet
+
+        Args:
+            'payment_id': (str) 'id' of an intent from unknown()
+            'paid': (bool) whether the payment went through; unpaid refs can
+                    be queued again
+            'result' (optional): what to record as its result
+        """
+        record = self.journal.intents.get(payment_id)
+        if record is None:
+            raise Exception('no unknown payment {}'.format(payment_id))
+        payment = Payment(record['id'], record['kind'], record['target'], record['name'],
+                          record['amount'], tuple(record['refs']))
+        if paid:
+            self.journal.done(payment, result)
+        else:
+            self.journal.failed(payment, 'resolved as not paid')
+
+    def close(self):
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,224 @@
+"""Spread read-only calls over several lbrynet daemons
+
+    pool = DaemonPool(['http://a:5279/lbryapi', 'http://b:5279/lbryapi'])
+    pool.resolve('lbry://what')
+    pool.publish(...)  # always sent to the primary, the first url
+
+Read-only methods go to the healthy daemon with the fewest requests in
+flight. Latencies are tracked per daemon, and when a read takes longer than
+the recent p95 latency of its method on the fastest healthy daemon, a
+duplicate is sent to a second daemon and whichever answers first wins, so a
+slow daemon does not hold back the hedging of the reads sent to it.
+Daemons failing with transport errors, or whose status() says they are not
+running, are ejected until a later health check finds them running again.
+Every other method, including everything that touches the wallet, is only
+ever sent to the primary daemon.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+import client
+
+READ_METHODS = frozenset([
+    'claim_list', 'claim_show', 'get_availability', 'peer_list', 'resolve',
+    'resolve_name', 'stream_cost_estimate',
+])
+
+
+class Endpoint(object):
+    """One daemon in the pool"""
+
+    def __init__(self, url, pool_size):
+        self.url = url
+        self.transport = client.Transport(url, pool_size)
+        self.outstanding = 0
+        self.failures = 0
+        self.healthy = True
+        # method -> recent latencies of successful calls
+        self.latencies = {}
+
+    def __repr__(self):
+        return 'Endpoint({!r}, outstanding={}, healthy={})'.format(
+            self.url, self.outstanding, self.healthy)
+
+
+class DaemonPool(object):
+    """Client for a set of daemons, the first of which is the primary
+
+    Args:
+        'urls': (list) daemon api urls, urls[0] is the primary
+        'pool_size' (optional): (int) pooled connections per daemon
+        'hedge' (optional): (bool) send duplicate reads when they are slow
+        'hedge_percentile' (optional): (float) latency percentile of a method
+                                       on the fastest daemon after which a
+                                       read is hedged
+        'min_hedge_delay' (optional): (float) never hedge sooner than this
+        'max_failures' (optional): (int) consecutive transport errors after
+                                   which a daemon is ejected
+    """
+
+    def __init__(self, urls, pool_size=client.POOL_SIZE, hedge=True, hedge_percentile=95,
+                 min_hedge_delay=0.01, max_failures=3):
+        if not urls:
+            raise Exception('DaemonPool needs at least one url')
+        self.endpoints = [Endpoint(url, pool_size) for url in urls]
+        self.primary = self.endpoints[0]
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_failures = max_failures
+        self.hedged = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(pool_size * len(urls))
+        self._health_thread = None
+        self._stopped = threading.Event()
+
+    def _pick(self, exclude=None):
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.healthy and e is not exclude]
+            if not candidates:
+                return None
+            least = min(e.outstanding for e in candidates)
+            endpoint = random.choice([e for e in candidates if e.outstanding == least])
+            endpoint.outstanding += 1
+            return endpoint
+
+    def _send(self, endpoint, method, params):
+        start = time.perf_counter()
+        try:
+            result = client._call(endpoint.transport, method, params)
+        except requests.RequestException:
+            with self._lock:
+                endpoint.failures += 1
+                if endpoint.failures >= self.max_failures and endpoint is not self.primary:
+                    endpoint.healthy = False
+            raise
+        finally:
+            with self._lock:
+                endpoint.outstanding -= 1
+        with self._lock:
+            endpoint.failures = 0
+            endpoint.latencies.setdefault(method, deque(maxlen=200)).append(
+                time.perf_counter() - start)
+        return result
+
+    def hedge_delay(self, method):
+        """Seconds after which a read of method is hedged, None if unknown
+
+        It is the lowest latency percentile of method among the healthy
+        daemons with enough samples.
+        """
+        with self._lock:
+            per_endpoint = [sorted(e.latencies.get(method, ())) for e in self.endpoints
+                            if e.healthy]
+        delays = [samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100.0))]
+                  for samples in per_endpoint if len(samples) >= 20]
+        if not delays:
+            return None
+        return max(min(delays), self.min_hedge_delay)
+
+    def call(self, method, params):
+        """Send a daemon call, balancing and hedging it if it is read-only"""
+        if method not in READ_METHODS:
+            with self._lock:
+                self.primary.outstanding += 1
+            return self._send(self.primary, method, params)
+        endpoint = self._pick() or self._claim_primary()
+        delay = self.hedge_delay(method) if self.hedge else None
+        if delay is None or len(self.endpoints) == 1:
+            return self._send(endpoint, method, params)
+
+        first = self._executor.submit(self._send, endpoint, method, params)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        backup = self._pick(exclude=endpoint)
+        if backup is None:
+            return first.result()
+        with self._lock:
+            self.hedged += 1
+        pending = {first, self._executor.submit(self._send, backup, method, params)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _claim_primary(self):
+        with self._lock:
+            self.primary.outstanding += 1
+        return self.primary
+
+    def request(self, method, **params):
+        return self.call(method, params)
+
+    def __getattr__(self, method):
+        if method.startswith('_'):
+            raise AttributeError(method)
+        return lambda **params: self.call(method, params)
+
+    def resolve(self, uri):
+        return self.call('resolve', {'uri': uri})
+
+    def resolve_name(self, name):
+        return self.call('resolve_name', {'name': name})
+
+    def claim_list(self, name):
+        return self.call('claim_list', {'name': name})
+
+    def peer_list(self, blob_hash, timeout=None):
+        return self.call('peer_list', {'blob_hash': blob_hash, 'timeout': timeout})
+
+    def get_availability(self, uri, sd_timeout=None, peer_timeout=None):
+        return self.call('get_availability', {'uri': uri, 'sd_timeout': sd_timeout,
+                                              'peer_timeout': peer_timeout})
+
+    def stream_cost_estimate(self, name, size=None):
+        return self.call('stream_cost_estimate', {'uri': name, 'size': size})
+
+    def check_health(self):
+        """Call status() on every daemon and eject or readmit it
+
+        Returns:
+            (dict) url -> (bool) healthy
+        """
+        for endpoint in self.endpoints:
+            try:
+                status = client._call(endpoint.transport, 'status', {'session_status': False})
+                healthy = bool(status.get('is_running'))
+            except Exception:
+                healthy = False
+            with self._lock:
+                endpoint.healthy = healthy
+                if healthy:
+                    endpoint.failures = 0
+        return {e.url: e.healthy for e in self.endpoints}
+
+    def start_health_checks(self, interval=10.0):
+        """Run check_health every interval seconds in a background thread"""
+        def run():
+            while not self._stopped.wait(interval):
+                self.check_health()
+
+        self._health_thread = threading.Thread(target=run, daemon=True)
+        self._health_thread.start()
+
+    def close(self):
+        self._stopped.set()
+        self._executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
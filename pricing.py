@@ -0,0 +1,151 @@
+"""Price many streams with as few sd blob downloads as possible
+
+    estimator = CostEstimator(workers=32)
+    estimator.learn_files(client.file_list())
+    costs = estimator.estimate_many(names)
+
+stream_cost_estimate downloads a stream's sd blob to size it unless a size
+is given. The estimator remembers stream sizes learned from file_list
+(total_bytes), descriptor_get (the sum of the blob lengths) and resolve (which
+links a name to its sd hash, so a size known for the blob applies to the
+name), and always passes size when it knows one. Estimates are cached; the
+data rate from settings_get() is rechecked every 'rate_check' seconds and a
+change drops every cached estimate, since they were priced at the old rate.
+"""
+import threading
+
+import bulk
+import cache
+import client
+import models
+
+# sizes of an sd hash never change
+FOREVER = float('inf')
+
+
+def descriptor_size(descriptor):
+    """Return the stream size of a descriptor_get result, None if unknown"""
+    if not isinstance(descriptor, dict) or not descriptor.get('blobs'):
+        return None
+    return sum(blob.get('length') or 0 for blob in descriptor['blobs'])
+
+
+class CostEstimator(object):
+    """Cached, size aware stream_cost_estimate
+
+    Args:
+        'lbry' (optional): (LbryClient) client to use, defaults to
+                           client.default_client()
+        'workers' (optional): (int) max estimates in flight
+        'ttl' (optional): (float) seconds an estimate is cached at an
+                          unchanged data rate
+        'rate_check' (optional): (float) seconds between settings_get calls
+                                 checking the data rate
+        'maxsize' (optional): (int) max cached estimates and sizes
+    """
+
+    def __init__(self, lbry=None, workers=16, ttl=3600, rate_check=60, maxsize=100000):
+        self.lbry = lbry or client.default_client()
+        self.workers = workers
+        self.rate_check = rate_check
+        self.estimates = cache.TTLCache(maxsize, ttl)
+        self.sizes = cache.TTLCache(maxsize, ttl)
+        self.blob_sizes = cache.TTLCache(maxsize, FOREVER)
+        self.stats = bulk.BulkStats()
+        self.sized = 0
+        self.unsized = 0
+        self._rate = cache.TTLCache(1, rate_check)
+        self._rate_seen = None
+        self._lock = threading.Lock()
+
+    def data_rate(self):
+        """The daemon's data_rate, dropping cached estimates when it changed"""
+        rate = self._rate.get('data_rate')
+        if rate is cache.MISSING:
+            rate = (self.lbry.settings_get() or {}).get('data_rate')
+            self._rate.set('data_rate', rate)
+            with self._lock:
+                changed = self._rate_seen is not None and rate != self._rate_seen
+                self._rate_seen = rate
+            if changed:
+                self.estimates.invalidate()
+        return rate
+
+    def learn_size(self, name, size):
+        """Remember the size in bytes of the stream claimed at name"""
+        if size:
+            self.sizes.set(cache.normalize_name(name), int(size))
+
+    def learn_files(self, entries):
+        """Remember the total_bytes of file_list entries"""
+        for entry in entries or []:
+            entry = models.as_dict(entry)
+            size = entry.get('total_bytes')
+            if size and entry.get('sd_hash'):
+                self.blob_sizes.set(entry['sd_hash'], int(size))
+            if size and entry.get('name'):
+                self.learn_size(entry['name'], size)
+
+    def learn_descriptor(self, sd_hash, descriptor):
+        """Remember the stream size of a descriptor_get result"""
+        size = descriptor_size(descriptor)
+        if size:
+            self.blob_sizes.set(sd_hash, size)
+
+    def learn_resolve(self, name, resolved):
+        """Remember the size of name if its sd blob's size is known"""
+        blob = models.sd_hash(resolved)
+        if blob:
+            size = self.blob_sizes.get(blob)
+            if size is not cache.MISSING:
+                self.learn_size(name, size)
+
+    def size(self, name):
+        """Known size of the stream at name, None if unknown"""
+        size = self.sizes.get(cache.normalize_name(name))
+        return None if size is cache.MISSING else size
+
+    def estimate(self, name):
+        """Cost of the stream at name, from the cache when possible
+
+        Returns:
+            (float) estimated cost in lbry credits, None if name is not
+            resolvable
+        """
+        self.data_rate()
+        key = cache.normalize_name(name)
+        cost = self.estimates.get(key)
+        if cost is not cache.MISSING:
+            return cost
+        size = self.size(name)
+        if size is None:
+            self.unsized += 1
+        else:
+            self.sized += 1
+        cost = self.lbry.stream_cost_estimate(name, size=size)
+        if cost is not None:
+            self.estimates.set(key, cost)
+        return cost
+
+    def estimate_many(self, names):
+        """Price names, answering from the cache and running the rest in parallel
+
+        Returns:
+            (dict) name -> cost, or the exception its estimate raised
+        """
+        self.data_rate()
+        costs, todo, seen = {}, [], set()
+        for name in names:
+            key = cache.normalize_name(name)
+            if key in seen:
+                continue
+            seen.add(key)
+            cost = self.estimates.get(key)
+            if cost is cache.MISSING:
+                todo.append(name)
+            else:
+                costs[name] = cost
+        self.stats = bulk.BulkStats()
+        for name, cost in bulk.map_unordered(self.estimate, todo, self.workers, self.stats):
+            costs[name] = cost
+        return costs
@@ -0,0 +1,113 @@
+"""Keep only selected fields of daemon results
+
+    lbry.file_list(fields=['sd_hash', 'completed', 'written_bytes'])
+    lbry.resolve(uri, fields=['claim_id', 'effective_amount', 'height'])
+
+Fields are dotted paths into each record of a result: each file of
+file_list, each transaction of transaction_list, and each claim of
+claim_list, claim_list_mine and resolve (its claim, certificate and
+claims_in_channel). A path into a list applies to every item of the list, so
+'supports.amount' keeps the amount of each support. Paths that are missing
+from a record are left out of it.
+"""
+
+
+def compile_fields(fields):
+    """Turn dotted field paths into a nested dict, None marking kept leaves
+
+    Args:
+        'fields': (iterable) paths like 'claim_id' or 'value.stream.metadata.title'
+    Returns:
+        (dict) the field tree used by project
+    """
+    tree = {}
+    for path in fields:
+        node = tree
+        parts = path.split('.')
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                # the whole subtree is already kept
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project(obj, tree):
+    """Return a copy of obj holding only the fields in tree"""
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [project(item, tree) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    return {key: project(obj[key], sub) for key, sub in tree.items() if key in obj}
+
+
+def _record(item, fn):
+    return fn(item) if isinstance(item, dict) else item
+
+
+def _each(res, fn):
+    if isinstance(res, list):
+        return [_record(item, fn) for item in res]
+    return _record(res, fn)
+
+
+def _claim_list(res, fn):
+    if isinstance(res, dict) and res.get('claims') is not None:
+        res = dict(res, claims=[_record(c, fn) for c in res['claims']])
+    return res
+
+
+def _resolve(res, fn):
+    if not isinstance(res, dict):
+        return res
+    res = dict(res)
+    for key in ('claim', 'certificate'):
+        if isinstance(res.get(key), dict):
+            res[key] = fn(res[key])
+    if res.get('claims_in_channel'):
+        res['claims_in_channel'] = [_record(c, fn) for c in res['claims_in_channel']]
+    return res
+
+
+# method name -> function applying a function to each record of its result
+walkers = {
+    'claim_list': _claim_list,
+    'claim_list_mine': _each,
+    'file_list': _each,
+    'get': _each,
+    'resolve': _resolve,
+    'transaction_list': _each,
+    'transaction_show': _each,
+}
+
+
+def map_records(method, res, fn):
+    """Apply fn to each record of a method's result
+
+    Records are the dicts listed in the module docstring, plus the file of
+    get and the transaction of transaction_show. models.convert builds its
+    records with this too.
+
+    Returns:
+        a copy of res with each record replaced by fn(record), or res itself
+        if method has no records
+    """
+    walk = walkers.get(method)
+    return walk(res, fn) if walk is not None else res
+
+
+def shape(method, res, fields):
+    """Project the records of a method's result onto fields
+
+    Args:
+        'method': (str) daemon method
+        'res': the method's result
+        'fields': (iterable) dotted field paths, or a tree from compile_fields
+    """
+    tree = fields if isinstance(fields, dict) else compile_fields(fields)
+    return map_records(method, res, lambda record: project(record, tree))
@@ -0,0 +1,161 @@
+"""Publish many files concurrently with a resumable journal
+
+    jobs = [PublishJob('name', 1.0, '/path/file.mp4', metadata), ...]
+    publisher = BulkPublisher('publish.journal')
+    for result in publisher.run(jobs):
+        print(result.job.name, result.txid, result.claim_id)
+
+Every job is validated before anything is published. Each successful
+publish is appended to the journal by its worker as soon as the daemon
+answers, whether or not the caller is still iterating the results, so a run
+that is interrupted can be started again with the same jobs and only the
+remaining ones are published.
+"""
+import os
+import threading
+from collections import namedtuple
+
+import bulk
+import client
+import storage
+
+PublishJob = namedtuple('PublishJob', ['name', 'bid', 'file_path', 'metadata'])
+
+
+class PublishResult(namedtuple('PublishResult', ['job', 'result', 'error'])):
+    """Outcome of one job: the daemon's publish result or the exception"""
+    __slots__ = ()
+
+    @property
+    def txid(self):
+        return self.result.get('txid') if self.result else None
+
+    @property
+    def claim_id(self):
+        return self.result.get('claim_id') if self.result else None
+
+
+def _job(job):
+    if isinstance(job, dict):
+        return PublishJob(job['name'], job['bid'], job.get('file_path'), job.get('metadata'))
+    return PublishJob(*job)
+
+
+def validate(jobs):
+    """Check every job before publishing any
+
+    Args:
+        'jobs': (iterable) PublishJob or (name, bid, file_path, metadata)
+                tuples or dicts
+    Returns:
+        (list) the jobs as PublishJob
+    Raises:
+        Exception listing every invalid job
+    """
+    valid, errors, names = [], [], set()
+    for i, job in enumerate(jobs):
+        try:
+            job = _job(job)
+            if not job.name:
+                raise Exception('name is required')
+            if job.name in names:
+                raise Exception('{} is published more than once'.format(job.name))
+            if float(job.bid) <= 0:
+                raise Exception('bid must be positive')
+            if job.file_path is not None and not os.path.isfile(job.file_path):
+                raise Exception('{} is not a file'.format(job.file_path))
+            client._check_publish_fields(job.metadata or {}, {})
+        except Exception as e:
+            errors.append('job {}: {}'.format(i, e))
+            continue
+        names.add(job.name)
+        valid.append(job)
+    if errors:
+        raise Exception('{} invalid publish jobs'.format(len(errors)), errors)
+    return valid
+
+
+class Journal(object):
+    """Append only JSON lines record of published names
+
+    Args:
+        'path': (str) journal file, created if missing
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        self._lock = threading.Lock()
+        for record in storage.read_journal(path):
+            self.done[record['name']] = record
+        self._writer = storage.JournalWriter(path)
+
+    def record(self, name, result):
+        record = dict(result, name=name)
+        with self._lock:
+            self._writer.append(record)
+            self.done[name] = record
+
+    def close(self):
+        self._writer.close()
+
+
+class BulkPublisher(object):
+    """Runs publish jobs with bounded parallelism
+
+    Args:
+        'journal' (optional): (str) path of the journal used to resume runs
+        'workers' (optional): (int) max concurrent publishes
+        'on_progress' (optional): (callable) called with (PublishResult,
+                                  BulkStats) after every job
+        'lbry' (optional): (LbryClient) client to publish with, defaults to
+                           client.default_client()
+    """
+
+    def __init__(self, journal=None, workers=4, on_progress=None, lbry=None):
+        self.journal = Journal(journal) if journal else None
+        self.lbry = lbry or client.default_client()
+        self.workers = workers
+        self.on_progress = on_progress
+        self.stats = bulk.BulkStats()
+
+    def _publish(self, job):
+        result = self.lbry.publish(job.name, job.bid, file_path=job.file_path,
+                                   metadata=job.metadata)
+        if self.journal is not None:
+            self.journal.record(job.name, result)
+        return result
+
+    def run(self, jobs):
+        """Validate all jobs, then publish the ones not in the journal yet
+
+        Returns:
+            (generator) PublishResult per job in completion order. Jobs found
+            in the journal are yielded first with their recorded result.
+        """
+        jobs = validate(jobs)
+        todo = []
+        for job in jobs:
+            if self.journal is not None and job.name in self.journal.done:
+                yield PublishResult(job, self.journal.done[job.name], None)
+            else:
+                todo.append(job)
+        self.stats = bulk.BulkStats()
+        for job, result in bulk.map_unordered(self._publish, todo, self.workers, self.stats):
+            if isinstance(result, Exception):
+                outcome = PublishResult(job, None, result)
+            else:
+                outcome = PublishResult(job, result, None)
+            if self.on_progress is not None:
+                self.on_progress(outcome, self.stats)
+            yield outcome
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
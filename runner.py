@@ -0,0 +1,242 @@
+"""Run JSON lines of daemon calls from a file or stdin
+
+Each input line is a job like {"method": "resolve", "params": {"uri": "lbry://what"}},
+optionally with an "id". Each output line holds the job's id (its line number if
+it has none), method, and its "result" or "error".
+
+    python runner.py jobs.jsonl --concurrency 16 --batch 20 --rate 500 > results.jsonl
+
+Jobs are read as they are needed and at most a fixed window of them is held in
+memory, so files of any size run in constant memory. Transport errors are
+retried with exponential backoff when the request never reached the daemon
+(the connection was refused or timed out), and for the read-only methods in
+client.COALESCED_METHODS also after it may have. Other methods, such as sends,
+are not retried once the daemon may have run them. Daemon errors are reported
+as they are. A throughput and latency summary is written to stderr at the end.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+import batch
+import bulk
+import client
+
+
+def _retriable(method, error):
+    """Whether a job that failed with error can safely be sent again"""
+    if not isinstance(error, requests.RequestException):
+        return False
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args and \
+            isinstance(getattr(error.args[0], 'reason', None), NewConnectionError):
+        # refused before anything was sent
+        return True
+    # the daemon may have received the call, only reads are safe to repeat
+    return method in client.COALESCED_METHODS
+
+
+def read_jobs(lines):
+    """Yield (id, method, params) from JSON lines, or (id, None, error)"""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            method, params = job['method'], job.get('params') or {}
+            if not isinstance(method, str) or not isinstance(params, dict):
+                raise ValueError('job needs a "method" string and a "params" object')
+            yield job.get('id', number), method, params
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            yield number, None, e
+
+
+class Runner(object):
+    """Runs jobs concurrently, optionally in batches
+
+    Args:
+        'lbry' (optional): (LbryClient) client to run the jobs with
+        'concurrency' (optional): (int) max requests in flight
+        'batch_size' (optional): (int) jobs sent per JSON-RPC batch, 1 to
+                                 send them one by one
+        'rate' (optional): (float) max jobs started per second
+        'retries' (optional): (int) retries of a job after a transport error,
+                              see _retriable
+        'backoff' (optional): (float) seconds before the first retry, doubled
+                              for every further one
+    """
+
+    def __init__(self, lbry=None, concurrency=8, batch_size=1, rate=None, retries=3, backoff=0.5):
+        self.lbry = lbry or client.default_client()
+        self.concurrency = concurrency
+        self.batch_size = max(1, batch_size)
+        self.limiter = bulk.RateLimiter(rate) if rate else None
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = bulk.BulkStats()
+        self.retried = 0
+
+    def _send(self, jobs):
+        """Send jobs once, returning a result or exception per job"""
+        if len(jobs) == 1:
+            _, method, params = jobs[0]
+            try:
+                return [self.lbry._request(method, **params)]
+            except Exception as e:
+                return [e]
+        try:
+            with batch.Batch(self.lbry.transport) as b:
+                futures = [b.call(method, **params) for _, method, params in jobs]
+        except Exception as e:
+            # the batch was not answered, so every job in it gets the error
+            return [e] * len(jobs)
+        return [f.exception() or f.result() for f in futures]
+
+    def run_chunk(self, jobs):
+        """Run a list of jobs, retrying transport errors
+
+        Returns:
+            (list) (job, result or exception, latency) per job
+        """
+        # job ids come from the input and need not be unique or hashable, so
+        # outcomes are kept by position in the chunk
+        outcomes = [None] * len(jobs)
+        todo = []
+        for i, job in enumerate(jobs):
+            if job[1] is None:
+                outcomes[i] = (job, job[2], 0.0)
+            else:
+                todo.append(i)
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            if not todo:
+                break
+            if self.limiter is not None:
+                self.limiter.acquire(len(todo))
+            start = time.perf_counter()
+            results = self._send([jobs[i] for i in todo])
+            latency = time.perf_counter() - start
+            retry = []
+            for i, result in zip(todo, results):
+                if attempt < self.retries and _retriable(jobs[i][1], result):
+                    retry.append(i)
+                else:
+                    outcomes[i] = (jobs[i], result, latency)
+            if not retry:
+                break
+            self.retried += len(retry)
+            time.sleep(delay)
+            delay *= 2
+            todo = retry
+        return outcomes
+
+    def _chunks(self, jobs):
+        chunk = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) >= self.batch_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def run(self, jobs, ordered=False):
+        """Run jobs, yielding (job, result or exception)
+
+        Args:
+            'jobs': (iterable) (id, method, params) tuples
+            'ordered' (optional): (bool) yield in input order instead of
+                                  completion order
+        """
+        self.stats = bulk.BulkStats()
+        chunks = enumerate(self._chunks(jobs))
+        window = self.concurrency * 4
+        pending = {}
+        done_chunks = {}
+        next_out = 0
+        submitted = 0
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            try:
+                while True:
+                    # in ordered mode finished chunks wait for earlier ones, so
+                    # bound everything not yet yielded rather than just in flight
+                    limit = window if ordered else self.concurrency
+                    while (submitted - next_out if ordered else len(pending)) < limit:
+                        item = next(chunks, None)
+                        if item is None:
+                            break
+                        pending[pool.submit(self.run_chunk, item[1])] = item[0]
+                        submitted += 1
+                    if not pending:
+                        break
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index = pending.pop(future)
+                        outcomes = future.result()
+                        for _, result, latency in outcomes:
+                            self.stats.record(latency, isinstance(result, Exception))
+                        if ordered:
+                            done_chunks[index] = outcomes
+                        else:
+                            for job, result, _ in outcomes:
+                                yield job, result
+                    while ordered and next_out in done_chunks:
+                        for job, result, _ in done_chunks.pop(next_out):
+                            yield job, result
+                        next_out += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+                self.stats.finished = time.perf_counter()
+
+
+def _error(e):
+    if isinstance(e, client.DaemonError):
+        return {'code': e.code, 'message': e.message}
+    return {'code': None, 'message': '{}: {}'.format(type(e).__name__, e)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run JSON lines of lbrynet daemon calls')
+    parser.add_argument('jobs', nargs='?', default='-', help='jobs file, - for stdin')
+    parser.add_argument('-o', '--output', default='-', help='results file, - for stdout')
+    parser.add_argument('--url', help='daemon api url, defaults to client.BASE_URL')
+    parser.add_argument('-c', '--concurrency', type=int, default=8)
+    parser.add_argument('-b', '--batch', type=int, default=1, help='jobs per JSON-RPC batch')
+    parser.add_argument('--rate', type=float, help='max jobs per second')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, help='HTTP timeout in seconds')
+    parser.add_argument('--ordered', action='store_true', help='write results in input order')
+    args = parser.parse_args(argv)
+
+    lbry = client.LbryClient(args.url, pool_size=args.concurrency, timeout=args.timeout)
+    runner = Runner(lbry, args.concurrency, args.batch, args.rate, args.retries)
+    source = sys.stdin if args.jobs == '-' else open(args.jobs)
+    out = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for (job_id, method, _), result in runner.run(read_jobs(source), args.ordered):
+            record = {'id': job_id, 'method': method}
+            if isinstance(result, Exception):
+                record['error'] = _error(result)
+            else:
+                record['result'] = result
+            out.write(client._dumps(record).decode('utf-8') + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        lbry.close()
+    summary = runner.stats.summary()
+    summary['retried'] = runner.retried
+    sys.stderr.write(json.dumps(summary) + '\n')
+
+
+if __name__ == '__main__':
+    main()
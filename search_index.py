@@ -0,0 +1,232 @@
+"""In-memory search over claim metadata
+
+    index = ClaimIndex()
+    index.add_resolve(client.resolve('lbry://@channel'))
+    index.add_files(client.file_list())
+    index.search('cooking', language='en', nsfw=False, limit=10)
+
+Claims are indexed by claim_id with the title and description tokenized for
+text search, and author, language, license and nsfw kept for exact filters.
+Matches are ranked by effective_amount. Adding a claim again replaces its
+entry, so the index can be kept current by feeding it fresh results, and a
+snapshot saved with save() loads without any daemon calls.
+"""
+import heapq
+import json
+import re
+import threading
+
+import models
+import storage
+
+FILTERS = ('author', 'language', 'license', 'nsfw')
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Return the lower cased word tokens of text"""
+    if not text:
+        return []
+    return _TOKEN.findall(text.lower())
+
+
+def claim_metadata(claim):
+    """Return the stream metadata of a claim's ClaimDict, None if it has none"""
+    value = models.field(claim, 'value')
+    try:
+        return value['stream']['metadata']
+    except (KeyError, TypeError):
+        return None
+
+
+class ClaimIndex(object):
+    """Token and filter postings over claim metadata
+
+    Each entry is [name, title, description, author, language, license, nsfw,
+    effective_amount].
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.tokens = {}
+        self.filters = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, claim_id):
+        return claim_id in self.entries
+
+    def _postings(self, entry):
+        name, title, description, author, language, license, nsfw, _ = entry
+        tokens = set(tokenize(title)) | set(tokenize(description)) | set(tokenize(name))
+        filters = [(f, v) for f, v in zip(FILTERS, (author, language, license, nsfw))
+                   if v is not None]
+        return tokens, filters
+
+    def _unindex(self, claim_id):
+        entry = self.entries.pop(claim_id, None)
+        if entry is None:
+            return
+        tokens, filters = self._postings(entry)
+        for token in tokens:
+            ids = self.tokens[token]
+            ids.discard(claim_id)
+            if not ids:
+                del self.tokens[token]
+        for key in filters:
+            ids = self.filters[key]
+            ids.discard(claim_id)
+            if not ids:
+                del self.filters[key]
+
+    def _index(self, claim_id, entry):
+        self._unindex(claim_id)
+        self.entries[claim_id] = entry
+        tokens, filters = self._postings(entry)
+        for token in tokens:
+            self.tokens.setdefault(token, set()).add(claim_id)
+        for key in filters:
+            self.filters.setdefault(key, set()).add(claim_id)
+
+    def add(self, claim_id, metadata, name=None, effective_amount=None):
+        """Index or replace one claim
+
+        Args:
+            'claim_id': (str) claim id
+            'metadata': (dict) the stream metadata of the ClaimDict
+            'name' (optional): (str) claim name, also searchable
+            'effective_amount' (optional): (float) rank of the claim, keeps
+                                           the indexed amount when None
+        """
+        nsfw = metadata.get('nsfw')
+        with self._lock:
+            if effective_amount is None:
+                old = self.entries.get(claim_id)
+                effective_amount = old[7] if old else 0.0
+            self._index(claim_id, [
+                name, metadata.get('title'), metadata.get('description'),
+                metadata.get('author'), metadata.get('language'), metadata.get('license'),
+                bool(nsfw) if nsfw is not None else None, float(effective_amount)])
+
+    def remove(self, claim_id):
+        """Drop a claim, e.g. once it is abandoned or spent"""
+        with self._lock:
+            self._unindex(claim_id)
+
+    def add_claim(self, claim):
+        """Index a claim from resolve, claim_list or claim_list_mine
+
+        Spent claims are removed and claims without stream metadata (channels,
+        undecoded claims) are skipped.
+
+        Returns:
+            (bool) whether the claim was indexed
+        """
+        claim_id = models.field(claim, 'claim_id')
+        if not claim_id:
+            return False
+        if models.field(claim, 'is_spent'):
+            self.remove(claim_id)
+            return False
+        metadata = claim_metadata(claim)
+        if not isinstance(metadata, dict):
+            return False
+        amount = models.field(claim, 'effective_amount')
+        if amount is None:
+            amount = models.field(claim, 'amount')
+        self.add(claim_id, metadata, models.field(claim, 'name'), amount)
+        return True
+
+    def add_claims(self, claims):
+        """Index claims, returning how many were indexed"""
+        return sum(1 for claim in claims if self.add_claim(claim))
+
+    def add_resolve(self, resolved):
+        """Index the claim and claims_in_channel of a resolve result"""
+        if not isinstance(resolved, dict):
+            return 0
+        claims = list(resolved.get('claims_in_channel') or [])
+        if resolved.get('claim') is not None:
+            claims.append(resolved['claim'])
+        return self.add_claims(claims)
+
+    def add_claim_list(self, result):
+        """Index the claims of a claim_list result"""
+        if not isinstance(result, dict):
+            return 0
+        return self.add_claims(result.get('claims') or [])
+
+    def add_file(self, entry):
+        """Index the metadata of a file_list or get entry
+
+        Files carry no amount, so an already indexed claim keeps its rank.
+        """
+        claim_id = models.field(entry, 'claim_id')
+        metadata = models.field(entry, 'metadata')
+        if not claim_id or not isinstance(metadata, dict):
+            return False
+        self.add(claim_id, metadata, models.field(entry, 'name'))
+        return True
+
+    def add_files(self, entries):
+        """Index file_list entries, returning how many were indexed"""
+        return sum(1 for entry in entries or [] if self.add_file(entry))
+
+    def search(self, query=None, limit=20, **filters):
+        """Find claims matching every query token and filter
+
+        Args:
+            'query' (optional): (str) words that must all appear in the title,
+                                description or name
+            'limit' (optional): (int) max results, None for all
+            'author', 'language', 'license', 'nsfw' (optional): exact values
+                                                                to filter on
+        Returns:
+            (list) {'claim_id', 'name', 'title', 'author', 'language',
+            'license', 'nsfw', 'effective_amount'} dicts, highest
+            effective_amount first
+        """
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise Exception('unknown filters: {}'.format(', '.join(sorted(unknown))))
+        with self._lock:
+            sets = [self.tokens.get(token, set()) for token in set(tokenize(query))]
+            sets += [self.filters.get((f, v), set()) for f, v in filters.items() if v is not None]
+            if sets:
+                sets.sort(key=len)
+                ids = sets[0].intersection(*sets[1:])
+            else:
+                ids = self.entries
+            rank = lambda claim_id: self.entries[claim_id][7]
+            if limit is None:
+                ids = sorted(ids, key=rank, reverse=True)
+            else:
+                ids = heapq.nlargest(limit, ids, key=rank)
+            return [self._result(claim_id) for claim_id in ids]
+
+    def _result(self, claim_id):
+        name, title, _, author, language, license, nsfw, amount = self.entries[claim_id]
+        return {'claim_id': claim_id, 'name': name, 'title': title, 'author': author,
+                'language': language, 'license': license, 'nsfw': nsfw,
+                'effective_amount': amount}
+
+    def save(self, path):
+        """Atomically write a snapshot of the index to path"""
+        with self._lock:
+            data = json.dumps(self.entries, separators=(',', ':'))
+        storage.atomic_write(path, data, prefix='.index-')
+
+    @classmethod
+    def load(cls, path):
+        """Returns:
+            (ClaimIndex) the index saved at path
+        """
+        index = cls()
+        with open(path) as f:
+            entries = json.load(f)
+        for claim_id, entry in entries.items():
+            index._index(claim_id, entry)
+        return index
@@ -0,0 +1,88 @@
+"""Crash safe files shared by the caches, indexes and journals
+
+    storage.atomic_write('index.json', data)
+    for record in storage.read_journal('payouts.journal'):
+        ...
+    with storage.JournalWriter('payouts.journal') as journal:
+        journal.append({'state': 'done', ...})
+
+atomic_write writes to a temporary file in the same directory and renames it
+into place, so readers see either the old file or the new one, never part of
+it. A journal is a JSON lines file appended to and fsynced one record at a
+time; a process dying mid write leaves at most a torn last line, which
+read_journal skips.
+"""
+import json
+import os
+import tempfile
+
+
+def atomic_write(path, data, prefix='.tmp-'):
+    """Replace the file at path with data
+
+    Args:
+        'path': (str) file to write
+        'data': (bytes or str) its new contents
+        'prefix' (optional): (str) name prefix of the temporary file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=prefix)
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(data, bytes) else 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+def read_journal(path):
+    """Yield the records of a journal, nothing if it does not exist yet"""
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # torn last line of an interrupted run
+                continue
+
+
+class JournalWriter(object):
+    """Appends records to a journal, each one fsynced before append returns
+
+    Not thread safe, callers serialize their appends.
+
+    Args:
+        'path': (str) journal file, created if missing
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a')
+        if self._file.tell() and not _ends_with_newline(path):
+            # end a torn last line so the next record starts on its own line
+            self._file.write('\n')
+
+    def append(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
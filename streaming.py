@@ -0,0 +1,196 @@
+"""Incrementally parsed variants of calls that return very long lists
+
+The response body is read from the socket in chunks and each list item is
+decoded and yielded as soon as it is complete, so memory is bounded by one
+record rather than by the whole response. With 'fields', each item is cut
+down to those fields before the next one is decoded. Closing the generator
+early drops the connection without reading the rest of the body. Hooks and
+metrics registered with client.add_hooks see streamed calls too.
+"""
+import codecs
+import json
+import time
+
+import client
+import projection
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader(object):
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=1):
+        """Read at least size more characters, returns False at the end"""
+        if self.eof:
+            return False
+        parts = [self.buf[self.pos:]]
+        added = 0
+        while added < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                parts.append(self.text.decode(b'', final=True))
+                self.eof = True
+                break
+            part = self.text.decode(chunk)
+            parts.append(part)
+            added += len(part)
+        self.buf = ''.join(parts)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError('Expected {!r} at {!r}'.format(chars, self.buf[self.pos:self.pos + 20]))
+        self.pos += 1
+        return c
+
+    def value(self):
+        while True:
+            self.peek()
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if not self.fill(len(self.buf) - self.pos):
+                    raise
+                continue
+            # a number or literal running up to the end of the buffer may
+            # continue in the next chunk
+            if end == len(self.buf) and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_result(chunks):
+    """Yield the items of the 'result' list of a JSON-RPC response
+
+    Args:
+        'chunks': (iterable) the response body as bytes chunks
+    Returns:
+        (generator) the result items, or the result itself if it isn't a list
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        raise ValueError('Response has no result')
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'result' and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                return
+            while True:
+                yield reader.value()
+                if reader.expect(',]') == ']':
+                    return
+        value = reader.value()
+        if key == 'error':
+            client._result({'error': value})
+        if key == 'result':
+            yield value
+            return
+        if reader.expect(',}') == '}':
+            raise ValueError('Response has no result')
+
+
+def iter_request(method, lbry=None, fields=None, **kwargs):
+    """Call a daemon method and yield the items of its list result
+
+    Args:
+        'method': (str) daemon method
+        'lbry' (optional): (LbryClient) client to call, defaults to
+                           client.default_client()
+        'fields' (optional): (list) dotted paths to keep of each item, see
+                             projection.py. Projected items are plain dicts.
+        Other keyword args are the method params
+    """
+    lbry = lbry or client.default_client()
+    tree = projection.compile_fields(fields) if fields is not None else None
+    hooked = client._hooked
+    if hooked:
+        for hook in client._before_hooks:
+            hook(method, kwargs)
+        info = {'request_bytes': 0, 'response_bytes': 0, 'error': None}
+        start = time.perf_counter()
+    data = client._encode(method, kwargs)
+    res = None
+    try:
+        if hooked:
+            info['request_bytes'] = len(data)
+        res = lbry.transport.post(data, stream=True)
+        if res.status_code >= 400:
+            client._response(res)
+        chunks = res.iter_content(CHUNK_SIZE)
+        if hooked:
+            chunks = _counted(chunks, info)
+        for item in iter_result(chunks):
+            if tree is not None:
+                yield projection.project(item, tree)
+            else:
+                yield lbry._typed(method, item)
+    except Exception as e:
+        if hooked:
+            info['error'] = e
+        raise
+    finally:
+        if res is not None:
+            res.close()
+        if hooked:
+            info['latency'] = time.perf_counter() - start
+            for hook in client._after_hooks:
+                hook(method, kwargs, info)
+
+
+def _counted(chunks, info):
+    for chunk in chunks:
+        info['response_bytes'] += len(chunk)
+        yield chunk
+
+
+def iter_claim_list_mine(lbry=None, fields=None):
+    """Streaming version of client.claim_list_mine
+
+    Returns:
+        (generator) name claims owned by user, one at a time
+    """
+    return iter_request('claim_list_mine', lbry, fields)
+
+
+def iter_file_list(lbry=None, fields=None, **kwargs):
+    """Streaming version of client.file_list
+
+    Args:
+        Same filters as client.file_list
+    Returns:
+        (generator) files, one at a time
+    """
+    return iter_request('file_list', lbry, fields, **kwargs)
+
+
+def iter_transaction_list(lbry=None, fields=None):
+    """Streaming version of client.transaction_list
+
+    Returns:
+        (generator) transactions belonging to wallet, one at a time
+    """
+    return iter_request('transaction_list', lbry, fields)
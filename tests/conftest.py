@@ -0,0 +1,19 @@
+import pytest
+
+import client
+from benchmarks.fake_daemon import FakeDaemon
+
+
+@pytest.fixture
+def daemon():
+    d = FakeDaemon(claims=20, files=5, transactions=10)
+    d.start()
+    yield d
+    d.stop()
+
+
+@pytest.fixture
+def lbry(daemon):
+    c = client.LbryClient(daemon.url)
+    yield c
+    c.close()
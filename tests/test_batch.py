@@ -0,0 +1,74 @@
+import pytest
+import requests
+
+import batch
+import client
+from benchmarks.fake_daemon import FakeDaemon
+
+
+class FlakyTransport(object):
+    """Answers the first post with a proxy error page, then passes through"""
+
+    def __init__(self, url, status=503):
+        self.transport = client.Transport(url)
+        self.url = url
+        self.status = status
+        self.failed = False
+
+    def post(self, data, **kwargs):
+        if not self.failed:
+            self.failed = True
+            res = requests.Response()
+            res.status_code = self.status
+            res._content = b'<html>Service Unavailable</html>'
+            return res
+        return self.transport.post(data, **kwargs)
+
+
+def test_calls_are_batched(lbry):
+    with batch.Batch(lbry.transport) as b:
+        status = b.status()
+        resolved = b.resolve(uri='claim-1')
+        missing = b.no_such_method()
+    assert status.result()['is_running']
+    assert resolved.result()['claim']['name'] == 'claim-1'
+    assert isinstance(missing.exception(), client.DaemonError)
+    assert lbry.url not in batch._unsupported
+
+
+def test_failed_request_resolves_every_future():
+    transport = client.Transport('http://127.0.0.1:1/lbryapi')
+    b = batch.Batch(transport)
+    futures = [b.status(), b.wallet_balance()]
+    with pytest.raises(requests.ConnectionError):
+        b.send()
+    for future in futures:
+        with pytest.raises(requests.ConnectionError):
+            future.result(timeout=1)
+
+
+def test_rejected_batches_fall_back_to_single_calls():
+    with FakeDaemon(batch=False) as d:
+        try:
+            with batch.Batch(client.Transport(d.url)) as b:
+                status = b.status()
+                resolved = b.resolve(uri='claim-2')
+            assert status.result()['is_running']
+            assert resolved.result()['claim']['name'] == 'claim-2'
+            assert d.url in batch._unsupported
+        finally:
+            batch._unsupported.discard(d.url)
+
+
+def test_transient_error_does_not_disable_batches(daemon):
+    transport = FlakyTransport(daemon.url)
+    b = batch.Batch(transport)
+    future = b.status()
+    with pytest.raises(requests.HTTPError):
+        b.send()
+    assert isinstance(future.exception(timeout=1), requests.HTTPError)
+    assert daemon.url not in batch._unsupported
+    with batch.Batch(transport) as b:
+        future = b.status()
+    assert future.result()['is_running']
+    assert daemon.url not in batch._unsupported
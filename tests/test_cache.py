@@ -0,0 +1,31 @@
+import cache
+
+
+def test_cached_resolve_is_not_changed_by_callers(daemon, lbry):
+    calls = []
+    original = daemon.api.resolve
+
+    def resolve(**params):
+        calls.append(params)
+        return original(**params)
+
+    daemon.api.resolve = resolve
+    lbry.enable_resolve_cache()
+    first = lbry.resolve('claim-1')
+    first['claim']['name'] = 'changed'
+    second = lbry.resolve('lbry://claim-1')
+    assert second['claim']['name'] == 'claim-1'
+    second['claim']['name'] = 'changed again'
+    assert lbry.resolve('claim-1')['claim']['name'] == 'claim-1'
+    assert len(calls) == 1
+    assert lbry.resolve_cache.stats()['hits'] == 2
+
+
+def test_unresolved_names_expire_sooner():
+    now = [0.0]
+    c = cache.ResolveCache(ttl=60, negative_ttl=5, clock=lambda: now[0])
+    c.put(('resolve', 'missing', ()), None)
+    c.put(('resolve', 'claim', ()), {'claim': {'depth': 3}})
+    now[0] = 10
+    assert c.get(('resolve', 'missing', ())) is cache.MISSING
+    assert c.get(('resolve', 'claim', ())) == {'claim': {'depth': 3}}
@@ -0,0 +1,49 @@
+import asyncio
+
+import async_client
+import client
+import downloads
+from benchmarks.fake_daemon import FakeDaemon
+
+
+def track(lbry, uris):
+    tracker = downloads.DownloadTracker(lbry=lbry, min_interval=0.01, max_interval=0.05)
+    for uri in uris:
+        tracker.start(uri)
+    return tracker
+
+
+def test_events_until_complete():
+    with FakeDaemon(download_rate=5000000) as d:
+        tracker = track(client.LbryClient(d.url), ['claim-1', 'claim-2'])
+        kinds = [event.kind for event in tracker.events()]
+    assert kinds.count(downloads.COMPLETE) == 2
+    assert downloads.ERROR not in kinds
+
+
+def test_aevents_poll_the_trackers_daemon():
+    async def collect(tracker):
+        return [event.kind async for event in tracker.aevents()]
+
+    async def run(tracker):
+        try:
+            return await asyncio.wait_for(collect(tracker), 10)
+        finally:
+            await async_client.close()
+
+    with FakeDaemon(download_rate=5000000) as d:
+        assert d.url != client.BASE_URL
+        tracker = track(client.LbryClient(d.url), ['claim-1', 'claim-2'])
+        kinds = asyncio.run(run(tracker))
+    assert kinds.count(downloads.COMPLETE) == 2
+    assert downloads.ERROR not in kinds
+
+
+def test_unreachable_daemon_is_a_missed_tick():
+    tracker = downloads.DownloadTracker(lbry=client.LbryClient('http://127.0.0.1:1/lbryapi'),
+                                        min_interval=0.01)
+    download = tracker.track('ab' * 48)
+    assert tracker.poll() == []
+    assert download.error is not None
+    assert download.interval == 0.02
+    assert 'ab' * 48 in tracker.active
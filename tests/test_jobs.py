@@ -0,0 +1,30 @@
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+
+import client
+import jobs
+
+
+def test_daemon_timeouts_stay_below_the_http_timeout():
+    assert client.daemon_timeouts(10) == 9
+    assert client.daemon_timeouts(10, parts=2) == 4
+    assert client.daemon_timeouts(1.9) is None
+    assert client.daemon_timeouts(2.5, parts=2) is None
+
+
+def test_job_timeout_is_below_its_deadline(daemon, lbry):
+    seen = []
+    original = daemon.api.descriptor_get
+
+    def descriptor_get(sd_hash, timeout=None, **params):
+        seen.append(timeout)
+        return original(sd_hash)
+
+    daemon.api.descriptor_get = descriptor_get
+    with jobs.JobManager(lbry, deadline=10) as manager:
+        assert manager.submit('descriptor_get', sd_hash='ab' * 48).result()['blobs']
+        job = manager.submit('descriptor_get', deadline=1.5, sd_hash='ab' * 48)
+        with pytest.raises(FutureTimeout):
+            job.result()
+    assert seen == [8]
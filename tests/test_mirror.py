@@ -0,0 +1,63 @@
+import pytest
+
+import mirror
+from benchmarks.fake_daemon import HEIGHT, claim
+
+
+@pytest.fixture
+def wallet(lbry):
+    m = mirror.WalletMirror(':memory:', lbry=lbry)
+    yield m
+    m.close()
+
+
+def test_first_sync_mirrors_everything(daemon, wallet):
+    written = wallet.sync()
+    assert written == {'claims': 20, 'transactions': 10}
+    assert wallet.height == HEIGHT
+    first = claim(0)
+    row = wallet.claim_by_outpoint(first['txid'], first['nout'])
+    assert row['claim_id'] == first['claim_id']
+    assert row['height'] == first['height']
+    assert wallet.claims_by_name('claim-3') == [claim(3)['claim_id']]
+    assert wallet.transaction(daemon.api.transaction_list()[0]['txid']) is not None
+
+
+def test_unchanged_claims_are_not_written_again(wallet):
+    wallet.sync()
+    written = wallet.sync()
+    assert written['claims'] == 0
+    # only the transactions at the last synced height are checked again
+    assert written['transactions'] <= 1
+
+
+def test_changed_claim_is_rewritten(daemon, wallet):
+    unconfirmed = dict(claim(0), height=None, expiration_height=None)
+    daemon.api.claim_list_mine = lambda: [unconfirmed] + [claim(i) for i in range(1, 20)]
+    wallet.sync()
+    row = wallet.claim_by_outpoint(unconfirmed['txid'], unconfirmed['nout'])
+    assert row['height'] is None
+
+    confirmed = claim(0)
+    daemon.api.claim_list_mine = lambda: [claim(i) for i in range(20)]
+    assert wallet.sync()['claims'] == 1
+    row = wallet.claim_by_outpoint(confirmed['txid'], confirmed['nout'])
+    assert (row['height'], row['expiration_height']) == \
+        (confirmed['height'], confirmed['expiration_height'])
+
+
+def test_spent_claim_leaves_totals(daemon, wallet):
+    wallet.sync()
+    count = sum(n for n, _ in wallet.totals_by_category().values())
+    spent = dict(claim(0), is_spent=True)
+    daemon.api.claim_list_mine = lambda: [spent] + [claim(i) for i in range(1, 20)]
+    assert wallet.sync()['claims'] == 1
+    assert sum(n for n, _ in wallet.totals_by_category().values()) == count - 1
+
+
+def test_expiring_within(wallet):
+    wallet.sync()
+    expiring = wallet.expiring_within(262974, height=HEIGHT)
+    assert expiring
+    assert all(0 <= blocks <= 262974 for _, _, _, blocks in expiring)
+    assert [e[2] for e in expiring] == sorted(e[2] for e in expiring)
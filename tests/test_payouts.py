@@ -0,0 +1,93 @@
+import pytest
+
+import client
+import payouts
+
+ADDRESS = 'bY1b4pnx2FUGSNUZyPEFNcLPnXoeZRmNh0'
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / 'payouts.journal')
+
+
+def counting(daemon, method):
+    calls = []
+    original = getattr(daemon.api, method)
+
+    def wrapper(**params):
+        calls.append(params)
+        return original(**params)
+
+    setattr(daemon.api, method, wrapper)
+    return calls
+
+
+def test_merges_payments_to_one_address(daemon, lbry, journal):
+    calls = counting(daemon, 'send_amount_to_address')
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        assert batcher.pay(ADDRESS, 1.5, 'invoice-1')
+        assert batcher.pay(ADDRESS, 0.25, 'invoice-2')
+        reports = list(batcher.flush())
+    assert calls == [{'amount': 1.75, 'address': ADDRESS}]
+    assert reports[0]['sent'] == 1
+    assert reports[0]['amount'] == 1.75
+
+
+def test_paid_refs_are_not_sent_again_after_restart(daemon, lbry, journal):
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        batcher.pay(ADDRESS, 1.0, 'invoice-1')
+        list(batcher.flush())
+    calls = counting(daemon, 'send_amount_to_address')
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        assert batcher.journal.state('invoice-1') == 'done'
+        assert not batcher.pay(ADDRESS, 1.0, 'invoice-1')
+        assert list(batcher.flush()) == []
+    assert calls == []
+
+
+def test_daemon_error_marks_payment_failed(daemon, lbry, journal):
+    daemon.server.error_rate = 1.0
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        batcher.pay(ADDRESS, 1.0, 'invoice-1')
+        report = list(batcher.flush())[0]
+        assert report['failed'] == 1
+        assert isinstance(report['errors'][0][1], client.DaemonError)
+        assert batcher.journal.state('invoice-1') == 'failed'
+        assert batcher.unknown() == []
+        # a failed payment can be queued again
+        assert batcher.pay(ADDRESS, 1.0, 'invoice-1')
+
+
+def test_lost_response_leaves_payment_unknown(daemon, lbry, journal):
+    def crash(**params):
+        # the fake daemon drops the connection without an answer
+        raise RuntimeError('connection lost')
+
+    daemon.api.send_amount_to_address = crash
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        batcher.pay(ADDRESS, 1.0, 'invoice-1')
+        report = list(batcher.flush())[0]
+        assert report['unknown'] == 1
+        assert batcher.journal.state('invoice-1') == 'intent'
+        assert not batcher.pay(ADDRESS, 1.0, 'invoice-1')
+        unknown = batcher.unknown()
+        assert [u['refs'] for u in unknown] == [['invoice-1']]
+        batcher.resolve(unknown[0]['id'], paid=False)
+        assert batcher.journal.state('invoice-1') == 'failed'
+        assert batcher.pay(ADDRESS, 1.0, 'invoice-1')
+
+
+def test_torn_last_line_is_skipped(daemon, lbry, journal):
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        batcher.pay(ADDRESS, 1.0, 'invoice-1')
+        list(batcher.flush())
+    with open(journal, 'a') as f:
+        f.write('{"state": "intent", "id": "abc", "refs": ["invoi')
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        assert batcher.journal.state('invoice-1') == 'done'
+        batcher.pay(ADDRESS, 2.0, 'invoice-2')
+        list(batcher.flush())
+    with payouts.PayoutBatcher(journal, lbry=lbry, track_balance=False) as batcher:
+        assert batcher.journal.state('invoice-2') == 'done'
+        assert batcher.unknown() == []
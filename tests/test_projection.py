@@ -0,0 +1,33 @@
+import models
+import projection
+from benchmarks.fake_daemon import channel, claim
+
+
+def resolve_result():
+    return {'claim': claim(1), 'certificate': channel(2), 'claims_in_channel': [claim(3)]}
+
+
+def test_shape_resolve_and_claim_list():
+    shaped = projection.shape('resolve', resolve_result(), ['claim_id', 'supports.amount'])
+    assert shaped['claim'] == {'claim_id': claim(1)['claim_id'], 'supports': [
+        {'amount': s['amount']} for s in claim(1)['supports']]}
+    assert set(shaped['certificate']) == {'claim_id', 'supports'}
+    assert set(shaped['claims_in_channel'][0]) == {'claim_id', 'supports'}
+
+    listed = projection.shape('claim_list', {'claims': [claim(4)], 'last_takeover_height': 1},
+                              ['name'])
+    assert listed == {'claims': [{'name': 'claim-4'}], 'last_takeover_height': 1}
+
+
+def test_models_convert_the_same_records():
+    converted = models.convert('resolve', resolve_result())
+    assert isinstance(converted['claim'], models.Claim)
+    assert isinstance(converted['certificate'], models.Claim)
+    assert converted['claims_in_channel'][0].claim_id == claim(3)['claim_id']
+    assert models.convert('claim_list', {'claims': [claim(5)]})['claims'][0].name == 'claim-5'
+    assert models.convert('status', {'is_running': True}) == {'is_running': True}
+
+
+def test_methods_without_records_are_left_alone():
+    assert projection.map_records('status', [1, 2], lambda r: None) == [1, 2]
+    assert projection.map_records('resolve', None, lambda r: None) is None
@@ -0,0 +1,23 @@
+import time
+
+import publisher
+
+METADATA = {'title': 'title', 'description': 'description', 'author': 'author',
+            'language': 'en', 'license': 'LBRY inc', 'nsfw': False}
+
+
+def test_publishes_are_journaled_after_the_caller_stops(daemon, lbry, tmp_path):
+    daemon.server.latency = {'publish': 0.1, 'default': 0.0}
+    journal = str(tmp_path / 'publish.journal')
+    jobs = [publisher.PublishJob('name-{}'.format(i), 1.0, None, METADATA) for i in range(4)]
+    with publisher.BulkPublisher(journal, workers=4, lbry=lbry) as p:
+        for result in p.run(jobs):
+            break
+        time.sleep(0.3)
+    assert len(daemon.api.published) == 4
+
+    with publisher.BulkPublisher(journal, workers=4, lbry=lbry) as p:
+        results = list(p.run(jobs))
+    assert len(daemon.api.published) == 4
+    assert sorted(r.job.name for r in results) == [j.name for j in jobs]
+    assert all(r.txid for r in results)
@@ -0,0 +1,100 @@
+import json
+import time
+
+import pytest
+import requests
+
+import client
+import runner
+
+
+def jobs(lines):
+    return list(runner.read_jobs(json.dumps(line) if isinstance(line, dict) else line
+                                 for line in lines))
+
+
+def test_read_jobs_reports_bad_lines():
+    read = jobs([{'id': 'a', 'method': 'status'}, 'not json',
+                 {'method': 'resolve', 'params': ['claim-1']}, {'params': {}}, ''])
+    assert read[0] == ('a', 'status', {})
+    assert [(number, method) for number, method, _ in read[1:]] == [(2, None), (3, None), (4, None)]
+    assert all(isinstance(error, Exception) for _, _, error in read[1:])
+
+
+@pytest.mark.parametrize('batch_size', [1, 3])
+def test_ordered_run_keeps_input_order(daemon, lbry, batch_size):
+    # later jobs answer first
+    daemon.server.latency = {'resolve': 0.0, 'status': 0.05, 'default': 0.0}
+    lines = []
+    for i in range(12):
+        if i % 4 == 0:
+            lines.append({'id': i, 'method': 'status'})
+        else:
+            lines.append({'id': i, 'method': 'resolve', 'params': {'uri': 'claim-{}'.format(i)}})
+    r = runner.Runner(lbry, concurrency=4, batch_size=batch_size)
+    out = list(r.run(jobs(lines), ordered=True))
+    assert [job[0] for job, _ in out] == list(range(12))
+    assert all(not isinstance(result, Exception) for _, result in out)
+    assert out[1][1]['claim']['name'] == 'claim-1'
+
+
+@pytest.mark.parametrize('batch_size', [1, 4])
+def test_duplicate_and_unhashable_ids(lbry, batch_size):
+    lines = [{'id': 'same', 'method': 'resolve', 'params': {'uri': 'claim-1'}},
+             {'id': 'same', 'method': 'resolve', 'params': {'uri': 'claim-2'}},
+             {'id': [1, 2], 'method': 'resolve', 'params': {'uri': 'claim-3'}},
+             'not json']
+    out = list(runner.Runner(lbry, batch_size=batch_size).run(jobs(lines), ordered=True))
+    assert [job[0] for job, _ in out] == ['same', 'same', [1, 2], 4]
+    assert [result['claim']['name'] for _, result in out[:3]] == ['claim-1', 'claim-2', 'claim-3']
+    assert isinstance(out[3][1], ValueError)
+
+
+def test_daemon_errors_are_not_retried(daemon, lbry):
+    calls = []
+    original = daemon.api.status
+
+    def status(**params):
+        calls.append(params)
+        return original(**params)
+
+    daemon.api.status = status
+    lines = [{'id': 1, 'method': 'no_such_method'}, {'id': 2, 'method': 'status'}]
+    r = runner.Runner(lbry, backoff=0.01)
+    out = list(r.run(jobs(lines), ordered=True))
+    assert isinstance(out[0][1], client.DaemonError)
+    assert out[0][1].code == -32601
+    assert out[1][1]['is_running']
+    assert r.retried == 0
+    assert len(calls) == 1
+
+
+def test_transport_errors_are_retried(lbry):
+    dead = client.LbryClient('http://127.0.0.1:1/lbryapi')
+    r = runner.Runner(dead, retries=2, backoff=0.01)
+    out = list(r.run(jobs([{'id': 1, 'method': 'status'}])))
+    assert isinstance(out[0][1], Exception)
+    assert r.retried == 2
+
+
+def test_timed_out_send_is_not_retried(daemon):
+    daemon.server.latency = {'send_amount_to_address': 0.3, 'resolve': 0.3, 'default': 0.0}
+    calls = []
+    original = daemon.api.send_amount_to_address
+
+    def send_amount_to_address(**params):
+        calls.append(params)
+        return original(**params)
+
+    daemon.api.send_amount_to_address = send_amount_to_address
+    lbry = client.LbryClient(daemon.url, timeout=0.1)
+    r = runner.Runner(lbry, retries=3, backoff=0.01)
+    lines = [{'id': 1, 'method': 'send_amount_to_address',
+              'params': {'amount': 1.0, 'address': 'bY1b4p'}},
+             {'id': 2, 'method': 'resolve', 'params': {'uri': 'claim-1'}}]
+    out = list(r.run(jobs(lines), ordered=True))
+    time.sleep(0.5)
+    assert isinstance(out[0][1], requests.ReadTimeout)
+    assert len(calls) == 1
+    # reads are still retried
+    assert r.retried == 3
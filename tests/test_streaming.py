@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import client
+import projection
+import streaming
+
+
+def chunked(body, size):
+    data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 64 * 1024])
+def test_list_items_across_chunk_boundaries(size):
+    items = [{'name': 'café ☃', 'text': 'quote " and \\ and ]}', 'n': i,
+              'nested': {'list': [1, [2, {}], None], 'empty': ''}} for i in range(5)]
+    body = {'jsonrpc': '2.0', 'id': 1, 'result': items}
+    assert list(streaming.iter_result(chunked(body, size))) == items
+
+
+def test_result_key_after_other_keys():
+    body = {'id': 1, 'jsonrpc': '2.0', 'result': [1, 2, 3]}
+    assert list(streaming.iter_result(chunked(body, 2))) == [1, 2, 3]
+
+
+def test_empty_list():
+    assert list(streaming.iter_result(chunked({'result': []}, 1))) == []
+
+
+def test_non_list_result_is_yielded_whole():
+    body = {'result': {'is_running': True}}
+    assert list(streaming.iter_result(chunked(body, 4))) == [{'is_running': True}]
+
+
+def test_error_response_raises_daemon_error():
+    body = {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32601, 'message': 'Method Not Found'}}
+    with pytest.raises(client.DaemonError) as info:
+        list(streaming.iter_result(chunked(body, 5)))
+    assert info.value.code == -32601
+
+
+def test_response_without_result():
+    with pytest.raises(ValueError):
+        list(streaming.iter_result(chunked({'jsonrpc': '2.0', 'id': 1}, 3)))
+
+
+def test_streamed_file_list_matches_plain_call(lbry):
+    assert list(streaming.iter_file_list(lbry)) == lbry.file_list()
+
+
+def test_streamed_projection_matches_shape(lbry):
+    fields = ['claim_id', 'value.stream.metadata.title', 'supports.amount']
+    streamed = list(streaming.iter_claim_list_mine(lbry, fields=fields))
+    assert streamed == projection.shape('claim_list_mine', lbry.claim_list_mine(), fields)
+    assert set(streamed[0]) == {'claim_id', 'value', 'supports'}